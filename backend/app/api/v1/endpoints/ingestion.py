@@ -2,22 +2,26 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timezone
+from functools import partial
 import logging
 from pathlib import Path
 from typing import Any, Iterable, Sequence
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, Form, HTTPException, Request, UploadFile, status
+from fastapi import APIRouter, Depends, Form, HTTPException, Request, Response, UploadFile, status
 from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from app.core.config import settings
 from app.db.session import get_session, get_session_factory
 from app.models import AuditBatch, GeminiAnalysis
+from app.pipelines.models import OCRResult, Observation, PipelineResult, RiskBreakdown, RiskScore
 from app.repositories import batches as batch_repo
 from app.schemas.ingestion import (
+    AnalysisJobSchema,
     BatchResponse,
     BatchSummarySchema,
+    CircuitBreakerSchema,
     FileMetadata,
     GeminiAnalysisRecord,
     GeminiAnalysisRequest,
@@ -26,17 +30,25 @@ from app.schemas.ingestion import (
     RiskBreakdownSchema,
     RiskScoreSchema,
 )
+from app.services.analysis_jobs import AnalysisJob, analysis_jobs
 from app.services.batch_processor import BatchProcessorProtocol, get_batch_processor
+from app.services.circuit_breaker import get_gemini_circuit_breaker
+from app.services.content_store import ContentStore
+from app.services.downloads import RangeNotSatisfiableError, etag_matches, iter_file_range, parse_range
 from app.services.events import event_bus
+from app.services.exports import EXPORT_COLUMNS, EXPORT_FORMATS, stream_export, stream_html_report
 from app.services.metadata import extract_image_metadata
+from app.services.ocr_engine import normalize_languages
 from app.services.pipeline import (
     IngestionPipeline,
     SIMULATED_METADATA_DELAY_SECONDS,
     SIMULATED_REPORT_DELAY_SECONDS,
 )
-from app.services.report import ReportBuilder
+from app.services.report import REPORT_STORE_DIRNAME, ReportArtifact, ReportBuilder, ReportContext
+from app.services.report_renderer import get_report_render_pool
 from app.services.storage import allowed_content_type, sanitize_filename, save_upload_file
-from app.services.advanced_analyzer import AdvancedAnalyzer
+from app.services.thumbnails import THUMBNAIL_DIRNAME, AnnotatedBox, ThumbnailCache
+from app.services.advanced_analyzer import AdvancedAnalyzer, AnalysisCancelled
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -58,6 +70,19 @@ def get_processor(storage_root: Path = Depends(get_storage_root)) -> BatchProces
     return get_batch_processor(storage_root)
 
 
+def _background_session_factory(session: AsyncSession) -> async_sessionmaker[AsyncSession]:
+    """Session factory bound to the request's engine, for work outliving the request."""
+    factory: async_sessionmaker[AsyncSession] | None = session.info.get("session_factory")  # type: ignore[arg-type]
+    if factory is not None:
+        return factory
+    bind = session.get_bind()
+    if isinstance(bind, AsyncEngine):
+        return async_sessionmaker(bind, expire_on_commit=False, class_=AsyncSession)
+    if hasattr(session, "bind") and isinstance(session.bind, AsyncEngine):
+        return async_sessionmaker(session.bind, expire_on_commit=False, class_=AsyncSession)
+    return get_session_factory()
+
+
 def _observation_payload(entry: Any, source: str) -> dict[str, Any]:
     if hasattr(entry, "source_file"):
         filename = entry.source_file  # type: ignore[attr-defined]
@@ -112,6 +137,8 @@ def _serialize_gemini_record(record: GeminiAnalysis) -> GeminiAnalysisRecord:
         provider=record.provider,
         model=record.model,
         duration_ms=record.duration_ms,
+        cache_hits=record.cache_hits,
+        cache_misses=record.cache_misses,
         requested_by=record.requested_by,
         created_at=record.created_at,
         observations=record.observations_json,
@@ -128,6 +155,7 @@ def _serialize_gemini_record(record: GeminiAnalysis) -> GeminiAnalysisRecord:
 async def create_batch(
     files: list[UploadFile],
     client_batch_id: str | None = Form(None),
+    ocr_languages: str | None = Form(None),
     storage_root: Path = Depends(get_storage_root),
     session: AsyncSession = Depends(get_session),
     processor: BatchProcessorProtocol = Depends(get_processor),
@@ -146,6 +174,7 @@ async def create_batch(
     logger.info("Received upload for batch %s (client_id=%s)", batch_id, client_batch_id or "auto")
 
     storage_root.mkdir(parents=True, exist_ok=True)
+    batch_languages = list(normalize_languages(ocr_languages))
 
     for upload in files:
         if not allowed_content_type(upload.content_type or "", ALLOWED_CONTENT_TYPES):
@@ -162,6 +191,8 @@ async def create_batch(
         metadata = None
         if (upload.content_type or "").startswith("image/"):
             metadata = extract_image_metadata(destination)
+        if batch_languages:
+            metadata = {**(metadata or {}), "ocr_languages": batch_languages}
 
         logger.debug(
             "Stored file for batch %s: %s (%s, %d bytes)",
@@ -189,15 +220,7 @@ async def create_batch(
     processor.enqueue(batch_id, stored_files)
 
     await event_bus.publish({"batchId": batch_id, "status": "processing"})
-    background_session_factory: async_sessionmaker[AsyncSession] | None = session.info.get("session_factory")  # type: ignore[arg-type]
-    if background_session_factory is None:
-        bind = session.get_bind()
-        if isinstance(bind, AsyncEngine):
-            background_session_factory = async_sessionmaker(bind, expire_on_commit=False, class_=AsyncSession)
-        elif hasattr(session, "bind") and isinstance(session.bind, AsyncEngine):
-            background_session_factory = async_sessionmaker(session.bind, expire_on_commit=False, class_=AsyncSession)
-        else:
-            background_session_factory = get_session_factory()
+    background_session_factory = _background_session_factory(session)
     asyncio.create_task(_run_pipeline_task(batch_id, stored_files, storage_root, background_session_factory))
 
     return BatchResponse(
@@ -241,6 +264,15 @@ async def ingestion_events(request: Request) -> StreamingResponse:
     return StreamingResponse(_event_stream(request, queue), media_type="text/event-stream")
 
 
+@router.get(
+    "/gemini/circuit",
+    summary="État du disjoncteur Gemini partagé (analyse d'images et synthèse)",
+    response_model=CircuitBreakerSchema,
+)
+async def read_gemini_circuit() -> CircuitBreakerSchema:
+    return CircuitBreakerSchema(**get_gemini_circuit_breaker().snapshot())
+
+
 @router.get("/batches/{batch_id}", summary="Récupérer un lot et sa timeline", response_model=BatchResponse)
 async def read_batch(batch_id: str, session: AsyncSession = Depends(get_session)) -> BatchResponse:
     batch = await batch_repo.get_batch(session, batch_id)
@@ -249,16 +281,127 @@ async def read_batch(batch_id: str, session: AsyncSession = Depends(get_session)
     return _serialize_batch(batch)
 
 
-@router.get("/reports/{batch_id}", summary="Télécharger le rapport généré")
-async def download_report(batch_id: str, session: AsyncSession = Depends(get_session)) -> FileResponse:
-    record = await batch_repo.get_batch(session, batch_id)
-    if not record or not record.report_path:
+@router.get("/reports/{batch_id}", summary="Télécharger le rapport généré (ETag, reprise par Range)")
+async def download_report(batch_id: str, request: Request, session: AsyncSession = Depends(get_session)) -> Response:
+    location = await batch_repo.get_report_location(session, batch_id)
+    if not location or not location[0]:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
-    report_path = Path(record.report_path)
-    if not report_path.exists():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
-    filename = report_path.name
-    return FileResponse(report_path, media_type="application/pdf", filename=filename)
+    report_path = Path(location[0])
+    # The report name links a content-addressed blob: serve that immutable blob, whose name is the
+    # SHA-256 of the bytes sent (a strong validator even while a regeneration republishes the report
+    # ahead of the stored hash). A plain copy only gets a weak validator.
+    store = ContentStore(report_path.parent / REPORT_STORE_DIRNAME, suffix=".pdf")
+    blob = store.resolve(report_path, checksum_hint=location[1])
+    served_path = blob or report_path
+    try:
+        stat = served_path.stat()
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found") from None
+
+    etag = f'"{blob.stem}"' if blob else f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": settings.REPORT_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    headers["Content-Disposition"] = f'attachment; filename="{report_path.name}"'
+    if_range = request.headers.get("if-range")
+    byte_range = None
+    if if_range is None or etag_matches(if_range, etag, weak=False):
+        try:
+            byte_range = parse_range(request.headers.get("range"), stat.st_size)
+        except RangeNotSatisfiableError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": f"bytes */{stat.st_size}"},
+            )
+    if byte_range is None:
+        return FileResponse(served_path, media_type="application/pdf", headers=headers, stat_result=stat)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_file_range(served_path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type="application/pdf",
+        headers=headers,
+    )
+
+
+@router.get("/reports/{batch_id}/html", summary="Rapport HTML autonome (streaming)")
+async def export_html_report(batch_id: str, session: AsyncSession = Depends(get_session)) -> StreamingResponse:
+    if await session.get(AuditBatch, batch_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
+    return StreamingResponse(
+        stream_html_report(_background_session_factory(session), batch_id),
+        media_type="text/html; charset=utf-8",
+        headers={"Content-Disposition": f'inline; filename="report-{batch_id}.html"'},
+    )
+
+
+@router.get(
+    "/batches/{batch_id}/exports/{dataset}",
+    summary="Exporter observations, textes OCR ou timeline (NDJSON/CSV, streaming)",
+)
+async def export_batch_dataset(
+    batch_id: str,
+    dataset: str,
+    format: str = "ndjson",  # noqa: A002 - public query parameter name
+    session: AsyncSession = Depends(get_session),
+) -> StreamingResponse:
+    if dataset not in EXPORT_COLUMNS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown export dataset: {dataset}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format: {format} (expected {', '.join(EXPORT_FORMATS)})",
+        )
+    if await session.get(AuditBatch, batch_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
+    return StreamingResponse(
+        stream_export(_background_session_factory(session), batch_id, dataset, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{batch_id}-{dataset}.{format}"'},
+    )
+
+
+@router.get(
+    "/batches/{batch_id}/thumbnails/{filename}",
+    summary="Vignette annotée (boîtes de détection) d'une photo du lot",
+)
+async def read_thumbnail(
+    batch_id: str,
+    filename: str,
+    storage_root: Path = Depends(get_storage_root),
+    session: AsyncSession = Depends(get_session),
+) -> FileResponse:
+    file = await batch_repo.get_batch_file(session, batch_id, filename)
+    if not file or not (file.content_type or "").startswith("image/"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+    rows = await batch_repo.list_file_observations(session, batch_id, filename)
+    boxes = [
+        AnnotatedBox(bbox=tuple(int(v) for v in row.bbox), label=row.label, severity=row.severity or "medium")
+        for row in rows
+        if isinstance(row.bbox, list) and len(row.bbox) == 4
+    ]
+    cache = ThumbnailCache(storage_root / THUMBNAIL_DIRNAME, max_edge=settings.THUMBNAIL_MAX_EDGE)
+    thumbnail = await asyncio.to_thread(
+        cache.get_or_create,
+        Path(file.stored_path),
+        boxes,
+        source_digest=file.checksum_sha256,
+    )
+    if thumbnail is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thumbnail unavailable")
+    return FileResponse(
+        thumbnail.path,
+        media_type="image/jpeg",
+        headers={"ETag": f'"{thumbnail.key}"', "Cache-Control": "private, max-age=3600"},
+    )
 
 
 @router.get(
@@ -286,15 +429,17 @@ async def get_batch_analysis(
 
 @router.post(
     "/batches/{batch_id}/analysis",
-    summary="Relancer l'analyse Gemini d'un lot existant",
-    response_model=GeminiAnalysisRecord,
+    summary="Relancer l'analyse Gemini d'un lot existant (tâche de fond)",
+    response_model=AnalysisJobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
 )
 async def rerun_batch_analysis(
     batch_id: str,
+    response: Response,
     payload: GeminiAnalysisRequest | None = None,
     storage_root: Path = Depends(get_storage_root),
     session: AsyncSession = Depends(get_session),
-) -> GeminiAnalysisRecord:
+) -> AnalysisJobSchema:
     batch = await batch_repo.get_batch(session, batch_id)
     if not batch:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
@@ -331,45 +476,227 @@ async def rerun_batch_analysis(
     if not image_records:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No image files available for analysis.")
 
-    result = analyzer.analyze(batch_id, image_records)
+    session_factory = _background_session_factory(session)
+    job, created = analysis_jobs.submit(
+        batch_id,
+        len(image_records),
+        lambda job: _run_analysis_job(job, analyzer, image_records, session_factory, storage_root),
+        requested_by=(payload.requested_by if payload else None) or "api:manual",
+    )
+    if not created:
+        logger.info("Gemini rerun for batch %s already %s as job %s", batch_id, job.status, job.job_id)
+    response.headers["Location"] = f"{settings.API_V1_PREFIX}/ingestion/analysis-jobs/{job.job_id}"
+    return AnalysisJobSchema(**job.as_dict(), deduplicated=not created)
+
+
+@router.get(
+    "/analysis-jobs/{job_id}",
+    summary="Suivre une relance d'analyse Gemini",
+    response_model=AnalysisJobSchema,
+)
+async def read_analysis_job(job_id: str) -> AnalysisJobSchema:
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Analysis job not found")
+    return AnalysisJobSchema(**job.as_dict())
+
+
+@router.delete(
+    "/analysis-jobs/{job_id}",
+    summary="Annuler une relance d'analyse Gemini",
+    response_model=AnalysisJobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def cancel_analysis_job(job_id: str) -> AnalysisJobSchema:
+    job = analysis_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Analysis job not found")
+    return AnalysisJobSchema(**job.as_dict())
+
+
+async def _run_analysis_job(
+    job: AnalysisJob,
+    analyzer: AdvancedAnalyzer,
+    image_records: Sequence[tuple[Path, str | None, str | None]],
+    session_factory: async_sessionmaker[AsyncSession],
+    storage_root: Path,
+) -> None:
+    loop = asyncio.get_running_loop()
+
+    def on_progress(done: int, total: int, filename: str) -> None:
+        # Called from analyzer worker threads.
+        job.processed_images = done
+        job.last_image = filename
+        asyncio.run_coroutine_threadsafe(analysis_jobs.publish(job), loop)
+
+    try:
+        result = await asyncio.to_thread(
+            analyzer.analyze,
+            job.batch_id,
+            image_records,
+            progress=on_progress,
+            cancel_event=job.cancel_event,
+        )
+    except AnalysisCancelled:
+        return
+
     gemini_observations = result.observations or []
     gemini_payload = [_observation_payload(obs, "gemini") for obs in gemini_observations] if gemini_observations else None
 
-    await batch_repo.replace_observations(
-        session,
-        batch_id,
-        gemini_observations,
-        source="gemini",
-        replace_existing=True,
-        clear_source="gemini",
+    async with session_factory() as session:
+        await batch_repo.replace_observations(
+            session,
+            job.batch_id,
+            gemini_observations,
+            source="gemini",
+            replace_existing=True,
+            clear_source="gemini",
+        )
+
+        record = await batch_repo.add_gemini_analysis(
+            session,
+            job.batch_id,
+            provider=result.provider,
+            model=result.model or analyzer.model,
+            status=result.status,
+            prompt_hash=result.prompt_hash,
+            prompt_version=result.prompt_version,
+            duration_ms=result.duration_ms,
+            summary=result.summary,
+            warnings=result.warnings,
+            observations_json=gemini_payload,
+            raw_response=result.payloads,
+            requested_by=job.requested_by,
+            cache_hits=result.cache_hits,
+            cache_misses=result.cache_misses,
+        )
+
+        await batch_repo.update_batch(
+            session,
+            job.batch_id,
+            gemini_status=result.status,
+            gemini_summary=result.summary,
+            gemini_prompt_hash=result.prompt_hash,
+            gemini_model=result.model or analyzer.model,
+        )
+
+        batch = await batch_repo.get_batch(session, job.batch_id)
+        if batch is not None and batch.report_path:
+            # Only the sections fed by Gemini observations are rebuilt; the others come from the cache.
+            await _regenerate_report(session, batch, storage_root)
+
+    job.analysis_id = record.id
+    job.result_status = result.status
+
+
+def _report_builder(reports_dir: Path) -> ReportBuilder:
+    return ReportBuilder(
+        reports_dir,
+        large_batch_threshold=settings.REPORT_LARGE_BATCH_THRESHOLD,
+        max_table_rows=settings.REPORT_TABLE_MAX_ROWS,
+        max_thumbnails=settings.REPORT_THUMBNAILS_MAX,
+        thumbnail_edge=settings.THUMBNAIL_MAX_EDGE,
     )
 
-    record = await batch_repo.add_gemini_analysis(
-        session,
-        batch_id,
-        provider=result.provider,
-        model=result.model or analyzer.model,
-        status=result.status,
-        prompt_hash=result.prompt_hash,
-        prompt_version=result.prompt_version,
-        duration_ms=result.duration_ms,
-        summary=result.summary,
-        warnings=result.warnings,
-        observations_json=gemini_payload,
-        raw_response=result.payloads,
-        requested_by=(payload.requested_by if payload else None) or "api:manual",
+
+def _report_context_from_batch(builder: ReportBuilder, batch: AuditBatch, storage_root: Path) -> ReportContext:
+    """Report inputs rebuilt from the stored rows of a processed batch."""
+    observations = [
+        Observation(
+            source_file=obs.filename,
+            label=obs.label,
+            confidence=float(obs.confidence or 0.0),
+            severity=obs.severity or "medium",
+            bbox=tuple(obs.bbox) if obs.bbox else None,
+            extra={**(obs.extra or {}), "source": (obs.extra or {}).get("source", obs.source)},
+        )
+        for obs in batch.observations
+    ]
+    ocr_texts = [
+        OCRResult(source_file=row.filename, text=content, confidence=row.confidence, extra=row.extra or {})
+        for row, content in batch_repo.merge_ocr_chunks(batch.ocr_texts)
+    ]
+    risk = None
+    if batch.risk_score:
+        breakdown_items = batch.risk_score.breakdown if isinstance(batch.risk_score.breakdown, list) else []
+        risk = RiskScore(
+            batch_id=batch.id,
+            total_score=float(batch.risk_score.total_score),
+            normalized_score=float(batch.risk_score.normalized_score),
+            breakdown=[
+                RiskBreakdown(
+                    label=str(item.get("label", "")),
+                    severity=str(item.get("severity", "")),
+                    count=int(item.get("count", 0)),
+                    score=float(item.get("score", 0.0)),
+                )
+                for item in breakdown_items
+                if isinstance(item, dict)
+            ],
+        )
+    latest_analysis = max(batch.gemini_analyses, key=lambda item: item.created_at, default=None)
+    summary = batch.report_summary
+    timeline = [
+        {
+            "code": event.code,
+            "label": event.label,
+            "kind": event.kind,
+            "timestamp": event.timestamp.isoformat(),
+            "progress": event.progress,
+            "details": event.details,
+            "technicalDetails": event.technical_details,
+        }
+        for event in batch.events
+    ]
+    result = PipelineResult(
+        batch_id=batch.id,
+        observations=observations,
+        ocr_texts=ocr_texts,
+        risk=risk,
+        gemini_status=batch.gemini_status,
+        gemini_provider=latest_analysis.provider if latest_analysis else None,
+        gemini_duration_ms=latest_analysis.duration_ms if latest_analysis else None,
+        gemini_prompt_hash=batch.gemini_prompt_hash,
+        summary_text=summary.summary_text if summary else None,
+        summary_findings=[str(item) for item in summary.findings or []] if summary else None,
+        summary_recommendations=[str(item) for item in summary.recommendations or []] if summary else None,
+        summary_status=summary.status if summary else None,
+        summary_source=summary.source if summary else None,
+        summary_prompt_hash=summary.prompt_hash if summary else None,
+        summary_response_hash=summary.response_hash if summary else None,
+        summary_warnings=[str(item) for item in summary.warnings or []] if summary else None,
     )
+    return builder.build_context(result, timeline=timeline, storage_root=storage_root)
+
 
+async def _regenerate_report(session: AsyncSession, batch: AuditBatch, storage_root: Path) -> ReportArtifact:
+    builder = _report_builder(Path(batch.report_path).parent)
+    context = _report_context_from_batch(builder, batch, storage_root)
+    artifact = await get_report_render_pool().render_async(builder, context)
     await batch_repo.update_batch(
         session,
-        batch_id,
-        gemini_status=result.status,
-        gemini_summary=result.summary,
-        gemini_prompt_hash=result.prompt_hash,
-        gemini_model=result.model or analyzer.model,
+        batch.id,
+        report_path=str(artifact.path),
+        report_hash=artifact.checksum_sha256,
     )
-
-    return _serialize_gemini_record(record)
+    # Published but not persisted: the stored timeline (rendered in the report) stays unchanged,
+    # so the sections showing it keep their cached fragments on the next regeneration.
+    stage = {
+        "eventId": uuid4().hex,
+        "code": "report:generated",
+        "label": "Rapport PDF régénéré",
+        "kind": "success",
+        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+        "progress": 100,
+        "details": {"hash": artifact.checksum_sha256, "reusedSections": list(artifact.reused_sections)},
+    }
+    await event_bus.publish({"batchId": batch.id, "stage": stage, "reportHash": artifact.checksum_sha256})
+    logger.info(
+        "Report for batch %s regenerated (reused sections: %s)",
+        batch.id,
+        ", ".join(artifact.reused_sections) or "none",
+    )
+    return artifact
 
 
 async def _run_pipeline_task(
@@ -431,6 +758,7 @@ async def _run_pipeline_task(
         "analysis:status": 65,
         "analysis:complete": 75,
         "scoring:complete": 85,
+        "gemini:complete": 87,
         "report:generated": 95,
         "report:available": 100,
         "pipeline:error": 100,
@@ -481,6 +809,7 @@ async def _run_pipeline_task(
                 "timestamp": timestamp,
                 "progress": stage.get("progress"),
                 "details": public_details,
+                "technical_details": technical_details,
             }
         )
         return stage
@@ -519,7 +848,7 @@ async def _run_pipeline_task(
 
     reports_dir = storage_root / "reports"
     pipeline = IngestionPipeline(storage_root, simulate_latency=True)
-    report_builder = ReportBuilder(reports_dir)
+    report_builder = _report_builder(reports_dir)
 
     async with session_factory() as session:
         try:
@@ -541,16 +870,38 @@ async def _run_pipeline_task(
             if pipeline.simulate_latency_enabled and SIMULATED_METADATA_DELAY_SECONDS > 0:
                 await asyncio.sleep(SIMULATED_METADATA_DELAY_SECONDS)
 
-            pipeline_result = pipeline.run(
-                batch_id,
-                stored_files,
-                progress=lambda stage, data: schedule_stage(
-                    stage,
-                    data.get("label", stage),
-                    details={k: v for k, v in data.items() if k not in {"label", "progress"}},
-                    progress=int(data["progress"]) if "progress" in data else None,
-                ),
-            )
+            loop = asyncio.get_running_loop()
+            summary_deltas = 0
+
+            def on_pipeline_progress(stage: str, data: dict[str, Any]) -> None:
+                # Runs in the pipeline worker thread.
+                nonlocal summary_deltas
+                if stage == "summary:delta":
+                    # Partial summary text: streamed to SSE clients, kept out of the timeline and DB.
+                    summary_deltas += 1
+                    delta_event = {
+                        "batchId": batch_id,
+                        "summaryDelta": {
+                            "code": stage,
+                            "seq": summary_deltas,
+                            "delta": data.get("delta", ""),
+                            "text": data.get("text", ""),
+                        },
+                    }
+                    asyncio.run_coroutine_threadsafe(event_bus.publish(delta_event), loop)
+                    return
+                loop.call_soon_threadsafe(
+                    partial(
+                        schedule_stage,
+                        stage,
+                        data.get("label", stage),
+                        details={k: v for k, v in data.items() if k not in {"label", "progress"}},
+                        progress=int(data["progress"]) if "progress" in data else None,
+                    )
+                )
+
+            # In a worker thread so the event loop keeps serving SSE (stages, summary deltas) meanwhile.
+            pipeline_result = await asyncio.to_thread(pipeline.run, batch_id, stored_files, on_pipeline_progress)
 
             await batch_repo.replace_observations(
                 session,
@@ -610,21 +961,43 @@ async def _run_pipeline_task(
                 observations_json=gemini_observation_payload,
                 raw_response=pipeline_result.gemini_payloads,
                 requested_by="pipeline:auto",
+                cache_hits=pipeline_result.gemini_cache_hits,
+                cache_misses=pipeline_result.gemini_cache_misses,
             )
 
             if pipeline.simulate_latency_enabled and SIMULATED_REPORT_DELAY_SECONDS > 0:
                 await asyncio.sleep(SIMULATED_REPORT_DELAY_SECONDS)
 
-            artifact = report_builder.build_from_pipeline(
+            def on_render_progress(state: str, queued_ahead: int) -> None:
+                if state == "queued":
+                    schedule_stage(
+                        "report:generated",
+                        "Rapport PDF en file d'attente de rendu",
+                        details={"queuedAhead": queued_ahead},
+                        progress=90,
+                    )
+                else:
+                    schedule_stage("report:generated", "Génération du rapport PDF", progress=92)
+
+            report_context = report_builder.build_context(
                 pipeline_result,
                 timeline=timeline_events,
                 storage_root=storage_root,
             )
+            artifact = await get_report_render_pool().render_async(
+                report_builder,
+                report_context,
+                on_progress=on_render_progress,
+            )
             await emit_stage(
                 "report:generated",
                 "Rapport PDF généré",
                 kind="success",
-                details={"hash": artifact.checksum_sha256, "path": str(artifact.path)},
+                details={
+                    "hash": artifact.checksum_sha256,
+                    "path": str(artifact.path),
+                    "reusedSections": list(artifact.reused_sections),
+                },
                 progress=95,
             )
 
@@ -710,12 +1083,13 @@ def _serialize_batch(batch: AuditBatch) -> BatchResponse:
         {
             "filename": text.filename,
             "engine": text.engine,
-            "content": text.content,
+            "content": content,
             "confidence": text.confidence,
             "warnings": text.warnings,
             "error": text.error,
+            "extra": text.extra,
         }
-        for text in batch.ocr_texts
+        for text, content in batch_repo.merge_ocr_chunks(batch.ocr_texts)
     ]
     observations = [
         {
@@ -28,18 +28,113 @@ class Settings(BaseSettings):
     )
     OCR_ENGINE: str = Field(default="easyocr", description="OCR engine identifier")
     OCR_LANGUAGES: list[str] = Field(default_factory=lambda: ["fr", "en"])
+    OCR_PREPROCESS_MODE: str = Field(
+        default="auto",
+        description="OCR image preprocessing profile (auto|none|fast|full)",
+    )
+    OCR_READER_POOL_SIZE: int = Field(
+        default=2,
+        description="Maximum number of EasyOCR readers (one per language set) kept in memory",
+    )
+    OCR_READER_MEMORY_BUDGET_MB: int = Field(
+        default=1024,
+        description="Memory budget for pooled EasyOCR readers; cold readers are evicted beyond it (0 = no limit)",
+    )
+    OCR_READER_RETRY_SECONDS: int = Field(
+        default=300,
+        description="Delay before retrying to load an EasyOCR reader whose initialisation failed",
+    )
+    OCR_TESSERACT_WORKERS: int = Field(
+        default=2,
+        description="Worker processes for the Tesseract fallback engine (0 = serial, in-process)",
+    )
+    OCR_TEXT_MAX_STORED_CHARS: int = Field(
+        default=200_000,
+        description="Characters of a text/DOCX extraction kept in the database; the full text goes to a sidecar file",
+    )
+    OCR_TEXT_MAX_INPUT_MB: int = Field(
+        default=512,
+        description="Maximum bytes read from a text/DOCX upload during extraction (0 = no limit)",
+    )
+    OCR_TEXT_CHUNK_CHARS: int = Field(
+        default=50_000,
+        description="Long OCR texts are stored across several ocr_texts rows of at most this many characters",
+    )
+    OCR_EMBEDDED_IMAGES: bool = Field(
+        default=True,
+        description="OCR (and run vision on) images embedded in DOCX/PDF documents",
+    )
+    OCR_EMBEDDED_IMAGES_MAX: int = Field(
+        default=200,
+        description="Maximum unique embedded images analysed per document (0 = no limit)",
+    )
+    OCR_EMBEDDED_IMAGE_MIN_SIDE: int = Field(
+        default=64,
+        description="Embedded images smaller than this (pixels, shortest side) are ignored as decorations",
+    )
+    OCR_EMBEDDED_IMAGE_MAX_MB: int = Field(
+        default=20,
+        description="Embedded images larger than this (encoded size) are skipped",
+    )
     VISION_MODEL_PATH: str = Field(default="ultralytics/yolov8n.pt")
     VISION_ENABLE_YOLO: bool = Field(default=True, description="Enable YOLO vision engine (fallback to legacy if false)")
     GEMINI_ENABLED: bool = Field(default=False, description="Enable Gemini advanced analysis")
     GEMINI_REQUIRED: bool = Field(default=False, description="Treat Gemini failures as blocking")
     GEMINI_API_KEY: str | None = Field(default=None)
     GEMINI_MODEL: str = Field(default="gemini-2.0-flash-exp")
+    GEMINI_API_ENDPOINT: str | None = Field(
+        default=None,
+        description="Override of the Gemini endpoint (REST), e.g. a local stand-in at http://127.0.0.1:8787",
+    )
     GEMINI_TIMEOUT_SECONDS: int = Field(default=15, description="Timeout per Gemini request (seconds)")
     GEMINI_MAX_TOTAL_SECONDS: int = Field(
         default=600,
         description="Budget de temps cumulé (secondes) alloué aux tentatives Gemini pour un fichier",
     )
     GEMINI_MAX_RETRIES: int = Field(default=2, description="Maximum retries for Gemini calls")
+    GEMINI_MAX_CONCURRENCY: int = Field(default=4, description="Gemini image analyses in flight per batch")
+    GEMINI_RPM_LIMIT: int = Field(default=15, description="Process-wide Gemini requests per minute (0 = unlimited)")
+    GEMINI_TPM_LIMIT: int = Field(
+        default=1_000_000,
+        description="Process-wide Gemini tokens per minute (0 = unlimited)",
+    )
+    GEMINI_CACHE_ENABLED: bool = Field(default=True, description="Reuse Gemini image analyses across batches")
+    GEMINI_CACHE_PATH: str = Field(default="tmp/cache/gemini_responses.sqlite3")
+    GEMINI_CACHE_TTL_SECONDS: int = Field(
+        default=30 * 24 * 3600,
+        description="Lifetime of cached Gemini responses (0 = never expire)",
+    )
+    GEMINI_CACHE_MAX_MB: int = Field(default=256, description="Size bound of the Gemini response cache (0 = unlimited)")
+    SUMMARY_CACHE_ENABLED: bool = Field(default=True, description="Reuse summaries generated for identical prompts")
+    SUMMARY_CACHE_PATH: str = Field(default="tmp/cache/summary_results.sqlite3")
+    SUMMARY_CACHE_TTL_SECONDS: int = Field(
+        default=7 * 24 * 3600,
+        description="Lifetime of cached summaries (0 = never expire)",
+    )
+    SUMMARY_CACHE_MAX_MB: int = Field(default=32, description="Size bound of the summary cache (0 = unlimited)")
+    GEMINI_ANALYSIS_JOB_CONCURRENCY: int = Field(
+        default=1,
+        description="Manual Gemini re-analysis jobs running at once; further jobs wait queued",
+    )
+    GEMINI_BREAKER_FAILURE_THRESHOLD: int = Field(
+        default=5,
+        description="Consecutive Gemini quota/timeout failures that open the shared circuit breaker",
+    )
+    GEMINI_BREAKER_RESET_SECONDS: int = Field(
+        default=60,
+        description="Seconds the Gemini circuit stays open before a half-open probe",
+    )
+    GEMINI_GROUP_SIZE: int = Field(
+        default=1,
+        description="Images sharing zone and site type sent in one Gemini request (1 = one request per image)",
+    )
+    GEMINI_UPLOAD_MAX_EDGE: int = Field(
+        default=1600,
+        description="Long edge (px) images are resized to before Gemini upload (0 = keep resolution)",
+    )
+    GEMINI_UPLOAD_FORMAT: str = Field(default="jpeg", description="Upload encoding: jpeg, webp or original")
+    GEMINI_UPLOAD_QUALITY: int = Field(default=80, description="JPEG/WebP quality of re-encoded uploads")
+    GEMINI_UPLOAD_CACHE_MB: int = Field(default=64, description="In-memory cache of re-encoded uploads (0 = disabled)")
     EASY_OCR_DOWNLOAD_ENABLED: bool = Field(
         default=True,
         description="Allow EasyOCR to download missing model weights at runtime",
@@ -50,14 +145,68 @@ class Settings(BaseSettings):
     GEMINI_SUMMARY_MODEL: str = Field(default="gemini-2.0-flash-exp")
     GEMINI_SUMMARY_TIMEOUT_SECONDS: int = Field(default=30, description="Timeout per summary request (seconds)")
     GEMINI_SUMMARY_MAX_RETRIES: int = Field(default=2, description="Maximum retries for summary generation")
+    SUMMARY_ENGINE: str = Field(
+        default="gemini",
+        description="Primary summary engine: 'gemini' (LLM with fallbacks) or 'extractive' (local, no network)",
+    )
+    SUMMARY_PLACEHOLDER_ENABLED: bool = Field(
+        default=True,
+        description="Publish the extractive summary at once while the LLM summary is being generated",
+    )
+    GEMINI_SUMMARY_STREAMING: bool = Field(
+        default=True,
+        description="Stream the summary response and publish partial text (summary:delta) while it is written",
+    )
     SUMMARY_FALLBACK_ENABLED: bool = Field(
         default=False,
         description="Enable local fallback model when Gemini summary is unavailable",
     )
     SUMMARY_FALLBACK_MODEL: str = Field(default="ollama/llama3.1", description="Fallback model identifier")
+    SUMMARY_FALLBACK_URL: str = Field(
+        default="http://127.0.0.1:11434",
+        description="Base URL of the Ollama-compatible server used by the summary fallback",
+    )
+    SUMMARY_FALLBACK_TIMEOUT_SECONDS: int = Field(default=60, description="Timeout per fallback summary request (seconds)")
+    SUMMARY_FALLBACK_MAX_CONCURRENCY: int = Field(default=1, description="Concurrent local fallback generations")
+    SUMMARY_FALLBACK_CONTEXT_TOKENS: int = Field(default=4096, description="Context window of the fallback model")
+    SUMMARY_FALLBACK_MAX_OUTPUT_TOKENS: int = Field(default=768, description="Tokens reserved for the fallback answer")
+    REPORT_RENDER_WORKERS: int = Field(
+        default=1,
+        description="Processes rendering report PDFs (0 = render in a thread of the API process)",
+    )
+    REPORT_RENDER_QUEUE_SIZE: int = Field(
+        default=4,
+        description="Reports waiting for a render worker; further submissions block until a slot frees",
+    )
+    REPORT_RENDER_TIMEOUT_SECONDS: int = Field(default=300, description="Maximum time to render one report (seconds)")
+    REPORT_LARGE_BATCH_THRESHOLD: int = Field(
+        default=1000,
+        description="Observations above which the report groups them per file/label and attaches a CSV (0 = never)",
+    )
+    REPORT_TABLE_MAX_ROWS: int = Field(
+        default=500,
+        description="Grouped observation rows printed in a large-batch report; the rest is summarised",
+    )
+    REPORT_THUMBNAILS_MAX: int = Field(
+        default=6,
+        description="Annotated photo thumbnails embedded in a report, worst detections first (0 = none)",
+    )
+    THUMBNAIL_MAX_EDGE: int = Field(default=320, description="Long edge (px) of annotated thumbnails")
+    REPORT_CACHE_CONTROL: str = Field(
+        default="public, no-cache",
+        description="Cache-Control of report downloads; clients and proxies keep the PDF and revalidate it by ETag",
+    )
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
+    @field_validator("OCR_PREPROCESS_MODE", mode="before")
+    @classmethod
+    def _check_preprocess_mode(cls, value):  # noqa: D401 - simple normalizer
+        mode = str(value or "auto").strip().lower()
+        if mode not in {"auto", "none", "fast", "full"}:
+            raise ValueError(f"OCR_PREPROCESS_MODE must be auto, none, fast or full (got {value!r})")
+        return mode
+
     @field_validator("OCR_LANGUAGES", mode="before")
     @classmethod
     def _coerce_languages(cls, value):  # noqa: D401 - simple normalizer
@@ -34,7 +34,7 @@ class AuditBatch(SQLModel, table=True):
     )
     ocr_texts: List["OCRText"] = Relationship(
         back_populates="batch",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan", "order_by": "OCRText.created_at"},
+        sa_relationship_kwargs={"cascade": "all, delete-orphan", "order_by": "[OCRText.created_at, OCRText.id]"},
     )
     observations: List["VisionObservation"] = Relationship(
         back_populates="batch",
@@ -89,6 +89,10 @@ class ProcessingEvent(SQLModel, table=True):
         default=None,
         sa_column=Column(JSON, nullable=True),
     )
+    technical_details: Optional[dict[str, Any]] = Field(
+        default=None,
+        sa_column=Column(JSON, nullable=True),
+    )
 
     batch: "AuditBatch" = Relationship(back_populates="events")
 
@@ -101,12 +105,17 @@ class OCRText(SQLModel, table=True):
     filename: str
     engine: str = Field(default="unknown")
     content: str = Field(default="")
+    chunk_index: int = Field(default=0)
     confidence: Optional[float] = Field(default=None)
     warnings: Optional[list[str]] = Field(
         default=None,
         sa_column=Column(JSON, nullable=True),
     )
     error: Optional[str] = Field(default=None)
+    extra: Optional[dict[str, Any]] = Field(
+        default=None,
+        sa_column=Column(JSON, nullable=True),
+    )
     created_at: datetime = Field(default_factory=utcnow, nullable=False)
 
     batch: "AuditBatch" = Relationship(back_populates="ocr_texts")
@@ -147,6 +156,8 @@ class GeminiAnalysis(SQLModel, table=True):
     prompt_hash: Optional[str] = Field(default=None, index=True)
     prompt_version: Optional[str] = Field(default=None)
     duration_ms: Optional[int] = Field(default=None)
+    cache_hits: Optional[int] = Field(default=None)
+    cache_misses: Optional[int] = Field(default=None)
     summary: Optional[str] = Field(default=None)
     warnings: Optional[list[str]] = Field(
         default=None,
@@ -25,6 +25,7 @@ class OCRResult:
     confidence: float | None = None
     warnings: list[str] = field(default_factory=list)
     error: str | None = None
+    extra: dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass(slots=True)
@@ -44,6 +45,8 @@ class PipelineResult:
     gemini_model: str | None = None
     gemini_provider: str | None = None
     gemini_prompt_version: str | None = None
+    gemini_cache_hits: int | None = None
+    gemini_cache_misses: int | None = None
     risk: "RiskScore | None" = None
     summary_text: str | None = None
     summary_status: str | None = None
@@ -1,23 +1,173 @@
 from __future__ import annotations
 
+import atexit
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
+from typing import Any, Iterable, Sequence
 
 try:
     import pytesseract
 except Exception:  # pragma: no cover - fallback used when lib unavailable
     pytesseract = None
 
+try:  # pragma: no cover - optional persistent Tesseract binding
+    import tesserocr  # type: ignore
+except Exception:  # noqa: BLE001
+    tesserocr = None  # type: ignore[assignment]
+
 from PIL import Image
 
+# EasyOCR-style language codes -> Tesseract traineddata names.
+TESSERACT_LANGUAGE_CODES: dict[str, str] = {
+    "en": "eng",
+    "fr": "fra",
+    "ar": "ara",
+    "de": "deu",
+    "es": "spa",
+    "it": "ita",
+    "pt": "por",
+}
+
+# Tesseract's own default, shipped with every install.
+DEFAULT_TESSERACT_LANGUAGE = "eng"
+
+logger = logging.getLogger(__name__)
+
+# Persistent API of the current worker process (set by the pool initializer).
+_worker_api: Any = None
+
+
+def tesseract_languages(languages: Iterable[str] | None) -> str | None:
+    codes: list[str] = []
+    for language in languages or []:
+        code = TESSERACT_LANGUAGE_CODES.get(language.strip().lower(), language.strip().lower())
+        if code and code not in codes:
+            codes.append(code)
+    return "+".join(codes) or None
+
+
+@functools.lru_cache(maxsize=1)
+def _installed_languages() -> frozenset[str] | None:
+    """Traineddata available to Tesseract, or ``None`` when it cannot be determined."""
+    try:
+        if tesserocr is not None:
+            return frozenset(tesserocr.get_languages()[1])
+        if pytesseract is not None:
+            return frozenset(pytesseract.get_languages(config=""))
+    except Exception:  # noqa: BLE001
+        return None
+    return None
+
+
+def usable_tesseract_languages(lang: str | None) -> str | None:
+    """Drop languages whose traineddata is not installed, falling back to ``eng``.
+
+    Tesseract fails the whole call when one requested language is missing, which
+    ``extract_text`` would turn into an empty text.
+    """
+    if not lang:
+        return lang
+    installed = _installed_languages()
+    if installed is None:
+        return lang
+    codes = [code for code in lang.split("+") if code in installed]
+    missing = [code for code in lang.split("+") if code not in installed]
+    if missing:
+        logger.warning("Tesseract traineddata missing for %s; using %s", "+".join(missing), "+".join(codes) or "eng")
+    return "+".join(codes) or DEFAULT_TESSERACT_LANGUAGE
 
-def extract_text(image_path: Path) -> str:
+
+def extract_text(image_path: Path, lang: str | None = None) -> str:
     """Run OCR using Tesseract when available, fallback to empty string."""
+    lang = usable_tesseract_languages(lang)
     try:
         with Image.open(image_path) as image:
+            if _worker_api is not None:
+                _worker_api.SetImage(image)
+                return _worker_api.GetUTF8Text()
+            if tesserocr is not None:
+                return tesserocr.image_to_text(image, lang=lang or DEFAULT_TESSERACT_LANGUAGE)
             if pytesseract is not None:
-                return pytesseract.image_to_string(image)
+                return pytesseract.image_to_string(image, lang=lang)
             # Minimal fallback: return placeholder with dimensions
             width, height = image.size
             return f"[ocr-unavailable] image {width}x{height}px"
     except Exception:
         return ""
+
+
+def _init_worker(lang: str | None) -> None:
+    """Create one persistent Tesseract API per worker process when tesserocr is installed."""
+    global _worker_api  # noqa: PLW0603
+    if tesserocr is None:
+        return
+    try:
+        _worker_api = tesserocr.PyTessBaseAPI(lang=usable_tesseract_languages(lang) or DEFAULT_TESSERACT_LANGUAGE)
+    except Exception:  # noqa: BLE001
+        _worker_api = None
+        return
+    atexit.register(_worker_api.End)
+
+
+def _extract_in_worker(image_path: str, lang: str | None) -> str:
+    return extract_text(Path(image_path), lang)
+
+
+class TesseractPool:
+    """Bounded process pool running Tesseract OCR on many images concurrently."""
+
+    def __init__(self, max_workers: int, lang: str | None = None) -> None:
+        self.max_workers = max(1, max_workers)
+        self.lang = lang
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.lang,),
+                )
+            return self._executor
+
+    def submit(self, image_path: Path) -> Future[str]:
+        return self._get_executor().submit(_extract_in_worker, str(image_path), self.lang)
+
+    def map(self, image_paths: Sequence[Path]) -> list[str]:
+        futures = [self.submit(path) for path in image_paths]
+        return [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# One pool per (workers, languages): worker processes keep a Tesseract API bound to their language.
+_pools: dict[tuple[int, str | None], TesseractPool] = {}
+_pool_lock = threading.Lock()
+
+
+def get_tesseract_pool(max_workers: int, lang: str | None = None) -> TesseractPool:
+    key = (max(1, max_workers), lang)
+    with _pool_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = TesseractPool(max_workers, lang)
+            atexit.register(pool.shutdown)
+        return pool
+
+
+def extract_texts(image_paths: Sequence[Path], max_workers: int = 1, lang: str | None = None) -> list[str]:
+    """OCR several images, concurrently when ``max_workers`` > 1."""
+    if max_workers <= 1 or len(image_paths) <= 1:
+        return [extract_text(path, lang) for path in image_paths]
+    return get_tesseract_pool(max_workers, lang).map(image_paths)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any
 
 try:
     import cv2  # type: ignore
@@ -19,10 +20,20 @@ def detect_anomalies(image_path: Path) -> list[Observation]:
     - If OpenCV is available, computes simple brightness heuristic.
     - Otherwise produces a placeholder observation so the pipeline stays testable.
     """
-    label = "general"
+    image = None
     try:
         if cv2 is not None and np is not None:
             image = cv2.imread(str(image_path))
+    except Exception:
+        image = None
+    return detect_anomalies_in_image(image, image_path.name)
+
+
+def detect_anomalies_in_image(image: Any, source_name: str) -> list[Observation]:
+    """Same heuristic as :func:`detect_anomalies` for an already decoded BGR image."""
+    label = "general"
+    try:
+        if cv2 is not None and np is not None:
             if image is None:
                 raise ValueError("Unable to read image.")
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
@@ -31,7 +42,7 @@ def detect_anomalies(image_path: Path) -> list[Observation]:
             confidence = min(0.99, mean_brightness / 255.0)
             return [
                 Observation(
-                    source_file=image_path.name,
+                    source_file=source_name,
                     label=label,
                     confidence=confidence,
                     severity=severity,
@@ -44,7 +55,7 @@ def detect_anomalies(image_path: Path) -> list[Observation]:
 
     return [
         Observation(
-            source_file=image_path.name,
+            source_file=source_name,
             label=label,
             confidence=0.2,
             severity="low",
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Iterable, Sequence
+from typing import Any, Iterable, Iterator, Sequence
 
 from sqlalchemy import delete, select
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models import (
     AuditBatch,
     BatchFile,
@@ -137,6 +138,15 @@ async def get_batch(session: AsyncSession, batch_id: str) -> AuditBatch | None:
     return batch
 
 
+async def get_report_location(session: AsyncSession, batch_id: str) -> tuple[str | None, str | None] | None:
+    """``(report_path, report_hash)`` of a batch without loading its relationships."""
+    result = await session.execute(
+        select(AuditBatch.report_path, AuditBatch.report_hash).where(AuditBatch.id == batch_id)
+    )
+    row = result.one_or_none()
+    return (row.report_path, row.report_hash) if row else None
+
+
 async def list_events(session: AsyncSession, batch_id: str) -> Sequence[ProcessingEvent]:
     result = await session.execute(
         select(ProcessingEvent).where(ProcessingEvent.batch_id == batch_id).order_by(ProcessingEvent.timestamp)
@@ -161,6 +171,7 @@ async def add_events(
                 timestamp=event["timestamp"],
                 progress=event.get("progress"),
                 details=event.get("details"),
+                technical_details=event.get("technical_details"),
             )
             for event in events
         ]
@@ -168,15 +179,42 @@ async def add_events(
     await session.commit()
 
 
+def _split_text(content: str, chunk_chars: int) -> list[str]:
+    if chunk_chars <= 0 or len(content) <= chunk_chars:
+        return [content]
+    return [content[start : start + chunk_chars] for start in range(0, len(content), chunk_chars)]
+
+
+def merge_ocr_chunks(rows: Iterable[OCRText]) -> Iterator[tuple[OCRText, str]]:
+    """Yield each head OCR row with its full content, consuming ``rows`` lazily.
+
+    Rows come in storage order: ``chunk_index`` > 0 rows continue the head row right before them.
+    """
+    head: OCRText | None = None
+    parts: list[str] = []
+    for row in rows:
+        if row.chunk_index and head is not None and row.filename == head.filename:
+            parts.append(row.content)
+            continue
+        if head is not None:
+            yield head, "".join(parts)
+        head, parts = row, [row.content]
+    if head is not None:
+        yield head, "".join(parts)
+
+
 async def replace_ocr_texts(
     session: AsyncSession,
     batch_id: str,
     ocr_entries: Iterable,
     engine_id: str | None = None,
+    *,
+    chunk_chars: int | None = None,
 ) -> None:
     await session.execute(delete(OCRText).where(OCRText.batch_id == batch_id))
 
     engine_name = (engine_id or "unknown").lower()
+    chunk_size = settings.OCR_TEXT_CHUNK_CHARS if chunk_chars is None else chunk_chars
     to_persist = []
     for entry in ocr_entries:
         if hasattr(entry, "source_file") and hasattr(entry, "text"):
@@ -185,12 +223,14 @@ async def replace_ocr_texts(
             confidence = getattr(entry, "confidence", None)
             warnings = getattr(entry, "warnings", None)
             error = getattr(entry, "error", None)
+            extra = getattr(entry, "extra", None)
         elif isinstance(entry, dict):
             filename = entry.get("source_file") or entry.get("filename") or "unknown"
             content = entry.get("text", "")
             confidence = entry.get("confidence")
             warnings = entry.get("warnings")
             error = entry.get("error")
+            extra = entry.get("extra")
         else:
             continue
         warnings_iter: list[str] | None = None
@@ -202,17 +242,29 @@ async def replace_ocr_texts(
         except (TypeError, ValueError):
             confidence_value = None
 
+        chunks = _split_text(str(content or ""), chunk_size)
         to_persist.append(
             OCRText(
                 batch_id=batch_id,
                 filename=str(filename),
                 engine=engine_name,
-                content=str(content or ""),
+                content=chunks[0],
                 confidence=confidence_value,
                 warnings=warnings_iter,
                 error=str(error) if error else None,
+                extra=extra if isinstance(extra, dict) and extra else None,
             )
         )
+        to_persist.extend(
+            OCRText(
+                batch_id=batch_id,
+                filename=str(filename),
+                engine=engine_name,
+                content=chunk,
+                chunk_index=index,
+            )
+            for index, chunk in enumerate(chunks[1:], start=1)
+        )
 
     if to_persist:
         session.add_all(to_persist)
@@ -353,6 +405,8 @@ async def add_gemini_analysis(
     observations_json: Iterable | None,
     raw_response: object | None,
     requested_by: str | None = None,
+    cache_hits: int | None = None,
+    cache_misses: int | None = None,
 ) -> GeminiAnalysis:
     record = GeminiAnalysis(
         batch_id=batch_id,
@@ -362,6 +416,8 @@ async def add_gemini_analysis(
         prompt_hash=prompt_hash,
         prompt_version=prompt_version,
         duration_ms=duration_ms,
+        cache_hits=cache_hits,
+        cache_misses=cache_misses,
         summary=summary,
         warnings=list(warnings) if warnings is not None else None,
         observations_json=list(observations_json) if observations_json is not None else None,
@@ -433,3 +489,19 @@ async def get_latest_gemini_analysis(session: AsyncSession, batch_id: str) -> Ge
         .limit(1)
     )
     return result.scalars().first()
+
+
+async def get_batch_file(session: AsyncSession, batch_id: str, filename: str) -> BatchFile | None:
+    result = await session.execute(
+        select(BatchFile).where(BatchFile.batch_id == batch_id, BatchFile.filename == filename).limit(1)
+    )
+    return result.scalars().first()
+
+
+async def list_file_observations(session: AsyncSession, batch_id: str, filename: str) -> Sequence[VisionObservation]:
+    result = await session.execute(
+        select(VisionObservation)
+        .where(VisionObservation.batch_id == batch_id, VisionObservation.filename == filename)
+        .order_by(VisionObservation.id)
+    )
+    return result.scalars().all()
@@ -31,6 +31,7 @@ class OCRTextSchema(BaseModel):
     confidence: float | None = None
     warnings: list[str] | None = None
     error: str | None = None
+    extra: dict[str, Any] | None = None
 
 
 class VisionObservationSchema(BaseModel):
@@ -88,6 +89,8 @@ class GeminiAnalysisRecord(BaseModel):
     provider: str | None = None
     model: str | None = None
     duration_ms: int | None = None
+    cache_hits: int | None = None
+    cache_misses: int | None = None
     requested_by: str | None = None
     created_at: datetime
     observations: list[dict[str, Any]] | None = None
@@ -103,6 +106,36 @@ class GeminiAnalysisRequest(BaseModel):
     requested_by: str | None = Field(default=None, description="Identifiant de l'utilisateur déclenchant l'analyse.")
 
 
+class AnalysisJobSchema(BaseModel):
+    job_id: str
+    batch_id: str
+    status: str = Field(description="queued, running, completed, failed ou cancelled")
+    requested_by: str | None = None
+    total_images: int
+    processed_images: int = 0
+    last_image: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    analysis_id: int | None = Field(default=None, description="Identifiant de l'analyse enregistrée une fois terminée.")
+    result_status: str | None = None
+    error: str | None = None
+    deduplicated: bool = Field(default=False, description="Vrai si une relance du même lot était déjà en cours.")
+
+
+class CircuitBreakerSchema(BaseModel):
+    name: str
+    state: str = Field(description="closed, open ou half_open")
+    consecutive_failures: int
+    failure_threshold: int
+    reset_seconds: float
+    opened_at: datetime | None = None
+    retry_in_seconds: float | None = None
+    last_error: str | None = None
+    trips: int = 0
+    rejected_calls: int = 0
+
+
 class BatchSummarySchema(BaseModel):
     status: str
     source: str | None = None
@@ -5,18 +5,44 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
-import mimetypes
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Iterable, List, Sequence
+from typing import Any, Callable, Iterable, List, Sequence
 
 from app.core.config import settings
 from app.pipelines.models import Observation
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError, get_gemini_circuit_breaker
+from app.services.gemini_client import extract_response_text, get_gemini_client
+from app.services.gemini_upload import PreparedImage, UploadStats, prepare_upload
+from app.services.rate_limiter import (
+    RateLimitTimeout,
+    TokenBucketRateLimiter,
+    estimate_gemini_tokens,
+    get_gemini_rate_limiter,
+)
+from app.services.response_cache import ResponseCache, get_gemini_response_cache, hash_file, make_cache_key
 
 logger = logging.getLogger(__name__)
 
+ANALYSIS_GENERATION_CONFIG: dict[str, Any] = {
+    "temperature": 0.2,
+    "top_p": 0.8,
+    "top_k": 40,
+    "response_mime_type": "application/json",
+}
+
+
+class AnalysisCancelled(RuntimeError):
+    """Raised by :meth:`AdvancedAnalyzer.analyze` when its cancel event was set."""
+
+
+# (images done, images total, file name of the last finished image)
+AnalysisProgressCallback = Callable[[int, int, str], None]
+
 
 @dataclass(slots=True)
 class GeminiAnalysisResult:
@@ -30,32 +56,82 @@ class GeminiAnalysisResult:
     model: str | None = None
     provider: str = "google-gemini"
     prompt_version: str | None = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    upload_stats: dict[str, Any] = field(default_factory=dict)
+    grouped_images: int = 0
+    group_fallbacks: int = 0
 
 
 def _hash_prompt(prompt: str) -> str:
     return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
 
 
+@dataclass(slots=True)
+class _ImageOutcome:
+    prompt_hash: str
+    observations: List[Observation] = field(default_factory=list)
+    payload: dict[str, Any] | None = None
+    warnings: List[str] = field(default_factory=list)
+    cached: bool | None = None  # None when the cache was not consulted
+    upload: PreparedImage | None = None
+    call_ms: float | None = None
+    grouped: bool = False
+    group_fallback: bool = False
+    circuit_open: bool = False
+
+
+_IndexedJob = tuple[int, tuple[Path, str | None, str | None]]
+
+GROUP_PROMPT_SUFFIX = """
+        MODE LOT ({count} IMAGES) — ces consignes remplacent le format de réponse ci-dessus :
+        - Tu reçois {count} images du même site, chacune précédée du libellé « Image k » (k = 1 à {count}).
+        - Analyse chaque image indépendamment, sans reporter d’éléments d’une image sur une autre.
+        - Réponds UNIQUEMENT par un tableau JSON de {count} objets, dans l’ordre des images :
+          [{{"image_index": 1, ...objet Schéma v1.4...}}, {{"image_index": 2, ...}}]
+        """
+
+
 class AdvancedAnalyzer:
     """Orchestrateur Gemini (moyen terme : stub offline, prêt pour API réelle)."""
 
     PROVIDER = "google-gemini"
     PROMPT_VERSION = "schema-1.4-bfa"
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        rate_limiter: TokenBucketRateLimiter | None = None,
+        response_cache: ResponseCache | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ) -> None:
         self.enabled = settings.GEMINI_ENABLED
         self.required = settings.GEMINI_REQUIRED
         self.api_key = settings.GEMINI_API_KEY
         self.model = settings.GEMINI_MODEL
+        self.endpoint = settings.GEMINI_API_ENDPOINT
         self.timeout = settings.GEMINI_TIMEOUT_SECONDS
         self.max_total_seconds = max(0, settings.GEMINI_MAX_TOTAL_SECONDS)
         self.max_retries = settings.GEMINI_MAX_RETRIES
+        self.max_concurrency = max(1, settings.GEMINI_MAX_CONCURRENCY)
+        self.group_size = max(1, settings.GEMINI_GROUP_SIZE)
+        self.rate_limiter = rate_limiter or get_gemini_rate_limiter()
+        self.response_cache = response_cache if response_cache is not None else get_gemini_response_cache()
+        self.circuit_breaker = circuit_breaker or get_gemini_circuit_breaker()
 
     def analyze(
         self,
         batch_id: str,
         image_files: Sequence[tuple[Path, str | None, str | None]],
+        *,
+        progress: AnalysisProgressCallback | None = None,
+        cancel_event: threading.Event | None = None,
     ) -> GeminiAnalysisResult:
+        """Analyse ``image_files`` (path, zone, site_type).
+
+        ``progress`` is called from worker threads each time images finish; once
+        ``cancel_event`` is set no new Gemini request starts and :class:`AnalysisCancelled`
+        is raised after in-flight requests return.
+        """
         if not self.enabled:
             logger.info("Advanced analyzer disabled; skipping batch %s", batch_id)
             return GeminiAnalysisResult(
@@ -82,54 +158,101 @@ class AdvancedAnalyzer:
                 prompt_version=self.PROMPT_VERSION,
             )
 
+        if self.circuit_breaker.is_open():
+            status = "failed" if self.required else "skipped"
+            logger.warning("Gemini circuit open; skipping batch %s (status=%s)", batch_id, status)
+            return GeminiAnalysisResult(
+                observations=[],
+                summary=None,
+                status=status,
+                warnings=["gemini-circuit-open"],
+                model=self.model,
+                provider=self.PROVIDER,
+                prompt_version=self.PROMPT_VERSION,
+            )
+
         start_time = time.perf_counter()
         warnings: list[str] = []
         observations: list[Observation] = []
         last_prompt_hash: str | None = None
         payloads: list[dict[str, Any]] = []
 
-        for image_path, zone, site_type in image_files:
-            prompt = self._build_prompt(zone_name=zone, site_type=site_type or "generic")
-            prompt_hash = _hash_prompt(prompt)
-            last_prompt_hash = prompt_hash
-            logger.debug(
-                "Submitting %s to Gemini (batch=%s, zone=%s, site_type=%s)",
-                image_path.name,
+        jobs = list(image_files)
+        units = self._plan_units(jobs)
+        done = 0
+        done_lock = threading.Lock()
+
+        def run_unit(unit: list[_IndexedJob]) -> list[tuple[int, _ImageOutcome]]:
+            nonlocal done
+            if cancel_event is not None and cancel_event.is_set():
+                return []
+            results = self._analyze_unit(batch_id, unit)
+            with done_lock:
+                done += len(results)
+                count = done
+            if progress is not None:
+                progress(count, len(jobs), unit[-1][1][0].name)
+            return results
+
+        workers = max(1, min(self.max_concurrency, len(units)))
+        if workers == 1:
+            unit_outcomes = [run_unit(unit) for unit in units]
+        else:
+            logger.info(
+                "Submitting %d image(s) to Gemini in %d request(s), %d in flight (batch=%s)",
+                len(jobs),
+                len(units),
+                workers,
                 batch_id,
-                zone or "n/a",
-                site_type or "generic",
             )
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gemini")
             try:
-                response = self._call_gemini(image_path, prompt, prompt_hash)
-            except Exception as exc:  # pragma: no cover - dépend de l'API réelle
-                warning = f"gemini-error:{image_path.name}:{exc}"
-                logger.warning("%s - %s", batch_id, warning)
-                warnings.append(warning)
-                if self.required:
-                    raise
-                continue
-
-            try:
-                parsed = json.loads(response)
-            except json.JSONDecodeError as exc:
-                warning = f"gemini-response-invalid:{image_path.name}:{exc}"
-                logger.warning("%s - %s", batch_id, warning)
-                warnings.append(warning)
-                if self.required:
-                    raise
-                continue
-
-            observations.extend(gemini_to_observations(parsed, image_path, zone_name=zone))
-            payloads.append(parsed)
+                futures = [executor.submit(run_unit, unit) for unit in units]
+                unit_outcomes = [future.result() for future in futures]
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown(wait=True)
+        if cancel_event is not None and cancel_event.is_set():
+            logger.info("Gemini analysis of batch %s cancelled after %d/%d image(s)", batch_id, done, len(jobs))
+            raise AnalysisCancelled(f"analysis of batch {batch_id} cancelled")
+
+        indexed_outcomes = sorted((item for unit in unit_outcomes for item in unit), key=lambda item: item[0])
+        outcomes = [outcome for _, outcome in indexed_outcomes]
+
+        cache_hits = sum(1 for outcome in outcomes if outcome.cached is True)
+        cache_misses = sum(1 for outcome in outcomes if outcome.cached is False)
+        grouped_images = sum(1 for outcome in outcomes if outcome.grouped)
+        group_fallbacks = sum(1 for outcome in outcomes if outcome.group_fallback)
+        upload_stats = UploadStats()
+        for outcome in outcomes:
+            if outcome.upload is not None:
+                upload_stats.add(outcome.upload, outcome.call_ms)
+
+        # Outcomes keep the submission order so results stay deterministic.
+        for outcome in outcomes:
+            last_prompt_hash = outcome.prompt_hash
+            warnings.extend(outcome.warnings)
+            observations.extend(outcome.observations)
+            if outcome.payload is not None:
+                payloads.append(outcome.payload)
 
         duration_ms = int((time.perf_counter() - start_time) * 1000)
         summary = build_gemini_summary(observations, warnings)
         status = "ok" if observations or summary else "no_insights"
+        if not observations and any(outcome.circuit_open for outcome in outcomes):
+            status = "failed" if self.required else "skipped"
         logger.info(
-            "Gemini processing finished for batch %s (status=%s, duration_ms=%s)",
+            "Gemini processing finished for batch %s (status=%s, duration_ms=%s, cache hits=%d misses=%d, "
+            "uploaded %d/%d bytes, avg call %s ms)",
             batch_id,
             status,
             duration_ms,
+            cache_hits,
+            cache_misses,
+            upload_stats.uploaded_bytes,
+            upload_stats.original_bytes,
+            upload_stats.as_dict()["avg_call_ms"],
         )
         return GeminiAnalysisResult(
             observations=observations,
@@ -142,8 +265,207 @@ class AdvancedAnalyzer:
             model=self.model,
             provider=self.PROVIDER,
             prompt_version=self.PROMPT_VERSION,
+            cache_hits=cache_hits,
+            cache_misses=cache_misses,
+            upload_stats=upload_stats.as_dict(),
+            grouped_images=grouped_images,
+            group_fallbacks=group_fallbacks,
+        )
+
+    def _cache_key(self, image_path: Path, prompt_hash: str) -> str | None:
+        if self.response_cache is None:
+            return None
+        try:
+            image_hash = hash_file(image_path)
+        except OSError:
+            return None
+        return make_cache_key(image_hash, prompt_hash, self.model, self.PROMPT_VERSION)
+
+    def _plan_units(self, jobs: Sequence[tuple[Path, str | None, str | None]]) -> list[list[_IndexedJob]]:
+        """Split jobs into request units: single images, or groups sharing (zone, site_type)."""
+        indexed = list(enumerate(jobs))
+        if self.group_size <= 1:
+            return [[item] for item in indexed]
+        groups: dict[tuple[str | None, str], list[_IndexedJob]] = {}
+        for item in indexed:
+            _, zone, site_type = item[1]
+            groups.setdefault((zone, (site_type or "generic").lower()), []).append(item)
+        units: list[list[_IndexedJob]] = []
+        for members in groups.values():
+            for start in range(0, len(members), self.group_size):
+                units.append(members[start : start + self.group_size])
+        return units
+
+    def _analyze_unit(self, batch_id: str, unit: list[_IndexedJob]) -> list[tuple[int, _ImageOutcome]]:
+        if len(unit) == 1:
+            index, job = unit[0]
+            return [(index, self._analyze_image(batch_id, *job))]
+        return self._analyze_group(batch_id, unit)
+
+    def _replay_cached(
+        self,
+        batch_id: str,
+        image_path: Path,
+        zone: str | None,
+        prompt_hash: str,
+    ) -> tuple[_ImageOutcome, str | None]:
+        outcome = _ImageOutcome(prompt_hash=prompt_hash)
+        cache_key = self._cache_key(image_path, prompt_hash)
+        response = self.response_cache.get(cache_key) if cache_key is not None else None
+        if response is not None:
+            outcome.cached = True
+            logger.debug("Gemini cache hit for %s (batch=%s)", image_path.name, batch_id)
+            # Replayed through the same conversion as a fresh response.
+            parsed = json.loads(response)
+            outcome.observations = gemini_to_observations(parsed, image_path, zone_name=zone)
+            outcome.payload = parsed
+        elif cache_key is not None:
+            outcome.cached = False
+        return outcome, cache_key
+
+    @staticmethod
+    def _prepare_upload(outcome: _ImageOutcome, image_path: Path) -> None:
+        try:
+            # Warms the upload cache; the Gemini call picks the same bytes up.
+            outcome.upload = prepare_upload(image_path)
+        except (OSError, ValueError) as exc:
+            logger.debug("Upload transform unavailable for %s: %s", image_path.name, exc)
+
+    def _analyze_image(
+        self,
+        batch_id: str,
+        image_path: Path,
+        zone: str | None,
+        site_type: str | None,
+    ) -> _ImageOutcome:
+        prompt = self._build_prompt(zone_name=zone, site_type=site_type or "generic")
+        logger.debug(
+            "Submitting %s to Gemini (batch=%s, zone=%s, site_type=%s)",
+            image_path.name,
+            batch_id,
+            zone or "n/a",
+            site_type or "generic",
+        )
+        outcome, cache_key = self._replay_cached(batch_id, image_path, zone, _hash_prompt(prompt))
+        if outcome.cached:
+            return outcome
+        return self._call_single(batch_id, image_path, zone, prompt, outcome, cache_key)
+
+    def _call_single(
+        self,
+        batch_id: str,
+        image_path: Path,
+        zone: str | None,
+        prompt: str,
+        outcome: _ImageOutcome,
+        cache_key: str | None,
+    ) -> _ImageOutcome:
+        self._prepare_upload(outcome, image_path)
+        call_start = time.perf_counter()
+        try:
+            response = self._call_gemini(image_path, prompt, outcome.prompt_hash)
+        except CircuitOpenError as exc:
+            outcome.circuit_open = True
+            outcome.warnings.append(f"gemini-circuit-open:{image_path.name}")
+            logger.info("%s - Gemini skipped for %s: %s", batch_id, image_path.name, exc)
+            if self.required:
+                raise
+            return outcome
+        except Exception as exc:  # pragma: no cover - dépend de l'API réelle
+            warning = f"gemini-error:{image_path.name}:{exc}"
+            logger.warning("%s - %s", batch_id, warning)
+            outcome.warnings.append(warning)
+            if self.required:
+                raise
+            return outcome
+        finally:
+            outcome.call_ms = (time.perf_counter() - call_start) * 1000
+
+        try:
+            parsed = json.loads(response)
+        except json.JSONDecodeError as exc:
+            warning = f"gemini-response-invalid:{image_path.name}:{exc}"
+            logger.warning("%s - %s", batch_id, warning)
+            outcome.warnings.append(warning)
+            if self.required:
+                raise
+            return outcome
+
+        if cache_key is not None:
+            self.response_cache.put(cache_key, response)
+        outcome.observations = gemini_to_observations(parsed, image_path, zone_name=zone)
+        outcome.payload = parsed
+        return outcome
+
+    def _analyze_group(self, batch_id: str, unit: list[_IndexedJob]) -> list[tuple[int, _ImageOutcome]]:
+        """Analyse images sharing (zone, site_type) in one request; per-image calls on invalid responses."""
+        zone, site_type = unit[0][1][1], unit[0][1][2] or "generic"
+        single_prompt = self._build_prompt(zone_name=zone, site_type=site_type)
+        # Cache entries use the single-image prompt hash so both modes share them.
+        single_hash = _hash_prompt(single_prompt)
+
+        results: list[tuple[int, _ImageOutcome]] = []
+        pending: list[tuple[int, Path, _ImageOutcome, str | None]] = []
+        for index, (image_path, _, _) in unit:
+            outcome, cache_key = self._replay_cached(batch_id, image_path, zone, single_hash)
+            if outcome.cached:
+                results.append((index, outcome))
+            else:
+                pending.append((index, image_path, outcome, cache_key))
+        if len(pending) == 1:
+            index, image_path, outcome, cache_key = pending[0]
+            results.append((index, self._call_single(batch_id, image_path, zone, single_prompt, outcome, cache_key)))
+            return results
+        if not pending:
+            return results
+
+        prompt = self._build_group_prompt(zone, site_type, len(pending))
+        prompt_hash = _hash_prompt(prompt)
+        image_paths = [image_path for _, image_path, _, _ in pending]
+        for _, image_path, outcome, _ in pending:
+            self._prepare_upload(outcome, image_path)
+        logger.debug(
+            "Submitting %d images to Gemini in one request (batch=%s, zone=%s, site_type=%s)",
+            len(pending),
+            batch_id,
+            zone or "n/a",
+            site_type,
         )
 
+        call_start = time.perf_counter()
+        payloads: list[dict[str, Any]] | None = None
+        try:
+            payloads = parse_group_response(self._call_gemini_group(image_paths, prompt, prompt_hash), len(pending))
+        except Exception as exc:  # noqa: BLE001 - any failure falls back to per-image calls
+            logger.warning("%s - grouped Gemini request for %d image(s) failed: %s", batch_id, len(pending), exc)
+        call_ms = (time.perf_counter() - call_start) * 1000
+
+        if payloads is None:
+            logger.warning(
+                "%s - grouped Gemini response invalid; analysing %d image(s) individually",
+                batch_id,
+                len(pending),
+            )
+            for index, image_path, outcome, cache_key in pending:
+                outcome.group_fallback = True
+                results.append(
+                    (index, self._call_single(batch_id, image_path, zone, single_prompt, outcome, cache_key))
+                )
+            return results
+
+        for (index, image_path, outcome, cache_key), payload in zip(pending, payloads):
+            outcome.prompt_hash = prompt_hash
+            outcome.grouped = True
+            outcome.call_ms = call_ms / len(pending)
+            if cache_key is not None:
+                self.response_cache.put(cache_key, json.dumps(payload, ensure_ascii=False))
+            outcome.observations = gemini_to_observations(payload, image_path, zone_name=zone)
+            outcome.payload = payload
+            results.append((index, outcome))
+        return results
+
+    def _build_group_prompt(self, zone_name: str | None, site_type: str, count: int) -> str:
+        return self._build_prompt(zone_name=zone_name, site_type=site_type) + GROUP_PROMPT_SUFFIX.format(count=count)
 
     def _build_prompt(self, zone_name: str | None, site_type: str = "generic") -> str:
         st = (site_type or "generic").lower()
@@ -275,104 +597,122 @@ class AdvancedAnalyzer:
             site_risk_context=SITE_RISK_CONTEXTS.get(st, SITE_RISK_CONTEXTS["generic"])
         )
 
-def _call_gemini(self, image_path: Path, prompt: str, prompt_hash: str) -> str:
+    def _call_gemini(self, image_path: Path, prompt: str, prompt_hash: str) -> str:
         """Appe au modèle Gemini (avec retries de base)."""
 
-        try:
-            import google.generativeai as genai  # type: ignore
-        except Exception as exc:  # noqa: BLE001
-            raise RuntimeError(
-                "google-generativeai n'est pas installé. Ajoutez la dépendance 'google-generativeai' "
-                "ou désactivez GEMINI_ENABLED."
-            ) from exc
-
         if not image_path.exists():
             raise RuntimeError(f"Image {image_path} introuvable pour l'analyse Gemini.")
 
-        genai.configure(api_key=self.api_key)
-        model = genai.GenerativeModel(
-            model_name=self.model,
-            generation_config={
-                "temperature": 0.2,
-                "top_p": 0.8,
-                "top_k": 40,
-                "response_mime_type": "application/json",
-            },
-        )
-
-        mime_type, _ = mimetypes.guess_type(image_path.as_posix())
-        if not mime_type:
-            mime_type = "image/jpeg"
-
-        with image_path.open("rb") as fh:
-            image_bytes = fh.read()
+        # Resized/re-encoded bytes (GEMINI_UPLOAD_*), normally already cached by _analyze_image.
+        upload = prepare_upload(image_path)
 
         parts: list[Any] = [
             {"text": prompt},
-            {"inline_data": {"mime_type": mime_type, "data": image_bytes}},
+            {"inline_data": {"mime_type": upload.mime_type, "data": upload.data}},
         ]
+        return self._generate(parts, prompt, prompt_hash, label=image_path.name)
+
+    def _call_gemini_group(self, image_paths: Sequence[Path], prompt: str, prompt_hash: str) -> str:
+        """Un seul appel Gemini pour plusieurs images, chacune précédée de son libellé « Image k »."""
+
+        parts: list[Any] = [{"text": prompt}]
+        for position, image_path in enumerate(image_paths, start=1):
+            if not image_path.exists():
+                raise RuntimeError(f"Image {image_path} introuvable pour l'analyse Gemini.")
+            upload = prepare_upload(image_path)
+            parts.append({"text": f"Image {position}"})
+            parts.append({"inline_data": {"mime_type": upload.mime_type, "data": upload.data}})
+        return self._generate(parts, prompt, prompt_hash, label=f"{len(image_paths)} images", images=len(image_paths))
+
+    def _generate(
+        self,
+        parts: list[Any],
+        prompt: str,
+        prompt_hash: str,
+        *,
+        label: str,
+        images: int = 1,
+    ) -> str:
+        client = get_gemini_client(self.api_key, self.endpoint)
 
         last_error: Exception | None = None
         attempts = self.max_retries + 1
         start_time = time.monotonic()
         deadline = start_time + self.max_total_seconds if self.max_total_seconds else None
+        estimated_tokens = estimate_gemini_tokens(prompt, images)
         for attempt in range(1, attempts + 1):
             if deadline is not None and time.monotonic() >= deadline:
                 logger.warning(
                     "Gemini retry budget of %.1fs exhausted before attempt %s for %s",
                     self.max_total_seconds,
                     attempt,
-                    image_path.name,
+                    label,
+                )
+                break
+            # Fails fast (CircuitOpenError) while quota/timeouts keep the provider unavailable.
+            self.circuit_breaker.check()
+            try:
+                waited = self.rate_limiter.acquire(
+                    estimated_tokens,
+                    timeout=deadline - time.monotonic() if deadline is not None else None,
                 )
+            except RateLimitTimeout as exc:
+                # The provider was not called: neither a success nor a failure for the breaker.
+                self.circuit_breaker.release_probe()
+                logger.warning("Gemini rate limit wait exceeds remaining budget for %s: %s", label, exc)
+                last_error = exc
                 break
+            if waited > 0.05:
+                logger.debug("Waited %.2fs for Gemini rate limit (%s)", waited, label)
             try:
-                logger.debug("Gemini call attempt %s for %s (hash=%s)", attempt, image_path.name, prompt_hash)
-                response = model.generate_content(
+                logger.debug("Gemini call attempt %s for %s (hash=%s)", attempt, label, prompt_hash)
+                response = client.generate(
+                    self.model,
                     [{"role": "user", "parts": parts}],
-                    request_options={"timeout": self.timeout},
+                    generation_config=ANALYSIS_GENERATION_CONFIG,
+                    timeout=self.timeout,
                 )
-                if hasattr(response, "text") and response.text:
-                    return response.text
-                # Fallback: reconstruire la réponse depuis les candidats.
-                candidates = getattr(response, "candidates", None)
-                if candidates:
-                    candidate_content = getattr(candidates[0], "content", None)
-                    candidate_parts = getattr(candidate_content, "parts", []) if candidate_content else []
-                    texts = [getattr(part, "text", "") for part in candidate_parts if getattr(part, "text", "")]
-                    if texts:
-                        return "\n".join(texts)
+                usage = getattr(response, "usage_metadata", None)
+                self.rate_limiter.settle(estimated_tokens, getattr(usage, "total_token_count", None))
+                text = extract_response_text(response)
+                if text:
+                    self.circuit_breaker.record_success()
+                    return text
                 raise RuntimeError("Réponse Gemini vide ou invalide.")
             except Exception as exc:  # noqa: BLE001
                 last_error = exc
+                if self.circuit_breaker.record_failure(exc):
+                    raise CircuitOpenError(f"circuit {self.circuit_breaker.name} open") from exc
                 retry_delay = _extract_retry_delay_seconds(exc)
                 logger.warning(
                     "Gemini call failed (attempt %s/%s) for %s: %s",
                     attempt,
                     attempts,
-                    image_path.name,
+                    label,
                     exc,
                 )
                 if attempt < attempts:
                     if retry_delay is not None and retry_delay > 0:
-                        sleep_duration = min(retry_delay + 0.5, 90.0)
-                    else:
-                        sleep_duration = min(2 * attempt, 6)
+                        # Quota hint: pause every in-flight Gemini request, not just this image.
+                        self.rate_limiter.penalize(min(retry_delay + 0.5, 90.0))
+                        continue
+                    sleep_duration = min(2 * attempt, 6)
                     if deadline is not None:
                         remaining = deadline - time.monotonic()
                         if remaining <= 0:
-                            logger.warning("No remaining retry budget for Gemini (image %s).", image_path.name)
+                            logger.warning("No remaining retry budget for Gemini (image %s).", label)
                             break
                         sleep_duration = min(sleep_duration, max(0.0, remaining))
                         if sleep_duration <= 0:
                             logger.warning(
                                 "Retry delay exhausted budget; skipping additional waits for %s.",
-                                image_path.name,
+                                label,
                             )
                             continue
                     logger.info(
-                        "Waiting %.2fs before retrying Gemini for %s (quota hint).",
+                        "Waiting %.2fs before retrying Gemini for %s.",
                         sleep_duration,
-                        image_path.name,
+                        label,
                     )
                     time.sleep(sleep_duration)
                     continue
@@ -381,15 +721,36 @@ def _call_gemini(self, image_path: Path, prompt: str, prompt_hash: str) -> str:
         raise RuntimeError("Gemini call failed") from last_error
 
 
+def _parse_duration_seconds(value: Any) -> float | None:
+    """``"2.5s"`` (REST ``google.rpc.RetryInfo``), numbers or ``timedelta``-like objects."""
+    total = getattr(value, "total_seconds", None)
+    if callable(total):
+        try:
+            return float(total())
+        except (TypeError, ValueError):
+            return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        match = re.fullmatch(r"\s*([0-9]+(?:\.[0-9]+)?)s?\s*", value)
+        if match:
+            return float(match.group(1))
+    return None
+
+
 def _extract_retry_delay_seconds(exc: Exception) -> float | None:
     delay_attr = getattr(exc, "retry_delay", None)
     if delay_attr is not None:
-        total = getattr(delay_attr, "total_seconds", None)
-        if callable(total):
-            try:
-                return float(total())
-            except (TypeError, ValueError):
-                pass
+        delay = _parse_duration_seconds(delay_attr)
+        if delay is not None:
+            return delay
+    # REST errors carry RetryInfo as ``{"@type": ".../google.rpc.RetryInfo", "retryDelay": "2.5s"}``.
+    details = getattr(exc, "details", None)
+    for detail in details if isinstance(details, (list, tuple)) else ():
+        raw = detail.get("retryDelay") if isinstance(detail, dict) else getattr(detail, "retry_delay", None)
+        delay = _parse_duration_seconds(raw) if raw is not None else None
+        if delay is not None:
+            return delay
     message = str(exc)
     match = re.search(r"retry_delay\s*\{\s*seconds:\s*([0-9]+(?:\.[0-9]+)?)(?:s)?", message)
     if match:
@@ -400,6 +761,31 @@ def _extract_retry_delay_seconds(exc: Exception) -> float | None:
     return None
 
 
+def parse_group_response(response: str, count: int) -> list[dict[str, Any]] | None:
+    """Validate a grouped response and return one Schéma v1.4 payload per image, in order.
+
+    Accepts a bare array or an object wrapping it under ``images``. Returns ``None`` when
+    the response is not JSON, has the wrong number of entries, or its ``image_index``
+    values do not map one-to-one onto the submitted images.
+    """
+    try:
+        parsed = json.loads(response)
+    except (TypeError, json.JSONDecodeError):
+        return None
+    if isinstance(parsed, dict):
+        parsed = parsed.get("images")
+    if not isinstance(parsed, list) or len(parsed) != count:
+        return None
+    if not all(isinstance(item, dict) and isinstance(item.get("vulnerabilities", []), list) for item in parsed):
+        return None
+    indices = [item.get("image_index") for item in parsed]
+    if any(index is not None for index in indices):
+        if sorted(index for index in indices if isinstance(index, int)) != list(range(1, count + 1)):
+            return None
+        parsed = sorted(parsed, key=lambda item: item["image_index"])
+    return [{key: value for key, value in item.items() if key != "image_index"} for item in parsed]
+
+
 def gemini_to_observations(
     gemini_result: dict,
     image_path: Path,
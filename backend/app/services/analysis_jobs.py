@@ -0,0 +1,188 @@
+"""Background jobs for manual Gemini re-analysis of a batch.
+
+Jobs run outside the request handler: the API answers ``202`` with a job id, the
+analysis runs in a worker thread, and every state change or finished image is
+published on :data:`app.services.events.event_bus`. At most one job per batch is
+active at a time (a second request returns the running job) and at most
+``GEMINI_ANALYSIS_JOB_CONCURRENCY`` jobs run at once; the others wait queued.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from logging import getLogger
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+
+from app.core.config import settings
+from app.services.events import event_bus
+
+logger = getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+ACTIVE_STATES = {JOB_QUEUED, JOB_RUNNING}
+
+# Finished jobs kept for status polling.
+MAX_FINISHED_JOBS = 200
+
+
+def _now() -> datetime:
+    return datetime.now(tz=timezone.utc)
+
+
+@dataclass(slots=True)
+class AnalysisJob:
+    job_id: str
+    batch_id: str
+    requested_by: str
+    total_images: int
+    status: str = JOB_QUEUED
+    processed_images: int = 0
+    last_image: str | None = None
+    created_at: datetime = field(default_factory=_now)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    analysis_id: int | None = None
+    result_status: str | None = None
+    error: str | None = None
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    task: asyncio.Task[None] | None = field(default=None, repr=False)
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE_STATES
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "batch_id": self.batch_id,
+            "status": self.status,
+            "requested_by": self.requested_by,
+            "total_images": self.total_images,
+            "processed_images": self.processed_images,
+            "last_image": self.last_image,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "analysis_id": self.analysis_id,
+            "result_status": self.result_status,
+            "error": self.error,
+        }
+
+
+JobRunner = Callable[[AnalysisJob], Awaitable[None]]
+
+
+class AnalysisJobManager:
+    """Registry and scheduler of analysis jobs (event-loop side, not thread-safe)."""
+
+    def __init__(self, max_concurrent: int = 1) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self._jobs: OrderedDict[str, AnalysisJob] = OrderedDict()
+        self._active_by_batch: dict[str, str] = {}
+        self._slots: asyncio.Semaphore | None = None
+        self._publications: set[asyncio.Future[None]] = set()
+
+    def get(self, job_id: str) -> AnalysisJob | None:
+        return self._jobs.get(job_id)
+
+    def active_for(self, batch_id: str) -> AnalysisJob | None:
+        job_id = self._active_by_batch.get(batch_id)
+        return self._jobs.get(job_id) if job_id else None
+
+    def submit(
+        self,
+        batch_id: str,
+        total_images: int,
+        runner: JobRunner,
+        *,
+        requested_by: str,
+    ) -> tuple[AnalysisJob, bool]:
+        """Schedule ``runner`` for ``batch_id``; return ``(job, created)``.
+
+        When a job for the batch is still queued or running it is returned as-is.
+        """
+        existing = self.active_for(batch_id)
+        if existing is not None:
+            return existing, False
+        job = AnalysisJob(
+            job_id=uuid4().hex,
+            batch_id=batch_id,
+            requested_by=requested_by,
+            total_images=total_images,
+        )
+        self._jobs[job.job_id] = job
+        self._active_by_batch[batch_id] = job.job_id
+        self._prune()
+        job.task = asyncio.create_task(self._run(job, runner))
+        job.task.add_done_callback(lambda _task: self._finish(job))
+        return job, True
+
+    def cancel(self, job_id: str) -> AnalysisJob | None:
+        """Request cancellation; queued jobs stop at once, running ones after in-flight calls."""
+        job = self._jobs.get(job_id)
+        if job is None or not job.active:
+            return job
+        job.cancel_event.set()
+        if job.status == JOB_QUEUED and job.task is not None:
+            job.task.cancel()
+        return job
+
+    async def publish(self, job: AnalysisJob) -> None:
+        await event_bus.publish({"batchId": job.batch_id, "analysisJob": _event_payload(job)})
+
+    async def _run(self, job: AnalysisJob, runner: JobRunner) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        try:
+            await self.publish(job)
+            async with self._slots:
+                if job.cancel_event.is_set():
+                    raise asyncio.CancelledError
+                job.status = JOB_RUNNING
+                job.started_at = _now()
+                await self.publish(job)
+                await runner(job)
+            job.status = JOB_CANCELLED if job.cancel_event.is_set() and job.analysis_id is None else JOB_COMPLETED
+        except asyncio.CancelledError:
+            job.status = JOB_CANCELLED
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Analysis job %s for batch %s failed", job.job_id, job.batch_id)
+            job.status = JOB_FAILED
+            job.error = str(exc)
+
+    def _finish(self, job: AnalysisJob) -> None:
+        # Done callback: also runs for tasks cancelled before their first step.
+        if job.active:
+            job.status = JOB_CANCELLED
+        job.finished_at = _now()
+        if self._active_by_batch.get(job.batch_id) == job.job_id:
+            del self._active_by_batch[job.batch_id]
+        logger.info("Analysis job %s for batch %s %s", job.job_id, job.batch_id, job.status)
+        publication = asyncio.ensure_future(self.publish(job))
+        self._publications.add(publication)
+        publication.add_done_callback(self._publications.discard)
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+
+def _event_payload(job: AnalysisJob) -> dict[str, Any]:
+    payload = job.as_dict()
+    for key in ("created_at", "started_at", "finished_at"):
+        if payload[key] is not None:
+            payload[key] = payload[key].isoformat()
+    return payload
+
+
+analysis_jobs = AnalysisJobManager(settings.GEMINI_ANALYSIS_JOB_CONCURRENCY)
@@ -0,0 +1,181 @@
+"""Process-wide circuit breaker for external AI providers.
+
+Quota exhaustion and timeouts are provider-wide conditions: once they repeat, every
+further call from any batch is going to fail the same way. The breaker opens after
+``failure_threshold`` consecutive quota/timeout failures so callers fail fast instead
+of burning their retry budgets, then lets a single half-open probe through after
+``reset_seconds`` to test recovery.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+from logging import getLogger
+from typing import Any, Callable
+
+from app.core.config import settings
+
+logger = getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+_TRIP_EXCEPTION_NAMES = {"ResourceExhausted", "TooManyRequests", "DeadlineExceeded", "ServiceUnavailable"}
+_TRIP_MESSAGE_MARKERS = ("429", "quota", "resource_exhausted", "rate limit", "deadline", "timed out", "timeout")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the provider while the breaker is open."""
+
+
+def is_quota_or_timeout(exc: BaseException) -> bool:
+    """True for failures that reflect provider capacity rather than the request itself."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, TimeoutError) or getattr(exc, "retry_delay", None) is not None:
+        return True
+    if any(cls.__name__ in _TRIP_EXCEPTION_NAMES for cls in type(exc).__mro__):
+        return True
+    message = str(exc).lower()
+    return any(marker in message for marker in _TRIP_MESSAGE_MARKERS)
+
+
+class CircuitBreaker:
+    """Thread-safe closed → open → half-open breaker."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_seconds: float = 60.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = max(0.0, reset_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._opened_wall: datetime | None = None
+        self._probe_in_flight = False
+        self._last_error: str | None = None
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def is_open(self) -> bool:
+        """True while calls are rejected and no probe is due yet."""
+        with self._lock:
+            if self._state == STATE_OPEN:
+                return self._clock() - (self._opened_at or 0.0) < self.reset_seconds
+            return self._state == STATE_HALF_OPEN and self._probe_in_flight
+
+    def allow(self) -> bool:
+        """Return whether a call may go out now; claims the half-open probe when one is due."""
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_OPEN and self._clock() - (self._opened_at or 0.0) >= self.reset_seconds:
+                self._state = STATE_HALF_OPEN
+                self._probe_in_flight = False
+                logger.info("Circuit %s half-open: probing provider.", self.name)
+            if self._state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def check(self) -> None:
+        """``allow`` raising :class:`CircuitOpenError` when the call must not go out."""
+        if not self.allow():
+            raise CircuitOpenError(f"circuit {self.name} open: {self._last_error or 'provider unavailable'}")
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe claimed by a call that never reached the provider."""
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != STATE_CLOSED:
+                logger.info("Circuit %s closed: provider recovered.", self.name)
+            self._state = STATE_CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._opened_wall = None
+            self._probe_in_flight = False
+
+    def record_failure(self, exc: BaseException) -> bool:
+        """Account for a failed call; return ``True`` when the breaker is (now) open.
+
+        Failures unrelated to quota or timeouts prove the provider answered, so they
+        count as a success for the breaker.
+        """
+        if not is_quota_or_timeout(exc):
+            self.record_success()
+            return False
+        with self._lock:
+            self._last_error = str(exc)[:200]
+            self._failures += 1
+            if self._state == STATE_HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != STATE_OPEN:
+                    self.trips += 1
+                    logger.warning(
+                        "Circuit %s open for %.0fs after %d quota/timeout failure(s): %s",
+                        self.name,
+                        self.reset_seconds,
+                        self._failures,
+                        self._last_error,
+                    )
+                self._state = STATE_OPEN
+                self._opened_at = self._clock()
+                self._opened_wall = datetime.now(tz=timezone.utc)
+                self._probe_in_flight = False
+                return True
+            return False
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            retry_in = None
+            if self._state == STATE_OPEN and self._opened_at is not None:
+                retry_in = max(0.0, self.reset_seconds - (self._clock() - self._opened_at))
+            return {
+                "name": self.name,
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_seconds": self.reset_seconds,
+                "opened_at": self._opened_wall,
+                "retry_in_seconds": round(retry_in, 1) if retry_in is not None else None,
+                "last_error": self._last_error,
+                "trips": self.trips,
+                "rejected_calls": self.rejected,
+            }
+
+
+_gemini_breaker: CircuitBreaker | None = None
+_gemini_breaker_lock = threading.Lock()
+
+
+def get_gemini_circuit_breaker() -> CircuitBreaker:
+    """Breaker shared by image analysis and summary generation (same provider quota)."""
+    global _gemini_breaker  # noqa: PLW0603
+    with _gemini_breaker_lock:
+        if _gemini_breaker is None:
+            _gemini_breaker = CircuitBreaker(
+                "gemini",
+                failure_threshold=settings.GEMINI_BREAKER_FAILURE_THRESHOLD,
+                reset_seconds=settings.GEMINI_BREAKER_RESET_SECONDS,
+            )
+        return _gemini_breaker
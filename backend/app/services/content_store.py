@@ -0,0 +1,173 @@
+"""Content-addressed storage of generated artifacts (report PDFs).
+
+Artifacts are written through a :class:`HashingWriter`: bytes go to a temporary file
+and into a SHA-256 hasher in the same pass, so the checksum needs no second read.
+The finished file is moved to ``<root>/<sha256><suffix>`` (kept as is when an
+identical artifact already exists) and published under its stable name with an
+atomic hard-link swap: readers see the previous version or the new one, never a
+partially written file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import shutil
+from dataclasses import dataclass
+from logging import getLogger
+from pathlib import Path
+from types import TracebackType
+from uuid import uuid4
+
+logger = getLogger(__name__)
+
+
+class HashingWriter:
+    """Write-only file object hashing what it writes (ReportLab and ``write(bytes)`` callers)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.size = 0
+        self._hasher = hashlib.sha256()
+        self._handle = path.open("wb")
+
+    def write(self, data: bytes) -> int:
+        self._hasher.update(data)
+        self._handle.write(data)
+        self.size += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.size
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        # Forward-only stream (PyMuPDF probes the position): the hash covers bytes in write order.
+        target = offset if whence == os.SEEK_SET else self.size + offset
+        if target != self.size:
+            raise io.UnsupportedOperation("HashingWriter only supports sequential writes")
+        return self.size
+
+    def flush(self) -> None:
+        self._handle.flush()
+
+    def close(self) -> None:
+        if not self._handle.closed:
+            self._handle.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._handle.closed
+
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest()
+
+    def __enter__(self) -> HashingWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+        if exc_type is not None:
+            self.path.unlink(missing_ok=True)
+
+
+@dataclass(slots=True)
+class StoredArtifact:
+    path: Path
+    blob: Path
+    checksum_sha256: str
+    size_bytes: int
+    deduplicated: bool
+
+
+class ContentStore:
+    """Blobs named by their SHA-256 under ``root``; stable names are hard links to them."""
+
+    def __init__(self, root: Path, suffix: str = "") -> None:
+        self.root = Path(root)
+        self.suffix = suffix
+
+    def writer(self) -> HashingWriter:
+        self.root.mkdir(parents=True, exist_ok=True)
+        return HashingWriter(self.root / f".{uuid4().hex}.part")
+
+    def blob_path(self, checksum: str) -> Path:
+        return self.root / f"{checksum}{self.suffix}"
+
+    def publish(self, writer: HashingWriter, destination: Path) -> StoredArtifact:
+        """Store the finished ``writer`` output and expose it atomically as ``destination``."""
+        writer.close()
+        checksum = writer.hexdigest()
+        blob = self.blob_path(checksum)
+        deduplicated = blob.exists()
+        if deduplicated:
+            writer.path.unlink(missing_ok=True)
+        else:
+            os.replace(writer.path, blob)
+
+        previous = destination.stat() if destination.exists() else None
+        # rename() is a no-op between two links of the same file: only swap when the content changed.
+        if previous is None or not os.path.samestat(previous, blob.stat()):
+            self._swap_in(blob, destination)
+            if previous is not None:
+                self._prune(previous)
+        return StoredArtifact(
+            path=destination,
+            blob=blob,
+            checksum_sha256=checksum,
+            size_bytes=writer.size,
+            deduplicated=deduplicated,
+        )
+
+    def resolve(self, path: Path, checksum_hint: str | None = None) -> Path | None:
+        """Blob currently published as ``path`` (``None`` if it is a plain copy or missing).
+
+        ``checksum_hint`` (e.g. a stored checksum) is tried first; it may lag behind a
+        concurrent publish, so the store is scanned for the linked blob otherwise.
+        """
+        try:
+            published = path.stat()
+        except FileNotFoundError:
+            return None
+        if checksum_hint:
+            candidate = self.blob_path(checksum_hint)
+            try:
+                if os.path.samestat(published, candidate.stat()):
+                    return candidate
+            except FileNotFoundError:
+                pass
+        try:
+            with os.scandir(self.root) as entries:
+                for entry in entries:
+                    if entry.name.startswith(".") or not entry.name.endswith(self.suffix):
+                        continue
+                    if entry.inode() == published.st_ino and entry.stat().st_dev == published.st_dev:
+                        return Path(entry.path)
+        except FileNotFoundError:
+            return None
+        return None
+
+    def _swap_in(self, blob: Path, destination: Path) -> None:
+        temp = destination.with_name(f".{destination.name}.{uuid4().hex}")
+        try:
+            os.link(blob, temp)
+        except OSError:
+            # No hard links on this filesystem: publish a copy instead.
+            shutil.copyfile(blob, temp)
+        os.replace(temp, destination)
+
+    def _prune(self, previous: os.stat_result) -> None:
+        # The blob formerly published under this name is garbage once no other name links it.
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.inode() != previous.st_ino or not entry.is_file(follow_symlinks=False):
+                    continue
+                if entry.stat(follow_symlinks=False).st_nlink <= 1:
+                    logger.debug("Pruning unreferenced artifact %s", entry.name)
+                    Path(entry.path).unlink(missing_ok=True)
+                return
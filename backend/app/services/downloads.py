@@ -0,0 +1,78 @@
+"""HTTP conditional and partial downloads of stored files (ETag, If-None-Match, Range).
+
+The Starlette version pinned here serves ``FileResponse`` whole; field clients on poor
+links need to revalidate cheaply (304) and resume interrupted transfers (206).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+
+class RangeNotSatisfiableError(RuntimeError):
+    """The requested byte range lies outside the file."""
+
+
+def etag_matches(header: str | None, etag: str, *, weak: bool = True) -> bool:
+    """Whether ``etag`` appears in an ``If-None-Match``/``If-Range`` header value.
+
+    ``If-None-Match`` uses the weak comparison (``W/`` prefixes ignored), ``If-Range``
+    the strong one.
+    """
+    if not header:
+        return False
+    candidates = [item.strip() for item in header.split(",")]
+    if "*" in candidates:
+        return True
+    if weak:
+        target = etag.removeprefix("W/")
+        return any(candidate.removeprefix("W/") == target for candidate in candidates)
+    return not etag.startswith("W/") and etag in candidates
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Inclusive ``(start, end)`` of a single ``bytes=`` range, or ``None`` to send the whole file.
+
+    Malformed headers and multi-range requests are ignored (a full 200 response is a
+    valid answer to both); a syntactically valid range outside the file raises
+    :class:`RangeNotSatisfiableError`.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0 or size == 0:
+                raise RangeNotSatisfiableError(header)
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(header)
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def iter_file_range(path: Path, start: int, end: int, chunk_size: int = DOWNLOAD_CHUNK_BYTES) -> Iterator[bytes]:
+    """Bytes ``start..end`` (inclusive) of ``path``, read in chunks."""
+    remaining = end - start + 1
+    with path.open("rb") as handle:
+        handle.seek(start)
+        while remaining > 0:
+            chunk = handle.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
@@ -0,0 +1,190 @@
+"""Stream images embedded in DOCX and PDF containers.
+
+Images are read straight from the container (``word/media`` zip members, PDF image
+xrefs) one at a time, hashed and deduplicated; nothing is written to disk and at
+most one encoded image is held in memory per iterator.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # noqa: BLE001
+    np = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional dependency
+    import cv2
+except Exception:  # noqa: BLE001
+    cv2 = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional dependency
+    import fitz  # type: ignore[attr-defined]
+except Exception:  # noqa: BLE001
+    fitz = None  # type: ignore[assignment]
+
+DOCX_MEDIA_PREFIX = "word/media/"
+# Formats OpenCV can decode; EMF/WMF vector drawings are skipped.
+DECODABLE_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp", ".gif"}
+MAX_DECODED_SIDE = 2500
+
+DOCX_CONTENT_TYPES = {
+    "application/msword",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+@dataclass(slots=True)
+class EmbeddedImage:
+    """Encoded image extracted from a container document."""
+
+    source_file: str
+    name: str
+    sha256: str
+    data: bytes
+    page: int | None = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.source_file}#{self.name}"
+
+
+@dataclass(slots=True)
+class EmbeddedImageStats:
+    found: int = 0
+    unique: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+    warnings: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "found": self.found,
+            "unique": self.unique,
+            "duplicates": self.duplicates,
+            "skipped": self.skipped,
+        }
+
+
+def is_available() -> bool:
+    return cv2 is not None and np is not None
+
+
+def _iter_docx_raw(path: Path, max_bytes: int) -> Iterator[tuple[str, int | None, bytes | None]]:
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not info.filename.startswith(DOCX_MEDIA_PREFIX) or info.is_dir():
+                continue
+            name = info.filename[len(DOCX_MEDIA_PREFIX) :]
+            if Path(name).suffix.lower() not in DECODABLE_SUFFIXES or (max_bytes and info.file_size > max_bytes):
+                yield name, None, None
+                continue
+            yield name, None, archive.read(info)
+
+
+def _iter_pdf_raw(
+    path: Path,
+    max_bytes: int,
+    skip_pages: set[int],
+    document: Any = None,
+) -> Iterator[tuple[str, int | None, bytes | None]]:
+    if document is None:
+        if fitz is None:
+            return
+        with fitz.open(path) as opened:  # type: ignore[arg-type]
+            yield from _iter_pdf_raw(path, max_bytes, skip_pages, opened)
+        return
+
+    seen_xrefs: set[int] = set()
+    for page_number, page in enumerate(document, start=1):
+        if page_number in skip_pages:
+            continue
+        for image_info in page.get_images(full=True):
+            xref = int(image_info[0])
+            if xref in seen_xrefs:
+                continue
+            seen_xrefs.add(xref)
+            name = f"p{page_number}-x{xref}"
+            extracted = document.extract_image(xref)
+            data = extracted.get("image") if extracted else None
+            if not data or (max_bytes and len(data) > max_bytes):
+                yield name, page_number, None
+                continue
+            yield f"{name}.{extracted.get('ext', 'bin')}", page_number, data
+
+
+def iter_embedded_images(
+    path: Path,
+    source_file: str,
+    content_type: str,
+    *,
+    seen: set[str] | None = None,
+    stats: EmbeddedImageStats | None = None,
+    max_images: int = 0,
+    max_bytes: int = 0,
+    skip_pages: set[int] | None = None,
+    document: Any = None,
+) -> Iterator[EmbeddedImage]:
+    """Yield unique embedded images of a DOCX/PDF file.
+
+    ``seen`` holds the SHA-256 of images already handled (shared across a batch);
+    ``max_images`` bounds how many images are yielded per document (0 = no limit).
+    ``document`` lets PDF callers reuse an already opened PyMuPDF document.
+    """
+    seen = seen if seen is not None else set()
+    stats = stats if stats is not None else EmbeddedImageStats()
+    content_type = (content_type or "").lower()
+
+    if content_type in DOCX_CONTENT_TYPES:
+        if not zipfile.is_zipfile(path):
+            return
+        raw_images = _iter_docx_raw(path, max_bytes)
+    elif content_type == "application/pdf":
+        raw_images = _iter_pdf_raw(path, max_bytes, skip_pages or set(), document)
+    else:
+        return
+
+    for name, page, data in raw_images:
+        stats.found += 1
+        if data is None:
+            stats.skipped += 1
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in seen:
+            stats.duplicates += 1
+            continue
+        if max_images and stats.unique >= max_images:
+            stats.skipped += 1
+            if "embedded-images-capped" not in stats.warnings:
+                stats.warnings.append("embedded-images-capped")
+            continue
+        seen.add(digest)
+        stats.unique += 1
+        yield EmbeddedImage(source_file=source_file, name=name, sha256=digest, data=data, page=page)
+
+
+def decode_image(data: bytes, min_side: int = 0) -> Any | None:
+    """Decode encoded bytes into a BGR array, downscaled to ``MAX_DECODED_SIDE``.
+
+    Returns ``None`` when the bytes cannot be decoded or the image is smaller than
+    ``min_side`` (logos, bullets and other decorations).
+    """
+    if not is_available():
+        return None
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    image = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+    if image is None:
+        return None
+    height, width = image.shape[:2]
+    if min(height, width) < min_side:
+        return None
+    longest = max(height, width)
+    if longest > MAX_DECODED_SIDE:
+        scale = MAX_DECODED_SIDE / longest
+        image = cv2.resize(image, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+    return image
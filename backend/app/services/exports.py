@@ -0,0 +1,288 @@
+"""Streaming exports of a batch (NDJSON, CSV, single-file HTML) read straight from the database.
+
+Rows are fetched with server-side cursors (``yield_per``) and serialised in blocks of
+``EXPORT_CHUNK_ROWS``, so memory stays bounded whatever the size of the batch. The
+generators open their own session: the request session is closed before a
+``StreamingResponse`` body is sent.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime
+from html import escape
+from typing import Any, AsyncIterator, Callable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import AuditBatch, BatchReport, OCRText, ProcessingEvent, RiskScoreEntry, VisionObservation
+from app.repositories.batches import merge_ocr_chunks
+
+EXPORT_CHUNK_ROWS = 500
+
+EXPORT_FORMATS: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+EXPORT_COLUMNS: dict[str, tuple[str, ...]] = {
+    "observations": (
+        "filename",
+        "label",
+        "severity",
+        "confidence",
+        "source",
+        "class_name",
+        "bbox",
+        "extra",
+        "created_at",
+    ),
+    "ocr": ("filename", "engine", "confidence", "error", "warnings", "extra", "text"),
+    "timeline": ("code", "label", "kind", "timestamp", "progress", "details"),
+}
+
+# Characters of each OCR text shown in the HTML export (the NDJSON/CSV exports keep it all).
+HTML_OCR_SNIPPET_CHARS = 1000
+
+
+def _value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _observation_row(row: VisionObservation) -> dict[str, Any]:
+    return {
+        "filename": row.filename,
+        "label": row.label,
+        "severity": row.severity,
+        "confidence": row.confidence,
+        "source": row.source,
+        "class_name": row.class_name,
+        "bbox": row.bbox,
+        "extra": row.extra,
+        "created_at": _value(row.created_at),
+    }
+
+
+def _event_row(row: ProcessingEvent) -> dict[str, Any]:
+    return {
+        "code": row.code,
+        "label": row.label,
+        "kind": row.kind,
+        "timestamp": _value(row.timestamp),
+        "progress": row.progress,
+        "details": row.details,
+    }
+
+
+def _ocr_row(head: OCRText, text: str) -> dict[str, Any]:
+    return {
+        "filename": head.filename,
+        "engine": head.engine,
+        "confidence": head.confidence,
+        "error": head.error,
+        "warnings": head.warnings,
+        "extra": head.extra,
+        "text": text,
+    }
+
+
+async def _stream_models(session: AsyncSession, model: Any, batch_id: str, *order_by: Any) -> AsyncIterator[Any]:
+    statement = (
+        select(model)
+        .where(model.batch_id == batch_id)
+        .order_by(*order_by)
+        .execution_options(yield_per=EXPORT_CHUNK_ROWS)
+    )
+    result = await session.stream_scalars(statement)
+    async for row in result:
+        yield row
+        # Rows are not needed once serialised; keep the identity map from growing.
+        session.expunge(row)
+
+
+async def _ocr_rows(session: AsyncSession, batch_id: str) -> AsyncIterator[dict[str, Any]]:
+    # Long texts span several rows; a head row (chunk_index 0) closes the previous text.
+    pending: list[OCRText] = []
+    async for row in _stream_models(session, OCRText, batch_id, OCRText.id):
+        if not row.chunk_index and pending:
+            for head, text in merge_ocr_chunks(pending):
+                yield _ocr_row(head, text)
+            pending = []
+        pending.append(row)
+    for head, text in merge_ocr_chunks(pending):
+        yield _ocr_row(head, text)
+
+
+async def iter_dataset(session: AsyncSession, batch_id: str, dataset: str) -> AsyncIterator[dict[str, Any]]:
+    """Rows of ``dataset`` (observations, ocr or timeline) as plain dicts, in storage order."""
+    if dataset == "observations":
+        async for row in _stream_models(session, VisionObservation, batch_id, VisionObservation.id):
+            yield _observation_row(row)
+    elif dataset == "ocr":
+        async for item in _ocr_rows(session, batch_id):
+            yield item
+    elif dataset == "timeline":
+        events = _stream_models(session, ProcessingEvent, batch_id, ProcessingEvent.timestamp, ProcessingEvent.id)
+        async for row in events:
+            yield _event_row(row)
+    else:
+        raise ValueError(f"Unknown export dataset: {dataset}")
+
+
+def _csv_cell(value: Any) -> Any:
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return "" if value is None else value
+
+
+async def _blocks(rows: AsyncIterator[dict[str, Any]], render: Callable[[dict[str, Any]], str]) -> AsyncIterator[bytes]:
+    buffer: list[str] = []
+    async for row in rows:
+        buffer.append(render(row))
+        if len(buffer) >= EXPORT_CHUNK_ROWS:
+            yield "".join(buffer).encode("utf-8")
+            buffer.clear()
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+async def stream_export(
+    session_factory: async_sessionmaker[AsyncSession],
+    batch_id: str,
+    dataset: str,
+    export_format: str,
+) -> AsyncIterator[bytes]:
+    """Body of an NDJSON or CSV export."""
+    columns = EXPORT_COLUMNS[dataset]
+    async with session_factory() as session:
+        rows = iter_dataset(session, batch_id, dataset)
+        if export_format == "ndjson":
+            async for block in _blocks(rows, lambda row: json.dumps(row, ensure_ascii=False, default=str) + "\n"):
+                yield block
+            return
+
+        line = io.StringIO()
+        writer = csv.writer(line)
+
+        def _render_csv(row: dict[str, Any]) -> str:
+            line.seek(0)
+            line.truncate()
+            writer.writerow([_csv_cell(row.get(column)) for column in columns])
+            return line.getvalue()
+
+        yield _render_csv({column: column for column in columns}).encode("utf-8")
+        async for block in _blocks(rows, _render_csv):
+            yield block
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="fr"><head><meta charset="utf-8"><title>Rapport AUDEX - {batch_id}</title>
+<style>
+body{{font-family:Helvetica,Arial,sans-serif;color:#111827;margin:2rem auto;max-width:1100px;padding:0 1rem}}
+h1{{font-size:1.6rem}}h2{{font-size:1.2rem;margin-top:2rem;border-bottom:1px solid #d1d5db}}
+table{{border-collapse:collapse;width:100%;font-size:.85rem}}th,td{{border:1px solid #d1d5db;padding:.25rem .4rem;text-align:left;vertical-align:top}}
+th{{background:#1f2937;color:#fff}}tr:nth-child(even) td{{background:#f9fafb}}
+.meta td:first-child{{width:30%;background:#e0e7ff}}.sev-high,.sev-critical{{color:#b91c1c;font-weight:bold}}
+pre{{white-space:pre-wrap;background:#f3f4f6;padding:.5rem;font-size:.8rem}}
+</style></head><body>
+"""
+
+
+def _cell(value: Any) -> str:
+    return escape("" if value is None else str(value))
+
+
+def _list(items: Any) -> str:
+    if not isinstance(items, list) or not items:
+        return ""
+    return "<ul>" + "".join(f"<li>{_cell(item)}</li>" for item in items) + "</ul>"
+
+
+async def stream_html_report(session_factory: async_sessionmaker[AsyncSession], batch_id: str) -> AsyncIterator[bytes]:
+    """Self-contained HTML report (inline CSS, no external resources)."""
+    async with session_factory() as session:
+        batch = await session.get(AuditBatch, batch_id)
+        risk = await session.get(RiskScoreEntry, batch_id)
+        summary = await session.get(BatchReport, batch_id)
+
+        parts = [_HTML_HEAD.format(batch_id=_cell(batch_id)), "<h1>Rapport d'audit AUDEX</h1>"]
+        meta = [
+            ("Batch ID", batch_id),
+            ("Statut", batch.status if batch else None),
+            ("Créé le", _value(batch.created_at) if batch else None),
+            ("Hash du rapport PDF", batch.report_hash if batch else None),
+        ]
+        if risk is not None:
+            score = f"{risk.total_score:.1f} pts (normalisé {risk.normalized_score * 100:.0f}%)"
+            meta.insert(2, ("Score global", score))
+        parts.append(
+            '<table class="meta">'
+            + "".join(f"<tr><td>{_cell(key)}</td><td>{_cell(value)}</td></tr>" for key, value in meta)
+            + "</table>"
+        )
+        if summary is not None:
+            parts.append("<h2>Synthèse</h2>")
+            parts.append(f"<p>{_cell(summary.summary_text or 'Synthèse indisponible.')}</p>")
+            if summary.findings:
+                parts.append("<h3>Points clés</h3>" + _list(summary.findings))
+            if summary.recommendations:
+                parts.append("<h3>Recommandations</h3>" + _list(summary.recommendations))
+        if risk is not None and isinstance(risk.breakdown, list) and risk.breakdown:
+            parts.append("<h2>Scores par catégorie</h2><table><tr><th>Catégorie</th><th>Sévérité</th>")
+            parts.append("<th>Occurrences</th><th>Score</th></tr>")
+            for item in risk.breakdown:
+                if isinstance(item, dict):
+                    parts.append(
+                        f"<tr><td>{_cell(item.get('label'))}</td><td>{_cell(item.get('severity'))}</td>"
+                        f"<td>{_cell(item.get('count'))}</td><td>{_cell(item.get('score'))}</td></tr>"
+                    )
+            parts.append("</table>")
+        yield "".join(parts).encode("utf-8")
+
+        yield (
+            "<h2>Observations</h2><table><tr><th>Fichier</th><th>Label</th><th>Sévérité</th>"
+            "<th>Confiance</th><th>Source</th></tr>"
+        ).encode("utf-8")
+
+        def _observation_html(row: dict[str, Any]) -> str:
+            severity = str(row.get("severity") or "")
+            confidence = row.get("confidence")
+            return (
+                f"<tr><td>{_cell(row['filename'])}</td><td>{_cell(row['label'])}</td>"
+                f'<td class="sev-{_cell(severity.lower())}">{_cell(severity)}</td>'
+                f"<td>{_cell(f'{confidence:.2f}' if isinstance(confidence, float) else confidence)}</td>"
+                f"<td>{_cell(row['source'])}</td></tr>\n"
+            )
+
+        async for block in _blocks(iter_dataset(session, batch_id, "observations"), _observation_html):
+            yield block
+        yield b"</table><h2>Extraits OCR</h2>"
+
+        def _ocr_html(row: dict[str, Any]) -> str:
+            text = str(row.get("text") or "")
+            if len(text) > HTML_OCR_SNIPPET_CHARS:
+                text = text[:HTML_OCR_SNIPPET_CHARS] + "…"
+            return f"<h3>{_cell(row['filename'])}</h3><pre>{_cell(text)}</pre>\n"
+
+        async for block in _blocks(iter_dataset(session, batch_id, "ocr"), _ocr_html):
+            yield block
+
+        yield (
+            "<h2>Timeline</h2><table><tr><th>Horodatage</th><th>Étape</th><th>Libellé</th><th>Progression</th></tr>"
+        ).encode("utf-8")
+
+        def _event_html(row: dict[str, Any]) -> str:
+            progress = row.get("progress")
+            return (
+                f"<tr><td>{_cell(row['timestamp'])}</td><td>{_cell(row['code'])}</td><td>{_cell(row['label'])}</td>"
+                f"<td>{_cell(f'{progress}%' if progress is not None else '-')}</td></tr>\n"
+            )
+
+        async for block in _blocks(iter_dataset(session, batch_id, "timeline"), _event_html):
+            yield block
+        yield b"</table></body></html>\n"
@@ -0,0 +1,225 @@
+"""Résumé extractif local (sans réseau) à partir du score, des observations et de l'OCR.
+
+Les phrases sont assemblées à partir de gabarits classés : les catégories du
+``RiskScore.breakdown`` les plus lourdes, les observations les plus graves (gravité ×
+confiance) et les extraits OCR qui mentionnent ces catégories. Le calcul est
+déterministe et prend quelques millisecondes par lot ; il sert de moteur principal
+hors ligne (``SUMMARY_ENGINE=extractive``) ou de texte provisoire en attendant la
+synthèse LLM.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+from app.pipelines.models import OCRResult, Observation, RiskBreakdown
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.report_summary import SummaryRequest
+
+SEVERITY_WEIGHTS: dict[str, float] = {"critical": 4.0, "high": 3.0, "medium": 2.0, "low": 1.0, "negligible": 0.5}
+
+SEVERITY_LABELS: dict[str, str] = {
+    "critical": "critique",
+    "high": "élevée",
+    "medium": "modérée",
+    "low": "faible",
+    "negligible": "négligeable",
+}
+
+CATEGORY_LABELS: dict[str, str] = {
+    "incendie": "sécurité incendie",
+    "hygiene": "hygiène",
+    "cleanliness_issue": "propreté",
+    "access_control": "contrôle d'accès",
+    "malveillance": "sûreté / malveillance",
+    "security_level_alert": "niveau de sûreté global",
+}
+
+# (mots-clés de catégorie, action recommandée), par ordre de priorité.
+RECOMMENDATION_TEMPLATES: tuple[tuple[tuple[str, ...], str], ...] = (
+    (
+        ("incendie", "fire", "extincteur", "extinguisher", "hydrant"),
+        "Contrôler et remettre en conformité les moyens de lutte contre l'incendie (extincteurs, "
+        "issues et signalétique) - Responsable : équipe QHSE - Délai : sous 7 jours",
+    ),
+    (
+        ("access", "perimeter", "fence", "gate", "door", "lock"),
+        "Renforcer le contrôle d'accès et réparer les points d'entrée vulnérables - "
+        "Responsable : sûreté / maintenance - Délai : sous 15 jours",
+    ),
+    (
+        ("malveillance", "security", "camera", "surveillance", "lighting"),
+        "Revoir le dispositif de sûreté (surveillance, éclairage, rondes) des zones exposées - "
+        "Responsable : sûreté - Délai : sous 30 jours",
+    ),
+    (
+        ("hygiene", "cleanliness", "waste", "toilet"),
+        "Planifier une remise en état et un nettoyage des zones concernées, avec contrôle "
+        "de suivi - Responsable : services généraux - Délai : sous 7 jours",
+    ),
+    (
+        ("structural", "crack", "electri", "cable"),
+        "Faire expertiser les défauts structurels ou électriques relevés - Responsable : "
+        "maintenance - Délai : sous 15 jours",
+    ),
+)
+
+GENERIC_RECOMMENDATIONS: tuple[str, ...] = (
+    "Traiter en priorité les écarts de gravité élevée relevés lors de l'audit - Responsable : équipe QHSE - "
+    "Délai : sous 15 jours",
+    "Programmer une visite de contrôle pour vérifier la levée des écarts - Responsable : équipe QHSE - "
+    "Délai : sous 30 jours",
+)
+
+MAX_FINDINGS = 4
+MAX_RECOMMENDATIONS = 2
+SNIPPET_CHARS = 140
+
+
+@dataclass(slots=True)
+class ExtractiveSummary:
+    text: str
+    findings: list[str] = field(default_factory=list)
+    recommendations: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+
+def category_label(label: str) -> str:
+    if label in CATEGORY_LABELS:
+        return CATEGORY_LABELS[label]
+    if label.startswith("security_"):
+        return label[len("security_"):].replace("_", " ")
+    return label.replace("_", " ")
+
+
+def _severity(value: str | None) -> str:
+    return SEVERITY_LABELS.get((value or "").lower(), value or "non précisée")
+
+
+def _observation_weight(observation: Observation) -> float:
+    confidence = observation.confidence if isinstance(observation.confidence, (int, float)) else 0.5
+    return SEVERITY_WEIGHTS.get((observation.severity or "").lower(), 1.0) * max(0.1, min(1.0, confidence))
+
+
+def rank_observations(observations: Iterable[Observation]) -> list[Observation]:
+    """Observations les plus graves d'abord, une seule par (libellé, fichier)."""
+    seen: set[tuple[str, str]] = set()
+    ranked: list[Observation] = []
+    for observation in sorted(observations, key=_observation_weight, reverse=True):
+        key = (observation.label, observation.source_file)
+        if key in seen:
+            continue
+        seen.add(key)
+        ranked.append(observation)
+    return ranked
+
+
+def _keywords(observation: Observation) -> str:
+    extra = observation.extra or {}
+    parts = [observation.label, str(extra.get("category") or ""), str(extra.get("class_name") or "")]
+    return " ".join(parts).lower()
+
+
+def _finding(observation: Observation, count: int) -> str:
+    extra = observation.extra or {}
+    description = extra.get("description")
+    subject = str(description).rstrip(".") if description else category_label(observation.label).capitalize()
+    where = extra.get("location") or extra.get("zone")
+    location = f" ({where})" if where else ""
+    occurrences = f", {count} occurrence(s)" if count > 1 else ""
+    return (
+        f"{subject}{location} - Preuves : {observation.source_file}{occurrences} - "
+        f"(Gravité {_severity(observation.severity)}, confiance {observation.confidence * 100:.0f}%)"
+    )
+
+
+def _recommendations(ranked: Sequence[Observation], breakdown: Sequence[RiskBreakdown]) -> list[str]:
+    recommendations: list[str] = []
+    # 1. Actions proposées par l'analyse distante pour les observations les plus graves.
+    for observation in ranked:
+        suggestion = (observation.extra or {}).get("recommendation")
+        if suggestion and str(suggestion) not in recommendations:
+            recommendations.append(str(suggestion))
+        if len(recommendations) >= MAX_RECOMMENDATIONS:
+            return recommendations
+    # 2. Gabarits par catégorie, dans l'ordre des catégories les plus lourdes.
+    haystacks = [item.label.lower() for item in breakdown] + [_keywords(observation) for observation in ranked]
+    for haystack in haystacks:
+        for keywords, action in RECOMMENDATION_TEMPLATES:
+            if action not in recommendations and any(keyword in haystack for keyword in keywords):
+                recommendations.append(action)
+                break
+        if len(recommendations) >= MAX_RECOMMENDATIONS:
+            return recommendations
+    for action in GENERIC_RECOMMENDATIONS:
+        if len(recommendations) >= MAX_RECOMMENDATIONS:
+            break
+        recommendations.append(action)
+    return recommendations
+
+
+def _relevant_snippet(ocr_texts: Sequence[OCRResult], ranked: Sequence[Observation]) -> OCRResult | None:
+    keywords = {word for observation in ranked[:3] for word in re.findall(r"[a-zà-ÿ]{5,}", _keywords(observation))}
+    best: tuple[int, OCRResult] | None = None
+    for entry in ocr_texts:
+        text = (entry.text or "").strip()
+        if not text:
+            continue
+        lowered = text.lower()
+        score = sum(1 for keyword in keywords if keyword in lowered)
+        if best is None or score > best[0]:
+            best = (score, entry)
+    return best[1] if best else None
+
+
+def build_extractive_summary(request: "SummaryRequest") -> ExtractiveSummary:
+    observations = list(request.observations_local or []) + list(request.observations_gemini or [])
+    ocr_texts = list(request.ocr_texts or [])
+    breakdown = list(request.risk.breakdown) if request.risk else []
+    ranked = rank_observations(observations)
+    counts: dict[str, int] = {}
+    for observation in observations:
+        counts[observation.label] = counts.get(observation.label, 0) + 1
+
+    sentences: list[str] = []
+    if observations:
+        local = len(request.observations_local or [])
+        sentences.append(
+            f"{len(observations)} observation(s) relevée(s) ({local} terrain, {len(observations) - local} analyse distante)."
+        )
+    else:
+        sentences.append("Aucune observation n'a été relevée sur les éléments transmis.")
+    if breakdown:
+        main = ", ".join(
+            f"{category_label(item.label)} (gravité {_severity(item.severity)}, {item.count} cas)" for item in breakdown[:3]
+        )
+        sentences.append(f"Catégories prédominantes : {main}.")
+    critical = [item for item in ranked if (item.severity or "").lower() in {"critical", "high"}]
+    if critical:
+        top = critical[0]
+        sentences.append(
+            f"Point de vigilance prioritaire : {category_label(top.label)} ({top.source_file}), "
+            f"gravité {_severity(top.severity)}."
+        )
+    elif observations:
+        sentences.append("Aucune anomalie critique n'a été identifiée.")
+    snippet_entry = _relevant_snippet(ocr_texts, ranked)
+    if snippet_entry is not None:
+        snippet = re.sub(r"\s+", " ", snippet_entry.text).strip()[:SNIPPET_CHARS]
+        sentences.append(f"Extrait des documents ({snippet_entry.source_file}) : « {snippet} ».")
+
+    findings = [_finding(observation, counts.get(observation.label, 1)) for observation in ranked[:MAX_FINDINGS]]
+    warnings: list[str] = []
+    if not observations:
+        warnings.append("[missing_data] Aucune observation exploitable - vérifier la couverture photo du site")
+    if not ocr_texts:
+        warnings.append("[missing_data] Aucun document texte analysé")
+    return ExtractiveSummary(
+        text=" ".join(sentences),
+        findings=findings,
+        recommendations=_recommendations(ranked, breakdown),
+        warnings=warnings,
+    )
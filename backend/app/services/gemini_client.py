@@ -0,0 +1,140 @@
+"""Shared Gemini client layer.
+
+``genai.configure`` mutates process-global state and every ``GenerativeModel`` lazily
+builds its own service client. Instead, one :class:`GeminiClient` per API key owns a
+single ``GenerativeServiceClient`` (and therefore one pooled, kept-alive connection)
+plus cached model handles per (model, generation config). Handles are safe to share
+between threads.
+
+``endpoint`` (``GEMINI_API_ENDPOINT``) points the client at another server speaking
+the REST ``generateContent`` contract, e.g. a local stand-in during tests and
+benchmarks.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from logging import getLogger
+from typing import Any, Iterator, Mapping
+
+try:  # pragma: no cover - optional dependency
+    import google.generativeai as genai  # type: ignore
+    from google.ai import generativelanguage as glm  # type: ignore
+except Exception:  # noqa: BLE001
+    genai = None  # type: ignore[assignment]
+    glm = None  # type: ignore[assignment]
+
+logger = getLogger(__name__)
+
+MISSING_DEPENDENCY_MESSAGE = (
+    "google-generativeai n'est pas installé. Ajoutez la dépendance 'google-generativeai' "
+    "ou désactivez GEMINI_ENABLED."
+)
+
+
+def is_available() -> bool:
+    return genai is not None and glm is not None
+
+
+def extract_response_text(response: Any) -> str | None:
+    """Return the text of a ``generate_content`` response, rebuilding it from candidates if needed."""
+    try:
+        text = getattr(response, "text", None)
+    except ValueError:  # raised by the SDK when the candidate has no text part
+        text = None
+    if text:
+        return text
+    candidates = getattr(response, "candidates", None)
+    if candidates:
+        candidate_content = getattr(candidates[0], "content", None)
+        candidate_parts = getattr(candidate_content, "parts", []) if candidate_content else []
+        texts = [getattr(part, "text", "") for part in candidate_parts if getattr(part, "text", "")]
+        if texts:
+            return "\n".join(texts)
+    return None
+
+
+class GeminiClient:
+    """Thread-safe access to Gemini models for one API key."""
+
+    def __init__(self, api_key: str, endpoint: str | None = None) -> None:
+        if not is_available():
+            raise RuntimeError(MISSING_DEPENDENCY_MESSAGE)
+        self._api_key = api_key
+        self.endpoint = endpoint or None
+        self._lock = threading.Lock()
+        self._service: Any = None
+        self._models: dict[tuple[str, str], Any] = {}
+
+    def _service_client(self) -> Any:
+        if self._service is None:
+            if self.endpoint:
+                # REST keeps plain http:// endpoints usable (gRPC would require TLS).
+                self._service = glm.GenerativeServiceClient(
+                    client_options={"api_key": self._api_key, "api_endpoint": self.endpoint},
+                    transport="rest",
+                )
+            else:
+                self._service = glm.GenerativeServiceClient(client_options={"api_key": self._api_key})
+        return self._service
+
+    def model(self, model_name: str, generation_config: Mapping[str, Any] | None = None) -> Any:
+        """Return the cached ``GenerativeModel`` handle for this model and generation config."""
+        key = (model_name, json.dumps(dict(generation_config or {}), sort_keys=True))
+        with self._lock:
+            handle = self._models.get(key)
+            if handle is None:
+                handle = genai.GenerativeModel(model_name=model_name, generation_config=dict(generation_config or {}))
+                # Share one connection per API key. The SDK has no public hook for this: ``_client``
+                # is pinned to google-generativeai 0.8.x and guarded by tests/test_gemini_client.py.
+                handle._client = self._service_client()
+                self._models[key] = handle
+                logger.debug("Gemini model handle created for %s (%d cached)", model_name, len(self._models))
+            return handle
+
+    def generate(
+        self,
+        model_name: str,
+        contents: Any,
+        *,
+        generation_config: Mapping[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> Any:
+        request_options = {"timeout": timeout} if timeout else None
+        return self.model(model_name, generation_config).generate_content(contents, request_options=request_options)
+
+    def stream(
+        self,
+        model_name: str,
+        contents: Any,
+        *,
+        generation_config: Mapping[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> Iterator[str]:
+        """Yield the text of each chunk of a streamed ``generate_content`` call as it arrives."""
+        request_options = {"timeout": timeout} if timeout else None
+        response = self.model(model_name, generation_config).generate_content(
+            contents,
+            stream=True,
+            request_options=request_options,
+        )
+        for chunk in response:
+            text = extract_response_text(chunk)
+            if text:
+                yield text
+
+
+_clients: dict[tuple[str, str | None], GeminiClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_gemini_client(api_key: str, endpoint: str | None = None) -> GeminiClient:
+    """Process-wide client for ``api_key`` and ``endpoint`` (created on first use)."""
+    key = (api_key, endpoint or None)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = GeminiClient(api_key, endpoint)
+            _clients[key] = client
+        return client
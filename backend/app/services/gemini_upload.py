@@ -0,0 +1,189 @@
+"""Pre-upload image transform for Gemini requests.
+
+Field photos are often several MB; Gemini does not need more than ~1.5k pixels on the
+long edge. Images are resized and re-encoded (JPEG or WebP) before being sent as
+``inline_data``; transformed bytes are kept in a bounded in-memory LRU so retries,
+grouped requests and reruns reuse them.
+"""
+
+from __future__ import annotations
+
+import io
+import mimetypes
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from logging import getLogger
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+
+logger = getLogger(__name__)
+
+FORMAT_ORIGINAL = "original"
+FORMAT_MIME_TYPES = {"jpeg": "image/jpeg", "webp": "image/webp"}
+
+
+@dataclass(slots=True)
+class PreparedImage:
+    data: bytes
+    mime_type: str
+    original_bytes: int
+    encode_ms: float = 0.0
+    transformed: bool = False
+    cached: bool = False
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(0, self.original_bytes - len(self.data))
+
+
+@dataclass(slots=True)
+class UploadStats:
+    """Per-batch aggregate of what was actually sent to Gemini."""
+
+    images: int = 0
+    original_bytes: int = 0
+    uploaded_bytes: int = 0
+    encode_ms: float = 0.0
+    call_ms: float = 0.0
+
+    def add(self, prepared: PreparedImage, call_ms: float | None = None) -> None:
+        self.images += 1
+        self.original_bytes += prepared.original_bytes
+        self.uploaded_bytes += len(prepared.data)
+        self.encode_ms += prepared.encode_ms
+        self.call_ms += call_ms or 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "images": self.images,
+            "original_bytes": self.original_bytes,
+            "uploaded_bytes": self.uploaded_bytes,
+            "bytes_saved": max(0, self.original_bytes - self.uploaded_bytes),
+            "encode_ms": round(self.encode_ms, 1),
+            "call_ms": round(self.call_ms, 1),
+            "avg_call_ms": round(self.call_ms / self.images, 1) if self.images else None,
+        }
+
+
+def _original(image_path: Path, data: bytes) -> PreparedImage:
+    mime_type, _ = mimetypes.guess_type(image_path.as_posix())
+    return PreparedImage(data=data, mime_type=mime_type or "image/jpeg", original_bytes=len(data))
+
+
+def encode_for_upload(image_path: Path, max_edge: int, fmt: str, quality: int) -> PreparedImage:
+    """Resize ``image_path`` to ``max_edge`` (never upscaling) and re-encode it.
+
+    The original bytes are kept when the transform is disabled, fails or would not make
+    the payload smaller.
+    """
+    data = image_path.read_bytes()
+    fmt = (fmt or FORMAT_ORIGINAL).lower()
+    if fmt == FORMAT_ORIGINAL or fmt not in FORMAT_MIME_TYPES:
+        return _original(image_path, data)
+
+    start = time.perf_counter()
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            if max_edge > 0 and max(image.size) > max_edge:
+                image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            options: dict[str, Any] = {"quality": quality}
+            if fmt == "jpeg":
+                options.update(optimize=True, progressive=True)
+            else:
+                options.update(method=4)
+            image.save(buffer, format=fmt.upper(), **options)
+    except Exception as exc:  # noqa: BLE001 - undecodable image: let Gemini deal with the original
+        logger.debug("Upload re-encoding skipped for %s: %s", image_path.name, exc)
+        return _original(image_path, data)
+    encoded = buffer.getvalue()
+    encode_ms = (time.perf_counter() - start) * 1000
+
+    if len(encoded) >= len(data):
+        prepared = _original(image_path, data)
+        prepared.encode_ms = encode_ms
+        return prepared
+    return PreparedImage(
+        data=encoded,
+        mime_type=FORMAT_MIME_TYPES[fmt],
+        original_bytes=len(data),
+        encode_ms=encode_ms,
+        transformed=True,
+    )
+
+
+class UploadCache:
+    """LRU of prepared uploads bounded by total bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self._entries: OrderedDict[tuple[Any, ...], PreparedImage] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[Any, ...]) -> PreparedImage | None:
+        with self._lock:
+            prepared = self._entries.get(key)
+            if prepared is not None:
+                self._entries.move_to_end(key)
+            return prepared
+
+    def put(self, key: tuple[Any, ...], prepared: PreparedImage) -> None:
+        size = len(prepared.data)
+        if not self.max_bytes or size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.data)
+            self._entries[key] = prepared
+            self._size += size
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.data)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+
+_upload_cache = UploadCache(max(0, settings.GEMINI_UPLOAD_CACHE_MB) * 1024 * 1024)
+
+
+def prepare_upload(
+    image_path: Path,
+    *,
+    max_edge: int | None = None,
+    fmt: str | None = None,
+    quality: int | None = None,
+    cache: UploadCache | None = None,
+) -> PreparedImage:
+    """Return the bytes to send to Gemini for ``image_path`` (cached per file version and settings)."""
+    max_edge = settings.GEMINI_UPLOAD_MAX_EDGE if max_edge is None else max_edge
+    fmt = settings.GEMINI_UPLOAD_FORMAT if fmt is None else fmt
+    quality = settings.GEMINI_UPLOAD_QUALITY if quality is None else quality
+    cache = _upload_cache if cache is None else cache
+
+    stat = image_path.stat()
+    key = (str(image_path.resolve()), stat.st_mtime_ns, stat.st_size, max_edge, fmt, quality)
+    cached = cache.get(key)
+    if cached is not None:
+        return PreparedImage(
+            data=cached.data,
+            mime_type=cached.mime_type,
+            original_bytes=cached.original_bytes,
+            transformed=cached.transformed,
+            cached=True,
+        )
+    prepared = encode_for_upload(image_path, max_edge, fmt, quality)
+    cache.put(key, prepared)
+    return prepared
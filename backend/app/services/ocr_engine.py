@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
 from logging import getLogger
 from pathlib import Path
-from typing import Any, Callable, Protocol, Sequence
+from typing import Any, Callable, Iterable, Protocol, Sequence
 
 try:  # pragma: no cover - optional dependency
     import numpy as np
@@ -22,11 +26,6 @@ try:  # pragma: no cover - optional dependency
 except Exception:  # noqa: BLE001
     fitz = None  # type: ignore[assignment]
 
-try:  # pragma: no cover - optional dependency
-    from docx import Document  # type: ignore[import]
-except Exception:  # noqa: BLE001
-    Document = None  # type: ignore[assignment]
-
 from PIL import Image
 
 try:  # pragma: no cover - optional dependency
@@ -38,6 +37,8 @@ from app.core.config import settings
 from app.pipelines import ocr as legacy_ocr
 from app.pipelines.models import OCRResult
 from app.schemas.ingestion import FileMetadata
+from app.services import ocr_preprocessing
+from app.services import embedded_images, text_extraction
 
 logger = getLogger(__name__)
 
@@ -49,11 +50,95 @@ class OCREngine(Protocol):
         ...
 
 
+def _streamed_result(
+    filename: str,
+    extractor: Callable[[Path, int, int], "text_extraction.ExtractedText"],
+    path: Path,
+) -> OCRResult:
+    """Run a streaming text extractor with the configured caps and wrap it as an OCRResult."""
+    extracted = extractor(
+        path,
+        settings.OCR_TEXT_MAX_STORED_CHARS,
+        max(0, settings.OCR_TEXT_MAX_INPUT_MB) * 1024 * 1024,
+    )
+    warnings = list(extracted.warnings)
+    extra: dict[str, Any] = {}
+    if extracted.encoding:
+        extra["encoding"] = extracted.encoding
+    if extracted.truncated or extracted.input_capped:
+        extra["full_text"] = extracted.as_dict()
+        if extracted.truncated:
+            warnings.append("text-truncated")
+        logger.info(
+            "Stored %s/%s characters of %s (full text: %s).",
+            len(extracted.text),
+            extracted.total_chars,
+            filename,
+            extracted.sidecar_path or "-",
+        )
+    return OCRResult(
+        source_file=filename,
+        text=extracted.text,
+        confidence=1.0 if extracted.text else None,
+        warnings=warnings,
+        extra=extra,
+    )
+
+
 class LegacyOCREngine:
-    """Wrapper around the historical OCR module (pytesseract-based)."""
+    """Wrapper around the historical OCR module (pytesseract-based).
+
+    When ``OCR_TESSERACT_WORKERS`` > 0, images announced through :meth:`prefetch`
+    are recognised concurrently in a bounded Tesseract process pool while the
+    pipeline works through the batch. Languages are resolved per file like
+    :class:`EasyOCREngine` does (file metadata, then batch, then defaults).
+    """
 
     engine_id = "tesseract"
 
+    def __init__(self, max_workers: int | None = None, languages: Sequence[str] | None = None) -> None:
+        self._workers = settings.OCR_TESSERACT_WORKERS if max_workers is None else max_workers
+        self._lang = legacy_ocr.tesseract_languages(languages or settings.OCR_LANGUAGES)
+        self._batch_lang: str | None = None
+        self._pending: dict[tuple[str, str | None], Future[str]] = {}
+
+    def set_batch_languages(self, languages: Iterable[str] | None) -> None:
+        self._batch_lang = legacy_ocr.tesseract_languages(normalize_languages(languages))
+
+    def resolve_languages(self, file_meta: FileMetadata) -> str | None:
+        """Tesseract language string (e.g. ``fra+eng``) for ``file_meta``."""
+        file_lang = legacy_ocr.tesseract_languages(languages_from_metadata(file_meta.metadata))
+        return file_lang or self._batch_lang or self._lang
+
+    def prefetch(self, files: Iterable[FileMetadata]) -> None:
+        """Submit every image of the batch to the Tesseract pool ahead of :meth:`extract`."""
+        if self._workers <= 0:
+            return
+        for file_meta in files:
+            if not (file_meta.content_type or "").lower().startswith("image/"):
+                continue
+            lang = self.resolve_languages(file_meta)
+            key = (file_meta.stored_path, lang)
+            if key in self._pending:
+                continue
+            try:
+                pool = legacy_ocr.get_tesseract_pool(self._workers, lang)
+                self._pending[key] = pool.submit(Path(file_meta.stored_path))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Tesseract pool unavailable, OCR will run in-process: %s", exc)
+                self._workers = 0
+                return
+
+    def _image_text(self, path: Path, lang: str | None) -> tuple[str, list[str]]:
+        future = self._pending.pop((str(path), lang), None)
+        if future is not None:
+            try:
+                return future.result(), []
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Tesseract pool failed on %s, retrying in-process: %s", path.name, exc)
+                return legacy_ocr.extract_text(path, lang), ["tesseract-pool-error"]
+        return legacy_ocr.extract_text(path, lang), []
+
     def extract(self, file_meta: FileMetadata) -> OCRResult:
         path = Path(file_meta.stored_path)
         text = ""
@@ -63,11 +148,10 @@ class LegacyOCREngine:
         content_type = (file_meta.content_type or "").lower()
 
         if content_type.startswith("image/"):
-            text = legacy_ocr.extract_text(path)
+            text, warnings = self._image_text(path, self.resolve_languages(file_meta))
         elif content_type == "text/plain":
             try:
-                text = path.read_text(encoding="utf-8")
-                confidence = 1.0 if text else None
+                return _streamed_result(file_meta.filename, text_extraction.extract_plain_text, path)
             except Exception as exc:  # noqa: BLE001
                 warnings.append(f"plain-text-read-error:{exc}")
         elif content_type == "application/pdf":
@@ -91,17 +175,257 @@ class LegacyOCREngine:
         )
 
 
+DEFAULT_READER_BYTES = 300 * 1024 * 1024
+
+EmbeddedImageSink = Callable[["embedded_images.EmbeddedImage", Any], None]
+
+LanguageKey = tuple[str, ...]
+
+
+def normalize_languages(languages: Iterable[str] | str | None) -> LanguageKey:
+    """Return a canonical, hashable language key (deduplicated, sorted)."""
+    if languages is None:
+        return ()
+    if isinstance(languages, str):
+        languages = languages.split(",")
+    cleaned = {str(item).strip().lower() for item in languages if str(item).strip()}
+    return tuple(sorted(cleaned))
+
+
+def languages_from_metadata(metadata: dict[str, Any] | None) -> LanguageKey:
+    if not metadata:
+        return ()
+    value = metadata.get("ocr_languages") or metadata.get("languages") or metadata.get("lang")
+    if isinstance(value, (str, list, tuple)):
+        return normalize_languages(value)
+    return ()
+
+
+def _estimate_reader_bytes(reader: Any) -> int:
+    total = 0
+    for attribute in ("detector", "recognizer"):
+        module = getattr(reader, attribute, None)
+        parameters = getattr(module, "parameters", None)
+        if not callable(parameters):
+            continue
+        try:
+            total += sum(param.numel() * param.element_size() for param in parameters())
+        except Exception:  # noqa: BLE001
+            continue
+    return total or DEFAULT_READER_BYTES
+
+
+def _default_reader_factory(languages: LanguageKey) -> Any:
+    if easyocr is None:
+        raise RuntimeError("EasyOCR is not available in the current environment.")
+    return easyocr.Reader(  # type: ignore[attr-defined]
+        list(languages),
+        gpu=False,
+        download_enabled=settings.EASY_OCR_DOWNLOAD_ENABLED,
+    )
+
+
+@dataclass(slots=True)
+class _PooledReader:
+    reader: Any
+    size_bytes: int
+    lock: threading.Lock
+
+    def __enter__(self) -> Any:
+        self.lock.acquire()
+        return self.reader
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.lock.release()
+
+
+class EasyOCRReaderPool:
+    """Process-wide LRU pool of EasyOCR readers keyed by language set.
+
+    Readers are built lazily, reused across batches and evicted (least recently
+    used first) when the pool exceeds ``max_readers`` or ``memory_budget_bytes``.
+    The most recently acquired reader is never evicted.
+
+    A reader is not thread-safe: :meth:`checkout` lends it to one caller at a time.
+    A language set whose reader failed to load is not retried before
+    ``retry_after_seconds`` (e.g. a model download that may succeed later).
+    """
+
+    def __init__(
+        self,
+        max_readers: int,
+        memory_budget_bytes: int,
+        factory: Callable[[LanguageKey], Any] | None = None,
+        size_estimator: Callable[[Any], int] | None = None,
+        retry_after_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_readers = max(1, max_readers)
+        self.memory_budget_bytes = max(0, memory_budget_bytes)
+        self.retry_after_seconds = max(0.0, retry_after_seconds)
+        self._factory = factory or _default_reader_factory
+        self._size_estimator = size_estimator or _estimate_reader_bytes
+        self._clock = clock
+        self._readers: OrderedDict[LanguageKey, _PooledReader] = OrderedDict()
+        self._failed: dict[LanguageKey, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._build_locks: dict[LanguageKey, threading.Lock] = {}
+
+    def acquire(
+        self,
+        languages: Iterable[str],
+        status_callback: Callable[[str, dict[str, Any]], None] | None = None,
+    ) -> Any:
+        """Return the pooled reader without reserving it (see :meth:`checkout`)."""
+        return self._entry(languages, status_callback).reader
+
+    def checkout(
+        self,
+        languages: Iterable[str],
+        status_callback: Callable[[str, dict[str, Any]], None] | None = None,
+    ) -> _PooledReader:
+        """Load the reader for ``languages``; ``with`` the result to use it exclusively."""
+        return self._entry(languages, status_callback)
+
+    def _entry(
+        self,
+        languages: Iterable[str],
+        status_callback: Callable[[str, dict[str, Any]], None] | None,
+    ) -> _PooledReader:
+        key = normalize_languages(languages) or ("en",)
+        with self._lock:
+            pooled = self._readers.get(key)
+            if pooled is not None:
+                self._readers.move_to_end(key)
+                return pooled
+            failure = self._failed.get(key)
+            if failure is not None:
+                error, failed_at = failure
+                if self._clock() - failed_at < self.retry_after_seconds:
+                    raise RuntimeError(f"EasyOCR initialisation previously failed: {error}")
+                del self._failed[key]
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                pooled = self._readers.get(key)
+                if pooled is not None:
+                    self._readers.move_to_end(key)
+                    return pooled
+                if key in self._failed:
+                    raise RuntimeError(f"EasyOCR initialisation previously failed: {self._failed[key][0]}")
+            reader = self._build(key, status_callback)
+            pooled = _PooledReader(reader=reader, size_bytes=self._size_estimator(reader), lock=threading.Lock())
+            with self._lock:
+                self._readers[key] = pooled
+                self._evict_locked(keep=key)
+            return pooled
+
+    def _build(
+        self,
+        key: LanguageKey,
+        status_callback: Callable[[str, dict[str, Any]], None] | None,
+    ) -> Any:
+        logger.info("Initialising EasyOCR reader for languages %s (gpu=off).", ", ".join(key))
+        if status_callback:
+            status_callback(
+                "ocr:warmup:start",
+                {
+                    "label": "Initialisation du moteur OCR (EasyOCR)",
+                    "languages": list(key),
+                },
+            )
+        try:
+            reader = self._factory(key)
+        except Exception as exc:  # noqa: BLE001
+            with self._lock:
+                self._failed[key] = (str(exc), self._clock())
+            logger.warning("Unable to initialise EasyOCR (languages=%s): %s", ", ".join(key), exc)
+            if status_callback:
+                status_callback(
+                    "ocr:warmup:error",
+                    {
+                        "label": "Erreur lors du chargement EasyOCR",
+                        "languages": list(key),
+                        "error": str(exc),
+                    },
+                )
+            raise
+        if status_callback:
+            status_callback(
+                "ocr:warmup:complete",
+                {
+                    "label": "Moteur OCR initialisé",
+                    "languages": list(key),
+                },
+            )
+        return reader
+
+    def _evict_locked(self, keep: LanguageKey) -> None:
+        while len(self._readers) > 1:
+            over_count = len(self._readers) > self.max_readers
+            over_budget = bool(self.memory_budget_bytes) and self.resident_bytes > self.memory_budget_bytes
+            if not (over_count or over_budget):
+                break
+            victim = next((key for key in self._readers if key != keep), None)
+            if victim is None:
+                break
+            evicted = self._readers.pop(victim)
+            logger.info(
+                "Evicting cold EasyOCR reader %s (~%.0f MB)",
+                ", ".join(victim),
+                evicted.size_bytes / (1024 * 1024),
+            )
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(item.size_bytes for item in self._readers.values())
+
+    def keys(self) -> list[LanguageKey]:
+        with self._lock:
+            return list(self._readers.keys())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._readers.clear()
+            self._failed.clear()
+
+
+_reader_pool: EasyOCRReaderPool | None = None
+_reader_pool_lock = threading.Lock()
+
+
+def get_reader_pool() -> EasyOCRReaderPool:
+    global _reader_pool  # noqa: PLW0603
+    if _reader_pool is None:
+        with _reader_pool_lock:
+            if _reader_pool is None:
+                _reader_pool = EasyOCRReaderPool(
+                    max_readers=settings.OCR_READER_POOL_SIZE,
+                    memory_budget_bytes=settings.OCR_READER_MEMORY_BUDGET_MB * 1024 * 1024,
+                    retry_after_seconds=settings.OCR_READER_RETRY_SECONDS,
+                )
+    return _reader_pool
+
+
 class EasyOCREngine:
     """Adapter around EasyOCR with PDF/DOCX support and graceful degradation."""
 
     engine_id = "easyocr"
 
-    def __init__(self, languages: Sequence[str]) -> None:
-        self._languages = list(languages) or ["en"]
-        self._reader: "easyocr.Reader | None" = None  # type: ignore[name-defined]
-        self._lock = threading.Lock()
-        self._initialisation_failed = False
+    def __init__(
+        self,
+        languages: Sequence[str],
+        preprocess_mode: str | None = None,
+        reader_pool: EasyOCRReaderPool | None = None,
+    ) -> None:
+        self._languages = normalize_languages(languages) or ("en",)
+        self._batch_languages: LanguageKey = ()
+        self._preprocess_mode = ocr_preprocessing.normalize_mode(preprocess_mode or settings.OCR_PREPROCESS_MODE)
+        self._pool = reader_pool or get_reader_pool()
         self._status_callback: Callable[[str, dict[str, Any]], None] | None = None
+        self._embedded_sink: EmbeddedImageSink | None = None
+        self._embedded_seen: set[str] = set()
 
     @staticmethod
     def is_available() -> bool:
@@ -110,20 +434,41 @@ class EasyOCREngine:
     def set_status_callback(self, callback: Callable[[str, dict[str, Any]], None] | None) -> None:
         self._status_callback = callback
 
+    def set_embedded_image_sink(
+        self,
+        sink: EmbeddedImageSink | None,
+        known_hashes: Iterable[str] | None = None,
+    ) -> None:
+        """Forward each unique image embedded in DOCX/PDF files to ``sink`` (e.g. vision).
+
+        ``known_hashes`` seeds the batch-wide deduplication, typically with the SHA-256
+        of the photos uploaded alongside the documents.
+        """
+        self._embedded_sink = sink
+        self._embedded_seen = set(known_hashes or ())
+
+    def set_batch_languages(self, languages: Iterable[str] | None) -> None:
+        """Override the default language set for the files of the current batch."""
+        self._batch_languages = normalize_languages(languages)
+
+    def resolve_languages(self, file_meta: FileMetadata) -> LanguageKey:
+        return languages_from_metadata(file_meta.metadata) or self._batch_languages or self._languages
+
     def extract(self, file_meta: FileMetadata) -> OCRResult:
         path = Path(file_meta.stored_path)
         content_type = (file_meta.content_type or "").lower()
+        languages = self.resolve_languages(file_meta)
 
         try:
             if content_type.startswith("image/"):
-                return self._extract_image(path, file_meta.filename)
+                return self._extract_image(path, file_meta.filename, languages)
             if content_type == "application/pdf":
-                return self._extract_pdf(path, file_meta.filename)
+                return self._extract_pdf(path, file_meta.filename, languages)
             if content_type in {
                 "application/msword",
                 "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             }:
-                return self._extract_docx(path, file_meta.filename)
+                return self._extract_docx(path, file_meta.filename, languages)
             if content_type == "text/plain":
                 return self._extract_text_file(path, file_meta.filename)
             return OCRResult(
@@ -137,7 +482,7 @@ class EasyOCREngine:
             logger.error("OCR pipeline failed on %s: %s", file_meta.filename, exc)
             fallback_text = ""
             if content_type.startswith("image/"):
-                fallback_text = legacy_ocr.extract_text(path)
+                fallback_text = legacy_ocr.extract_text(path, legacy_ocr.tesseract_languages(languages))
             return OCRResult(
                 source_file=file_meta.filename,
                 text=fallback_text.strip(),
@@ -146,76 +491,42 @@ class EasyOCREngine:
                 error=str(exc),
             )
 
-    def _get_reader(self) -> "easyocr.Reader":  # type: ignore[name-defined]
-        if self._reader is not None:
-            return self._reader
-        if self._initialisation_failed:
-            raise RuntimeError("EasyOCR initialisation previously failed.")
-
+    def _checkout_reader(self, languages: LanguageKey | None = None) -> _PooledReader:
         if easyocr is None:
             raise RuntimeError("EasyOCR is not available in the current environment.")
 
-        with self._lock:
-            if self._reader is None:
-                logger.info(
-                    "Initialising EasyOCR reader for languages %s (gpu=off).",
-                    ", ".join(self._languages),
-                )
-                if self._status_callback:
-                    self._status_callback(
-                        "ocr:warmup:start",
-                        {
-                            "label": "Initialisation du moteur OCR (EasyOCR)",
-                            "languages": list(self._languages),
-                        },
-                    )
-                try:
-                    self._reader = easyocr.Reader(  # type: ignore[attr-defined]
-                        self._languages,
-                        gpu=False,
-                        download_enabled=settings.EASY_OCR_DOWNLOAD_ENABLED,
-                    )
-                    if self._status_callback:
-                        self._status_callback(
-                            "ocr:warmup:complete",
-                            {
-                                "label": "Moteur OCR initialisé",
-                                "languages": list(self._languages),
-                            },
-                        )
-                except Exception as exc:  # noqa: BLE001
-                    self._initialisation_failed = True
-                    logger.warning(
-                        "Unable to initialise EasyOCR (languages=%s): %s",
-                        ", ".join(self._languages),
-                        exc,
-                    )
-                    if self._status_callback:
-                        self._status_callback(
-                            "ocr:warmup:error",
-                            {
-                                "label": "Erreur lors du chargement EasyOCR",
-                                "languages": list(self._languages),
-                                "error": str(exc),
-                            },
-                        )
-                    raise
-        return self._reader
-
-    def _extract_image(self, path: Path, filename: str) -> OCRResult:
+        key = languages or self._languages
+        try:
+            return self._pool.checkout(key, self._status_callback)
+        except Exception:
+            if key == self._languages:
+                raise
+            logger.warning(
+                "Falling back to default OCR languages %s (requested %s).",
+                ", ".join(self._languages),
+                ", ".join(key),
+            )
+            return self._pool.checkout(self._languages, self._status_callback)
+
+    def _extract_image(self, path: Path, filename: str, languages: LanguageKey | None = None) -> OCRResult:
         if easyocr is None:
             logger.warning("EasyOCR not available, falling back to legacy for %s", filename)
-            text = legacy_ocr.extract_text(path)
+            text = legacy_ocr.extract_text(path, legacy_ocr.tesseract_languages(languages or self._languages))
             return OCRResult(source_file=filename, text=text.strip(), confidence=None, warnings=["easyocr-missing"])
 
-        image_input = self._prepare_image(path)
-        text, confidence = self._read_easyocr(image_input)
-        return OCRResult(source_file=filename, text=text, confidence=confidence, warnings=[])
+        image_input, plan = self._prepare_image(path)
+        text, confidence = self._read_easyocr(image_input, languages)
+        extra: dict[str, Any] = {"languages": list(languages or self._languages)}
+        if plan is not None:
+            extra["preprocessing"] = plan.as_dict()
+        return OCRResult(source_file=filename, text=text, confidence=confidence, warnings=[], extra=extra)
 
-    def _extract_pdf(self, path: Path, filename: str) -> OCRResult:
+    def _extract_pdf(self, path: Path, filename: str, languages: LanguageKey | None = None) -> OCRResult:
         warnings: list[str] = []
         collected: list[str] = []
         confidences: list[float] = []
+        rasterized_pages: set[int] = set()
+        extra: dict[str, Any] = {}
 
         if fitz is None:
             warnings.append("pymupdf-missing")
@@ -239,7 +550,8 @@ class EasyOCREngine:
                         image_input = np.array(image)
                     else:
                         image_input = image
-                    text, confidence = self._read_easyocr(image_input)
+                    text, confidence = self._read_easyocr(image_input, languages)
+                    rasterized_pages.add(index)
                     if text:
                         collected.append(text)
                     if confidence is not None:
@@ -248,6 +560,20 @@ class EasyOCREngine:
                     warnings.append(f"page-{index}:ocr-error")
                     logger.warning("OCR on PDF page %s failed (%s): %s", index, filename, exc)
 
+            # Pages OCR'd as a whole already cover their embedded images.
+            embedded_texts = self._process_embedded_images(
+                path,
+                filename,
+                "application/pdf",
+                languages,
+                warnings,
+                extra,
+                confidences,
+                document=document,
+                skip_pages=rasterized_pages,
+            )
+            collected.extend(embedded_texts)
+
         combined = "\n\n".join(text for text in collected if text).strip()
         if not combined:
             warnings.append("pdf-empty")
@@ -263,70 +589,117 @@ class EasyOCREngine:
             text=combined,
             confidence=confidence,
             warnings=warnings,
+            extra=extra,
         )
 
-    def _extract_docx(self, path: Path, filename: str) -> OCRResult:
-        warnings: list[str] = []
-        if Document is None:
-            warnings.append("python-docx-missing")
-            return OCRResult(source_file=filename, text="", confidence=None, warnings=warnings, error="python-docx-missing")
-
-        document = Document(str(path))
-        parts: list[str] = []
-
-        for paragraph in document.paragraphs:
-            text = paragraph.text.strip()
-            if text:
-                parts.append(text)
+    def _extract_docx(self, path: Path, filename: str, languages: LanguageKey | None = None) -> OCRResult:
+        result = _streamed_result(filename, text_extraction.extract_docx_text, path)
+        embedded_texts = self._process_embedded_images(
+            path,
+            filename,
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            languages,
+            result.warnings,
+            result.extra,
+            [],
+        )
+        if embedded_texts:
+            result.text = "\n\n".join(part for part in [result.text, *embedded_texts] if part)
+            result.confidence = result.confidence or 1.0
+        return result
+
+    def _process_embedded_images(
+        self,
+        path: Path,
+        filename: str,
+        content_type: str,
+        languages: LanguageKey | None,
+        warnings: list[str],
+        extra: dict[str, Any],
+        confidences: list[float],
+        *,
+        document: Any = None,
+        skip_pages: set[int] | None = None,
+    ) -> list[str]:
+        """OCR the unique images embedded in a DOCX/PDF and hand them to the embedded-image sink.
+
+        Images are decoded one at a time and released right after OCR/vision, so memory
+        stays bounded whatever the number of embedded images.
+        """
+        if not settings.OCR_EMBEDDED_IMAGES or not embedded_images.is_available():
+            return []
+
+        stats = embedded_images.EmbeddedImageStats()
+        seen = self._embedded_seen if self._embedded_sink is not None else set()
+        texts: list[str] = []
+        analysed = 0
+        too_small = 0
+        try:
+            for image in embedded_images.iter_embedded_images(
+                path,
+                filename,
+                content_type,
+                seen=seen,
+                stats=stats,
+                max_images=settings.OCR_EMBEDDED_IMAGES_MAX,
+                max_bytes=max(0, settings.OCR_EMBEDDED_IMAGE_MAX_MB) * 1024 * 1024,
+                skip_pages=skip_pages,
+                document=document,
+            ):
+                decoded = embedded_images.decode_image(image.data, settings.OCR_EMBEDDED_IMAGE_MIN_SIDE)
+                if decoded is None:
+                    too_small += 1
+                    continue
+                analysed += 1
 
-        for table in document.tables:
-            for row in table.rows:
-                cells = [cell.text.strip() for cell in row.cells if cell.text.strip()]
-                if cells:
-                    parts.append(" | ".join(cells))
+                if easyocr is not None:
+                    gray = cv2.cvtColor(decoded, cv2.COLOR_BGR2GRAY)
+                    processed, _ = ocr_preprocessing.preprocess(gray, self._preprocess_mode)
+                    text, confidence = self._read_easyocr(processed, languages)
+                    if text:
+                        texts.append(f"[{image.name}]\n{text}")
+                    if confidence is not None:
+                        confidences.append(confidence)
 
-        combined = "\n".join(parts).strip()
-        confidence = 1.0 if combined else None
+                if self._embedded_sink is not None:
+                    try:
+                        self._embedded_sink(image, decoded)
+                    except Exception as exc:  # noqa: BLE001
+                        logger.warning("Embedded image sink failed on %s: %s", image.label, exc)
+        except Exception as exc:  # noqa: BLE001
+            warnings.append("embedded-images-error")
+            logger.warning("Embedded image extraction failed (%s): %s", filename, exc)
 
-        return OCRResult(source_file=filename, text=combined, confidence=confidence, warnings=warnings)
+        if stats.found:
+            extra["embedded_images"] = {**stats.as_dict(), "analysed": analysed, "too_small": too_small}
+            warnings.extend(stats.warnings)
+            if analysed and easyocr is None:
+                warnings.append("embedded-images:easyocr-missing")
+        return texts
 
     def _extract_text_file(self, path: Path, filename: str) -> OCRResult:
-        try:
-            content = path.read_text(encoding="utf-8")
-            return OCRResult(source_file=filename, text=content.strip(), confidence=1.0 if content else None, warnings=[])
-        except UnicodeDecodeError:
-            logger.warning("UTF-8 decoding failed for %s, attempting binary fallback.", filename)
-            raw = path.read_bytes()
-            return OCRResult(
-                source_file=filename,
-                text=raw.decode("latin-1", errors="ignore").strip(),
-                confidence=None,
-                warnings=["text-decoding-latin1"],
-            )
+        return _streamed_result(filename, text_extraction.extract_plain_text, path)
 
-    def _prepare_image(self, path: Path) -> object:
-        if cv2 is None or np is None:
-            return str(path)
+    def _prepare_image(self, path: Path) -> tuple[object, "ocr_preprocessing.PreprocessPlan | None"]:
+        if not ocr_preprocessing.is_available():
+            return str(path), None
 
-        image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        image = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
         if image is None:
-            return str(path)
-
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        denoised = cv2.bilateralFilter(gray, 9, 75, 75)
-        processed = cv2.adaptiveThreshold(
-            denoised,
-            255,
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY,
-            31,
-            2,
+            return str(path), None
+
+        processed, plan = ocr_preprocessing.preprocess(image, self._preprocess_mode)
+        logger.debug(
+            "OCR preprocessing for %s: profile=%s (%.1f ms)",
+            path.name,
+            plan.profile,
+            plan.total_ms,
         )
-        return processed
+        return processed, plan
 
-    def _read_easyocr(self, image_input: object) -> tuple[str, float | None]:
-        reader = self._get_reader()
-        results = reader.readtext(image_input, detail=1, paragraph=True)  # type: ignore[attr-defined]
+    def _read_easyocr(self, image_input: object, languages: LanguageKey | None = None) -> tuple[str, float | None]:
+        with self._checkout_reader(languages) as reader:
+            results = reader.readtext(image_input, detail=1, paragraph=True)
 
         texts: list[str] = []
         confidences: list[float] = []
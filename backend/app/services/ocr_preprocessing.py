@@ -0,0 +1,187 @@
+"""Adaptive image preprocessing for OCR.
+
+The planner measures a few cheap quality indicators (noise, contrast, resolution)
+on a subsampled copy of the image and picks the lightest preprocessing profile
+that is likely to help EasyOCR. Clean screenshots skip denoising entirely, while
+noisy photos keep the historical bilateral + adaptive threshold treatment.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Any
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # noqa: BLE001
+    np = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional dependency
+    import cv2
+except Exception:  # noqa: BLE001
+    cv2 = None  # type: ignore[assignment]
+
+PROFILE_NONE = "none"
+PROFILE_FAST = "fast"
+PROFILE_FULL = "full"
+PROFILES: tuple[str, ...] = (PROFILE_NONE, PROFILE_FAST, PROFILE_FULL)
+MODE_AUTO = "auto"
+MODES: tuple[str, ...] = (MODE_AUTO, *PROFILES)
+
+# Quality measurements are taken on a copy whose long edge is at most this size.
+SAMPLE_MAX_EDGE = 512
+
+# Thresholds calibrated on test_audex_dataset (see scripts/benchmark_ocr_preprocessing.py).
+NOISE_FULL_THRESHOLD = 10.0
+NOISE_FAST_THRESHOLD = 4.5
+CONTRAST_LOW_THRESHOLD = 35.0
+MIN_SIDE_FOR_FULL = 400
+
+_NOISE_KERNEL = (
+    (1.0, -2.0, 1.0),
+    (-2.0, 4.0, -2.0),
+    (1.0, -2.0, 1.0),
+)
+
+
+@dataclass(slots=True)
+class ImageQuality:
+    width: int
+    height: int
+    noise_sigma: float
+    contrast: float
+
+    @property
+    def min_side(self) -> int:
+        return min(self.width, self.height)
+
+
+@dataclass(slots=True)
+class PreprocessPlan:
+    profile: str
+    quality: ImageQuality | None
+    forced: bool = False
+    assess_ms: float = 0.0
+    apply_ms: float = 0.0
+
+    @property
+    def total_ms(self) -> float:
+        return self.assess_ms + self.apply_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "profile": self.profile,
+            "forced": self.forced,
+            "assess_ms": round(self.assess_ms, 2),
+            "apply_ms": round(self.apply_ms, 2),
+            "total_ms": round(self.total_ms, 2),
+        }
+        if self.quality is not None:
+            payload.update(
+                {
+                    "width": self.quality.width,
+                    "height": self.quality.height,
+                    "noise_sigma": round(self.quality.noise_sigma, 2),
+                    "contrast": round(self.quality.contrast, 2),
+                }
+            )
+        return payload
+
+
+def is_available() -> bool:
+    return cv2 is not None and np is not None
+
+
+def normalize_mode(mode: str | None) -> str:
+    """Canonical preprocessing mode (``auto`` when unset); raises ``ValueError`` if unknown."""
+    normalized = (mode or MODE_AUTO).strip().lower()
+    if normalized not in MODES:
+        raise ValueError(f"Unsupported OCR preprocessing mode: {mode} (expected one of {', '.join(MODES)})")
+    return normalized
+
+
+def assess_quality(gray: "np.ndarray") -> ImageQuality:  # type: ignore[name-defined]
+    """Estimate noise (Immerkær) and RMS contrast on a strided sample of a grayscale image."""
+    height, width = gray.shape[:2]
+    step = max(1, max(height, width) // SAMPLE_MAX_EDGE)
+    sample = gray[::step, ::step]
+    sample_h, sample_w = sample.shape[:2]
+
+    noise_sigma = 0.0
+    if sample_h > 2 and sample_w > 2:
+        kernel = np.array(_NOISE_KERNEL, dtype=np.float32)
+        response = cv2.filter2D(sample, cv2.CV_32F, kernel)
+        total = float(np.abs(response[1:-1, 1:-1]).sum())
+        noise_sigma = total * math.sqrt(0.5 * math.pi) / (6.0 * (sample_w - 2) * (sample_h - 2))
+
+    contrast = float(sample.std())
+    return ImageQuality(width=int(width), height=int(height), noise_sigma=noise_sigma, contrast=contrast)
+
+
+def choose_profile(quality: ImageQuality) -> str:
+    if quality.noise_sigma >= NOISE_FULL_THRESHOLD:
+        # Bilateral filtering smears glyphs on small images; a light blur is enough there.
+        if quality.min_side < MIN_SIDE_FOR_FULL:
+            return PROFILE_FAST
+        return PROFILE_FULL
+    if quality.noise_sigma >= NOISE_FAST_THRESHOLD or quality.contrast < CONTRAST_LOW_THRESHOLD:
+        return PROFILE_FAST
+    return PROFILE_NONE
+
+
+def apply_profile(gray: "np.ndarray", profile: str) -> "np.ndarray":  # type: ignore[name-defined]
+    if profile == PROFILE_NONE:
+        return gray
+    if profile == PROFILE_FAST:
+        blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+        return cv2.adaptiveThreshold(
+            blurred,
+            255,
+            cv2.ADAPTIVE_THRESH_MEAN_C,
+            cv2.THRESH_BINARY,
+            31,
+            5,
+        )
+    if profile == PROFILE_FULL:
+        denoised = cv2.bilateralFilter(gray, 9, 75, 75)
+        return cv2.adaptiveThreshold(
+            denoised,
+            255,
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY,
+            31,
+            2,
+        )
+    raise ValueError(f"Unknown OCR preprocessing profile: {profile}")
+
+
+def preprocess(gray: "np.ndarray", mode: str = "auto") -> tuple["np.ndarray", PreprocessPlan]:  # type: ignore[name-defined]
+    """Plan and apply preprocessing. ``mode`` is ``auto`` or one of :data:`PROFILES`.
+
+    Image quality is only measured in ``auto`` mode; a forced profile is applied as is.
+    """
+    mode = normalize_mode(mode)
+
+    quality: ImageQuality | None = None
+    assess_ms = 0.0
+    if mode == MODE_AUTO:
+        start = time.perf_counter()
+        quality = assess_quality(gray)
+        profile = choose_profile(quality)
+        assess_ms = (time.perf_counter() - start) * 1000
+    else:
+        profile = mode
+
+    start = time.perf_counter()
+    processed = apply_profile(gray, profile)
+    apply_ms = (time.perf_counter() - start) * 1000
+
+    return processed, PreprocessPlan(
+        profile=profile,
+        quality=quality,
+        forced=mode != MODE_AUTO,
+        assess_ms=assess_ms,
+        apply_ms=apply_ms,
+    )
@@ -0,0 +1,147 @@
+"""Client for a local Ollama-compatible ``/api/generate`` endpoint.
+
+Used by :class:`app.services.report_summary.ReportSummaryService` as the summary
+fallback when Gemini is unavailable. One pooled ``httpx.Client`` per base URL keeps
+connections alive between summaries, and a semaphore bounds concurrent generations so
+several batches falling back at once do not overload the local model.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any, Callable, Mapping
+
+import httpx
+
+from app.core.config import settings
+
+logger = getLogger(__name__)
+
+MODEL_PREFIX = "ollama/"
+
+
+class OllamaBusyError(RuntimeError):
+    """Raised when no generation slot frees up before the wait timeout."""
+
+
+@dataclass(slots=True)
+class OllamaCompletion:
+    text: str
+    model: str
+    duration_ms: int
+    first_token_ms: int | None = None
+    prompt_tokens: int | None = None
+    output_tokens: int | None = None
+
+
+def model_name(identifier: str) -> str:
+    """``"ollama/llama3.1"`` → ``"llama3.1"`` (the prefix only tags the provider in settings)."""
+    return identifier[len(MODEL_PREFIX):] if identifier.startswith(MODEL_PREFIX) else identifier
+
+
+class OllamaClient:
+    """Thread-safe streaming client with bounded concurrency."""
+
+    def __init__(self, base_url: str, *, timeout: float = 60.0, max_concurrency: int = 1) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._http = httpx.Client(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(timeout, connect=min(5.0, timeout)),
+            limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+        )
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        *,
+        options: Mapping[str, Any] | None = None,
+        json_format: bool = True,
+        on_chunk: Callable[[str], None] | None = None,
+    ) -> OllamaCompletion:
+        """Stream a completion, passing each text chunk to ``on_chunk``; return the full text."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise OllamaBusyError(f"no local generation slot within {self.timeout:.0f}s")
+        try:
+            return self._generate(model_name(model), prompt, options, json_format, on_chunk)
+        finally:
+            self._slots.release()
+
+    def _generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Mapping[str, Any] | None,
+        json_format: bool,
+        on_chunk: Callable[[str], None] | None,
+    ) -> OllamaCompletion:
+        payload: dict[str, Any] = {"model": model, "prompt": prompt, "stream": True}
+        if json_format:
+            payload["format"] = "json"
+        if options:
+            payload["options"] = dict(options)
+
+        start = time.perf_counter()
+        first_token_ms: int | None = None
+        parts: list[str] = []
+        final: dict[str, Any] = {}
+        with self._http.stream("POST", "/api/generate", json=payload) as response:
+            if response.status_code >= 400:
+                response.read()
+                raise RuntimeError(f"Ollama HTTP {response.status_code}: {response.text[:200]}")
+            # NDJSON: one {"response": "...", "done": false} object per line, stats on the last one.
+            for line in response.iter_lines():
+                if not line.strip():
+                    continue
+                message = json.loads(line)
+                if message.get("error"):
+                    raise RuntimeError(f"Ollama error: {message['error']}")
+                chunk = message.get("response") or ""
+                if chunk:
+                    if first_token_ms is None:
+                        first_token_ms = int((time.perf_counter() - start) * 1000)
+                    parts.append(chunk)
+                    if on_chunk is not None:
+                        on_chunk(chunk)
+                if message.get("done"):
+                    final = message
+                    break
+        if not final:
+            raise RuntimeError("Ollama stream ended before completion.")
+        return OllamaCompletion(
+            text="".join(parts),
+            model=model,
+            duration_ms=int((time.perf_counter() - start) * 1000),
+            first_token_ms=first_token_ms,
+            prompt_tokens=final.get("prompt_eval_count"),
+            output_tokens=final.get("eval_count"),
+        )
+
+    def close(self) -> None:
+        self._http.close()
+
+
+_clients: dict[str, OllamaClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_ollama_client(base_url: str | None = None) -> OllamaClient:
+    """Process-wide client for ``base_url`` (``SUMMARY_FALLBACK_URL`` by default)."""
+    base_url = (base_url or settings.SUMMARY_FALLBACK_URL).rstrip("/")
+    with _clients_lock:
+        client = _clients.get(base_url)
+        if client is None:
+            client = OllamaClient(
+                base_url,
+                timeout=settings.SUMMARY_FALLBACK_TIMEOUT_SECONDS,
+                max_concurrency=settings.SUMMARY_FALLBACK_MAX_CONCURRENCY,
+            )
+            _clients[base_url] = client
+        return client
@@ -7,7 +7,7 @@ from typing import Any, Callable, Iterable, List, Sequence
 
 from app.pipelines.models import OCRResult, Observation, PipelineResult
 from app.services.scoring import RiskScorer
-from app.services.ocr_engine import get_ocr_engine
+from app.services.ocr_engine import get_ocr_engine, languages_from_metadata
 from app.services.vision_engine import get_vision_engine
 from app.services.advanced_analyzer import AdvancedAnalyzer
 from app.services.report_summary import ReportSummaryService, SummaryRequest
@@ -79,251 +79,323 @@ class IngestionPipeline:
             except Exception as exc:  # noqa: BLE001
                 logger.debug("Unable to attach OCR status callback: %s", exc)
 
-        if progress:
-            progress(
-                "analysis:start",
-                {
-                    "label": "Analyse OCR & vision démarrée",
-                    "fileCount": total_files,
-                    "progress": 25,
-                },
-            )
+        # Batch languages first: prefetched OCR work is submitted with the resolved languages.
+        batch_languages_setter = getattr(self._ocr_engine, "set_batch_languages", None)
+        if callable(batch_languages_setter):
+            batch_languages_setter(self._batch_ocr_languages(file_list) or None)
 
-        status_interval = 30.0
-        last_status_update = time.monotonic() - status_interval
+        ocr_prefetch = getattr(self._ocr_engine, "prefetch", None)
+        if callable(ocr_prefetch):
+            try:
+                ocr_prefetch(file_list)
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("Unable to prefetch OCR work: %s", exc)
+
+        # Images embedded in DOCX/PDF files are streamed out by the OCR engine and
+        # analysed by the vision engine in the same pass.
+        current_zone: dict[str, str | None] = {"zone": None}
+        detect_embedded = getattr(self._vision_engine, "detect_image", None)
+
+        def on_embedded_image(image: Any, decoded: Any) -> None:
+            found = detect_embedded(decoded, image.label, zone=current_zone["zone"])
+            for observation in found:
+                observation.extra.setdefault("embedded_in", image.source_file)
+                observation.extra.setdefault("image_sha256", image.sha256)
+            observations.extend(found)
+
+        embedded_sink_setter = getattr(self._ocr_engine, "set_embedded_image_sink", None)
+        if not callable(detect_embedded):
+            embedded_sink_setter = None
+        if callable(embedded_sink_setter):
+            embedded_sink_setter(
+                on_embedded_image,
+                known_hashes=[meta.checksum_sha256 for meta in file_list if meta.content_type.startswith("image/")],
+            )
 
-        for index, file_meta in enumerate(file_list, start=1):
+        # The OCR engine is shared across runs: detach this batch's hooks even when a stage fails.
+        try:
             if progress:
-                ratio = min(max(index / max(total_files, 1), 0.0), 1.0)
-                vision_progress = 30 + int(15 * ratio)
-                ocr_progress = 50 + int(15 * ratio)
                 progress(
-                    "vision:start",
+                    "analysis:start",
                     {
-                        "label": f"Analyse visuelle de {file_meta.filename}",
-                        "file": file_meta.filename,
-                        "position": index,
-                        "total": total_files,
-                        "progress": max(25, vision_progress - 5),
+                        "label": "Analyse OCR & vision démarrée",
+                        "fileCount": total_files,
+                        "progress": 25,
                     },
                 )
 
-            path = Path(file_meta.stored_path)
-            is_image = file_meta.content_type.startswith("image/")
+            status_interval = 30.0
+            last_status_update = time.monotonic() - status_interval
 
-            logger.debug(
-                "Processing file %s [%s] (image=%s)",
-                file_meta.filename,
-                file_meta.content_type,
-                is_image,
-            )
+            for index, file_meta in enumerate(file_list, start=1):
+                if progress:
+                    ratio = min(max(index / max(total_files, 1), 0.0), 1.0)
+                    vision_progress = 30 + int(15 * ratio)
+                    ocr_progress = 50 + int(15 * ratio)
+                    progress(
+                        "vision:start",
+                        {
+                            "label": f"Analyse visuelle de {file_meta.filename}",
+                            "file": file_meta.filename,
+                            "position": index,
+                            "total": total_files,
+                            "progress": max(25, vision_progress - 5),
+                        },
+                    )
+
+                path = Path(file_meta.stored_path)
+                is_image = file_meta.content_type.startswith("image/")
+
+                logger.debug(
+                    "Processing file %s [%s] (image=%s)",
+                    file_meta.filename,
+                    file_meta.content_type,
+                    is_image,
+                )
 
-            if is_image:
                 metadata = file_meta.metadata or {}
                 zone_name = metadata.get("zone") or metadata.get("area") or metadata.get("location")
                 if isinstance(zone_name, str):
                     zone_value = zone_name
                 else:
                     zone_value = None
+                current_zone["zone"] = zone_value
+
+                if is_image:
+                    observations.extend(self._vision_engine.detect(path, zone=zone_value))
+                    if progress:
+                        progress(
+                            "vision:complete",
+                            {
+                                "label": f"Analyse visuelle terminée ({file_meta.filename})",
+                                "file": file_meta.filename,
+                                "position": index,
+                                "total": total_files,
+                                "progress": vision_progress,
+                            },
+                        )
+                else:
+                    if progress:
+                        progress(
+                            "vision:complete",
+                            {
+                                "label": f"Aucune analyse visuelle requise ({file_meta.filename})",
+                                "file": file_meta.filename,
+                                "position": index,
+                                "total": total_files,
+                                "progress": vision_progress,
+                            },
+                        )
 
-                observations.extend(self._vision_engine.detect(path, zone=zone_value))
                 if progress:
                     progress(
-                        "vision:complete",
+                        "ocr:start",
+                        {
+                            "label": f"OCR en cours ({file_meta.filename})",
+                            "file": file_meta.filename,
+                            "position": index,
+                            "total": total_files,
+                            "progress": max(vision_progress, ocr_progress - 5),
+                        },
+                    )
+
+                ocr_result = self._ocr_engine.extract(file_meta)
+                ocr_texts.append(ocr_result)
+
+                if ocr_result.error and progress:
+                    progress(
+                        "ocr:error",
                         {
-                            "label": f"Analyse visuelle terminée ({file_meta.filename})",
+                            "label": f"Erreur OCR ({file_meta.filename})",
                             "file": file_meta.filename,
                             "position": index,
                             "total": total_files,
-                            "progress": vision_progress,
+                            "progress": ocr_progress,
+                            "error": ocr_result.error,
                         },
                     )
-            else:
+
                 if progress:
                     progress(
-                        "vision:complete",
+                        "ocr:complete",
                         {
-                            "label": f"Aucune analyse visuelle requise ({file_meta.filename})",
+                            "label": f"OCR terminé ({file_meta.filename})",
                             "file": file_meta.filename,
                             "position": index,
                             "total": total_files,
-                            "progress": vision_progress,
+                            "progress": ocr_progress,
+                            "confidence": ocr_result.confidence,
+                            "warnings": ocr_result.warnings or None,
+                            "preprocessing": ocr_result.extra.get("preprocessing"),
+                            "embeddedImages": ocr_result.extra.get("embedded_images"),
                         },
                     )
 
+                    now = time.monotonic()
+                    if now - last_status_update >= status_interval:
+                        progress(
+                            "analysis:status",
+                            {
+                                "label": f"Analyse en cours ({file_meta.filename})",
+                                "file": file_meta.filename,
+                                "position": index,
+                                "total": total_files,
+                                "progress": max(ocr_progress, 55),
+                            },
+                        )
+                        last_status_update = now
+
+                time.sleep(0.2)
+
             if progress:
                 progress(
-                    "ocr:start",
+                    "analysis:complete",
                     {
-                        "label": f"OCR en cours ({file_meta.filename})",
-                        "file": file_meta.filename,
-                        "position": index,
-                        "total": total_files,
-                        "progress": max(vision_progress, ocr_progress - 5),
+                        "label": "Analyse OCR & vision terminée",
+                        "observationCount": len(observations),
+                        "progress": 70,
                     },
                 )
+                self._sleep(SIMULATED_ANALYSIS_DELAY_SECONDS)
 
-            ocr_result = self._ocr_engine.extract(file_meta)
-            ocr_texts.append(ocr_result)
+            logger.info("Vision/OCR completed for batch %s (observations=%d)", batch_id, len(observations))
 
-            if ocr_result.error and progress:
+            risk = self.scorer.score(batch_id, observations) if observations else None
+
+            if progress:
                 progress(
-                    "ocr:error",
+                    "scoring:complete",
                     {
-                        "label": f"Erreur OCR ({file_meta.filename})",
-                        "file": file_meta.filename,
-                        "position": index,
-                        "total": total_files,
-                        "progress": ocr_progress,
-                        "error": ocr_result.error,
+                        "label": "Calcul du score de risque effectué",
+                        "hasRisk": risk is not None,
+                        "score": getattr(risk, "total_score", None) if risk else None,
+                        "progress": 85,
                     },
                 )
+                self._sleep(SIMULATED_SCORING_DELAY_SECONDS)
+
+            local_observations = list(observations)
+
+            image_files_with_zone: list[tuple[Path, str | None]] = []
+            for meta in file_list:
+                if meta.content_type.startswith("image/"):
+                    zone_name = None
+                    site_type = None
+                    if meta.metadata:
+                        zone_name = (
+                            meta.metadata.get("zone")
+                            or meta.metadata.get("area")
+                            or meta.metadata.get("location")
+                        )
+                        site_type = meta.metadata.get("site_type") or meta.metadata.get("siteType")
+                    image_files_with_zone.append(
+                        (
+                            Path(meta.stored_path),
+                            zone_name if isinstance(zone_name, str) else None,
+                            site_type if isinstance(site_type, str) else None,
+                        )
+                    )
+
+            gemini_result = self._advanced_analyzer.analyze(batch_id, image_files_with_zone)
+            gemini_observations = gemini_result.observations
+
+            logger.info(
+                "Advanced analyzer completed for batch %s (status=%s, obs=%d, warnings=%d)",
+                batch_id,
+                gemini_result.status,
+                len(gemini_observations),
+                len(gemini_result.warnings),
+            )
 
             if progress:
                 progress(
-                    "ocr:complete",
+                    "gemini:complete",
                     {
-                        "label": f"OCR terminé ({file_meta.filename})",
-                        "file": file_meta.filename,
-                        "position": index,
-                        "total": total_files,
-                        "progress": ocr_progress,
-                        "confidence": ocr_result.confidence,
-                        "warnings": ocr_result.warnings or None,
+                        "label": "Analyse avancée Gemini terminée",
+                        "status": gemini_result.status,
+                        "cacheHits": gemini_result.cache_hits,
+                        "cacheMisses": gemini_result.cache_misses,
+                        "upload": gemini_result.upload_stats,
+                        "progress": 87,
                     },
                 )
 
-                now = time.monotonic()
-                if now - last_status_update >= status_interval:
-                    progress(
-                        "analysis:status",
-                        {
-                            "label": f"Analyse en cours ({file_meta.filename})",
-                            "file": file_meta.filename,
-                            "position": index,
-                            "total": total_files,
-                            "progress": max(ocr_progress, 55),
-                        },
-                    )
-                    last_status_update = now
-
-            time.sleep(0.2)
-
-        if progress:
-            progress(
-                "analysis:complete",
-                {
-                    "label": "Analyse OCR & vision terminée",
-                    "observationCount": len(observations),
-                    "progress": 70,
-                },
-            )
-            self._sleep(SIMULATED_ANALYSIS_DELAY_SECONDS)
-
-        logger.info("Vision/OCR completed for batch %s (observations=%d)", batch_id, len(observations))
+            combined_observations = local_observations + gemini_observations
 
-        risk = self.scorer.score(batch_id, observations) if observations else None
+            def on_summary_delta(delta: str, text: str) -> None:
+                emit("summary:delta", {"label": "Synthèse IA en cours de rédaction", "delta": delta, "text": text})
 
-        if progress:
-            progress(
-                "scoring:complete",
-                {
-                    "label": "Calcul du score de risque effectué",
-                    "hasRisk": risk is not None,
-                    "score": getattr(risk, "total_score", None) if risk else None,
-                    "progress": 85,
-                },
+            summary_result = self._summary_service.generate(
+                SummaryRequest(
+                    batch_id=batch_id,
+                    risk=risk,
+                    observations_local=local_observations,
+                    observations_gemini=gemini_observations,
+                    ocr_texts=ocr_texts,
+                ),
+                on_delta=on_summary_delta if progress else None,
             )
-            self._sleep(SIMULATED_SCORING_DELAY_SECONDS)
-
-        local_observations = list(observations)
-
-        image_files_with_zone: list[tuple[Path, str | None]] = []
-        for meta in file_list:
-            if meta.content_type.startswith("image/"):
-                zone_name = None
-                site_type = None
-                if meta.metadata:
-                    zone_name = (
-                        meta.metadata.get("zone")
-                        or meta.metadata.get("area")
-                        or meta.metadata.get("location")
-                    )
-                    site_type = meta.metadata.get("site_type") or meta.metadata.get("siteType")
-                image_files_with_zone.append(
-                    (
-                        Path(meta.stored_path),
-                        zone_name if isinstance(zone_name, str) else None,
-                        site_type if isinstance(site_type, str) else None,
-                    )
-                )
-
-        gemini_result = self._advanced_analyzer.analyze(batch_id, image_files_with_zone)
-        gemini_observations = gemini_result.observations
-
-        logger.info(
-            "Advanced analyzer completed for batch %s (status=%s, obs=%d, warnings=%d)",
-            batch_id,
-            gemini_result.status,
-            len(gemini_observations),
-            len(gemini_result.warnings),
-        )
 
-        combined_observations = local_observations + gemini_observations
+            if progress:
+                progress(
+                    "summary:complete",
+                    {
+                        "label": "Synthèse IA générée",
+                        "status": summary_result.status,
+                        "firstTextMs": summary_result.first_text_ms,
+                        "cached": summary_result.cached,
+                        "progress": 90,
+                    },
+                )
+                self._sleep(SIMULATED_SUMMARY_DELAY_SECONDS)
 
-        summary_result = self._summary_service.generate(
-            SummaryRequest(
+            result = PipelineResult(
                 batch_id=batch_id,
-                risk=risk,
+                observations=combined_observations,
+                ocr_texts=ocr_texts,
+                ocr_engine=self._ocr_engine_name,
                 observations_local=local_observations,
                 observations_gemini=gemini_observations,
-                ocr_texts=ocr_texts,
-            )
-        )
-
-        if progress:
-            progress(
-                "summary:complete",
-                {
-                    "label": "Synthèse IA générée",
-                    "status": summary_result.status,
-                    "progress": 90,
-                },
+                gemini_summary=gemini_result.summary,
+                gemini_status=gemini_result.status,
+                gemini_warnings=gemini_result.warnings or None,
+                gemini_prompt_hash=gemini_result.prompt_hash,
+                gemini_duration_ms=gemini_result.duration_ms,
+                gemini_payloads=gemini_result.payloads or None,
+                gemini_model=gemini_result.model,
+                gemini_provider=gemini_result.provider,
+                gemini_prompt_version=gemini_result.prompt_version,
+            gemini_cache_hits=gemini_result.cache_hits,
+            gemini_cache_misses=gemini_result.cache_misses,
+                risk=risk,
+                summary_text=summary_result.text,
+                summary_status=summary_result.status,
+                summary_source=summary_result.source,
+                summary_findings=summary_result.findings,
+                summary_recommendations=summary_result.recommendations,
+                summary_prompt_hash=summary_result.prompt_hash,
+                summary_response_hash=summary_result.response_hash,
+                summary_duration_ms=summary_result.duration_ms,
+                summary_warnings=summary_result.warnings or None,
             )
-            self._sleep(SIMULATED_SUMMARY_DELAY_SECONDS)
-
-        result = PipelineResult(
-            batch_id=batch_id,
-            observations=combined_observations,
-            ocr_texts=ocr_texts,
-            ocr_engine=self._ocr_engine_name,
-            observations_local=local_observations,
-            observations_gemini=gemini_observations,
-            gemini_summary=gemini_result.summary,
-            gemini_status=gemini_result.status,
-            gemini_warnings=gemini_result.warnings or None,
-            gemini_prompt_hash=gemini_result.prompt_hash,
-            gemini_duration_ms=gemini_result.duration_ms,
-            gemini_payloads=gemini_result.payloads or None,
-            gemini_model=gemini_result.model,
-            gemini_provider=gemini_result.provider,
-            gemini_prompt_version=gemini_result.prompt_version,
-            risk=risk,
-            summary_text=summary_result.text,
-            summary_status=summary_result.status,
-            summary_source=summary_result.source,
-            summary_findings=summary_result.findings,
-            summary_recommendations=summary_result.recommendations,
-            summary_prompt_hash=summary_result.prompt_hash,
-            summary_response_hash=summary_result.response_hash,
-            summary_duration_ms=summary_result.duration_ms,
-            summary_warnings=summary_result.warnings or None,
-        )
-
-        if callable(ocr_status_callback):
-            try:
-                ocr_status_callback(None)
-            except Exception as exc:  # noqa: BLE001
-                logger.debug("Unable to reset OCR status callback: %s", exc)
+        finally:
+            if callable(ocr_status_callback):
+                try:
+                    ocr_status_callback(None)
+                except Exception as exc:  # noqa: BLE001
+                    logger.debug("Unable to reset OCR status callback: %s", exc)
+            if callable(batch_languages_setter):
+                batch_languages_setter(None)
+            if callable(embedded_sink_setter):
+                embedded_sink_setter(None)
 
         return result
+
+    @staticmethod
+    def _batch_ocr_languages(files: Sequence[FileMetadata]) -> list[str]:
+        languages: list[str] = []
+        for meta in files:
+            for language in languages_from_metadata(meta.metadata):
+                if language not in languages:
+                    languages.append(language)
+        return languages
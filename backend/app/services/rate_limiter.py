@@ -0,0 +1,129 @@
+"""Process-wide request/token rate limiting for external AI providers."""
+
+from __future__ import annotations
+
+import threading
+import time
+from logging import getLogger
+from typing import Callable
+
+from app.core.config import settings
+
+logger = getLogger(__name__)
+
+# Gemini bills an inline image as a fixed number of input tokens.
+GEMINI_IMAGE_TOKENS = 258
+_POLL_SECONDS = 0.25
+
+
+class RateLimitTimeout(TimeoutError):
+    """Raised when capacity does not free up before the caller's deadline."""
+
+
+class _Bucket:
+    __slots__ = ("capacity", "rate", "level")
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+
+    def refill(self, elapsed: float) -> None:
+        self.level = min(self.capacity, self.level + elapsed * self.rate)
+
+    def wait_for(self, amount: float) -> float:
+        missing = amount - self.level
+        return 0.0 if missing <= 0 else missing / self.rate
+
+
+class TokenBucketRateLimiter:
+    """Requests-per-minute and tokens-per-minute token buckets shared by all threads.
+
+    ``penalize`` blocks every caller until a server-provided retry delay has elapsed,
+    so one quota hint throttles the whole process instead of a single request.
+    A limit of ``0`` disables the corresponding bucket.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int = 0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._requests = _Bucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = _Bucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._updated = clock()
+        self._blocked_until = 0.0
+
+    def _refill_locked(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._updated = now
+        for bucket in (self._requests, self._tokens):
+            if bucket is not None:
+                bucket.refill(elapsed)
+
+    def acquire(self, tokens: int = 0, timeout: float | None = None) -> float:
+        """Block until one request (and ``tokens`` tokens) may be sent; return the time waited."""
+        start = self._clock()
+        deadline = start + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill_locked(now)
+                token_amount = min(float(tokens), self._tokens.capacity) if self._tokens else 0.0
+                wait = max(
+                    self._blocked_until - now,
+                    self._requests.wait_for(1.0) if self._requests else 0.0,
+                    self._tokens.wait_for(token_amount) if self._tokens else 0.0,
+                )
+                if wait <= 0:
+                    if self._requests is not None:
+                        self._requests.level -= 1.0
+                    if self._tokens is not None:
+                        self._tokens.level -= token_amount
+                    return now - start
+            if deadline is not None and now + wait > deadline:
+                raise RateLimitTimeout(f"rate limit capacity unavailable for {wait:.1f}s")
+            self._sleep(min(wait, _POLL_SECONDS))
+
+    def penalize(self, seconds: float) -> None:
+        """Hold back every caller for ``seconds`` (server retry hint)."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            until = self._clock() + seconds
+            if until > self._blocked_until:
+                self._blocked_until = until
+                logger.info("Rate limiter paused for %.1fs (provider quota hint).", seconds)
+
+    def settle(self, reserved: int, actual: int | None) -> None:
+        """Correct the token bucket once the real usage of a request is known."""
+        if self._tokens is None or actual is None:
+            return
+        with self._lock:
+            self._tokens.level = min(self._tokens.capacity, self._tokens.level + reserved - actual)
+
+
+def estimate_gemini_tokens(prompt: str, images: int = 1) -> int:
+    """Rough input-token estimate (≈4 characters per token plus fixed image cost)."""
+    return len(prompt) // 4 + images * GEMINI_IMAGE_TOKENS
+
+
+_gemini_limiter: TokenBucketRateLimiter | None = None
+_gemini_limiter_lock = threading.Lock()
+
+
+def get_gemini_rate_limiter() -> TokenBucketRateLimiter:
+    global _gemini_limiter  # noqa: PLW0603
+    with _gemini_limiter_lock:
+        if _gemini_limiter is None:
+            _gemini_limiter = TokenBucketRateLimiter(
+                settings.GEMINI_RPM_LIMIT,
+                settings.GEMINI_TPM_LIMIT,
+            )
+        return _gemini_limiter
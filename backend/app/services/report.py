@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import csv
 import hashlib
-from dataclasses import dataclass
+import io
+import json
+import os
+from logging import getLogger
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable, Sequence
+from typing import Any, Callable, Iterable, Sequence
+from xml.sax.saxutils import escape
 
+try:  # pragma: no cover - optional dependency
+    import fitz  # type: ignore[attr-defined]
+except Exception:  # noqa: BLE001
+    fitz = None  # type: ignore[assignment]
+
+from reportlab.graphics.shapes import Drawing
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER
 from reportlab.lib.pagesizes import A4
@@ -22,6 +34,18 @@ from reportlab.platypus import (
 )
 
 from app.pipelines.models import OCRResult, Observation, PipelineResult, RiskBreakdown, RiskScore
+from app.services.content_store import ContentStore, HashingWriter
+from app.services.report_charts import SEVERITY_ORDER, risk_bar_chart, severity_chart, severity_counts
+from app.services.thumbnails import (
+    DEFAULT_THUMBNAIL_EDGE,
+    THUMBNAIL_DIRNAME,
+    AnnotatedBox,
+    Thumbnail,
+    ThumbnailCache,
+    boxes_by_file,
+)
+
+logger = getLogger(__name__)
 
 
 TIMELINE_BUSINESS_STEPS: list[dict[str, Any]] = [
@@ -55,7 +79,7 @@ TIMELINE_BUSINESS_STEPS: list[dict[str, Any]] = [
     {
         "id": "evaluation",
         "label": "Évaluation & synthèse",
-        "codes": {"scoring:complete", "summary:complete"},
+        "codes": {"scoring:complete", "gemini:complete", "summary:complete"},
     },
     {
         "id": "report",
@@ -76,6 +100,7 @@ TIMELINE_STAGE_FALLBACK: dict[str, str] = {
     "ocr": "analysis",
     "analysis": "analysis",
     "scoring": "evaluation",
+    "gemini": "evaluation",
     "summary": "evaluation",
     "report": "report",
     "pipeline": "incident",
@@ -108,6 +133,43 @@ STATUS_LABELS: dict[str, str] = {
     "unknown": "Statut inconnu",
 }
 
+# Sections rendered as independent PDF fragments, in document order. Each one starts
+# on a new page, so concatenating the fragments gives the same layout as one build.
+REPORT_SECTIONS: tuple[str, ...] = (
+    "cover",
+    "dashboard",
+    "timeline",
+    "summary",
+    "observations",
+    "ocr",
+    "technical_timeline",
+    "annexes",
+)
+# Bump when the layout of a section changes, to invalidate cached fragments.
+SECTION_LAYOUT_VERSION = "3"
+SECTION_CACHE_DIRNAME = "sections"
+# Rendered PDFs are stored once per content hash; report-<batch>.pdf links to its blob.
+REPORT_STORE_DIRNAME = "store"
+# Stages about the report itself: a report cannot show its own generation, and the stored
+# timeline only gains them after the first render, which would change the section keys.
+REPORT_STAGE_PREFIX = "report:"
+# PyMuPDF output options: garbage-collected, compressed and without a random /ID (deterministic bytes).
+PDF_SAVE_OPTIONS: dict[str, Any] = {"garbage": 3, "deflate": True, "no_new_id": True}
+OCR_EXCERPT_COUNT = 5
+OCR_EXCERPT_CHARS = 160
+
+# Large batches: observations grouped per (file, label), tables split into chunks so
+# ReportLab never lays out one huge table, full detail in a CSV attached to the PDF.
+DEFAULT_LARGE_BATCH_THRESHOLD = 1000
+DEFAULT_MAX_TABLE_ROWS = 500
+TABLE_CHUNK_ROWS = 40
+OBSERVATION_CSV_COLUMNS: tuple[str, ...] = ("file", "label", "severity", "confidence", "source", "zone", "bbox")
+
+# Annotated thumbnails of the photos with the most severe detections (0 = none).
+DEFAULT_MAX_THUMBNAILS = 6
+THUMBNAIL_COLUMNS = 2
+THUMBNAIL_DISPLAY_WIDTH = 8 * cm
+
 _TIMELINE_STAGE_LOOKUP: dict[str, dict[str, Any]] = {}
 for entry in TIMELINE_BUSINESS_STEPS:
     for code in entry["codes"]:
@@ -141,15 +203,103 @@ class ReportContext:
 class ReportArtifact:
     path: Path
     checksum_sha256: str
+    reused_sections: tuple[str, ...] = field(default_factory=tuple)
+    detail_csv: Path | None = None
+    deduplicated: bool = False
+
+
+@dataclass(slots=True)
+class ObservationGroup:
+    source_file: str
+    label: str
+    count: int
+    severity: str
+    max_confidence: float
+    mean_confidence: float
+
+
+def _severity_rank(severity: str | None) -> int:
+    value = (severity or "").lower()
+    return SEVERITY_ORDER.index(value) if value in SEVERITY_ORDER else len(SEVERITY_ORDER)
+
+
+def group_observations(observations: Iterable[Observation]) -> list[ObservationGroup]:
+    """One row per (file, label), worst severity first, then the most frequent."""
+    groups: dict[tuple[str, str], list[Any]] = {}
+    for obs in observations:
+        key = (obs.source_file, obs.label)
+        confidence = float(obs.confidence or 0.0)
+        entry = groups.get(key)
+        if entry is None:
+            groups[key] = [1, obs.severity, confidence, confidence]
+            continue
+        entry[0] += 1
+        if _severity_rank(obs.severity) < _severity_rank(entry[1]):
+            entry[1] = obs.severity
+        entry[2] = max(entry[2], confidence)
+        entry[3] += confidence
+    rows = [
+        ObservationGroup(
+            source_file=source_file,
+            label=label,
+            count=count,
+            severity=severity or "unknown",
+            max_confidence=max_confidence,
+            mean_confidence=total / count,
+        )
+        for (source_file, label), (count, severity, max_confidence, total) in groups.items()
+    ]
+    rows.sort(key=lambda group: (_severity_rank(group.severity), -group.count, group.source_file, group.label))
+    return rows
+
+
+def write_observations_csv(observations: Iterable[Observation], destination: Path) -> int:
+    """Write one CSV row per observation; return the row count."""
+    count = 0
+    temp = destination.with_suffix(".tmp")
+    with temp.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(OBSERVATION_CSV_COLUMNS)
+        for obs in observations:
+            extra = obs.extra if isinstance(obs.extra, dict) else {}
+            writer.writerow(
+                [
+                    obs.source_file,
+                    obs.label,
+                    obs.severity,
+                    f"{obs.confidence:.4f}",
+                    extra.get("source", "local"),
+                    extra.get("zone", ""),
+                    " ".join(str(value) for value in obs.bbox) if obs.bbox else "",
+                ]
+            )
+            count += 1
+    os.replace(temp, destination)
+    return count
 
 
 class ReportBuilder:
     """Generate a PDF report summarizing pipeline results."""
 
-    def __init__(self, output_dir: Path, logo_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        output_dir: Path,
+        logo_path: Path | None = None,
+        *,
+        section_cache: bool = True,
+        large_batch_threshold: int = DEFAULT_LARGE_BATCH_THRESHOLD,
+        max_table_rows: int = DEFAULT_MAX_TABLE_ROWS,
+        max_thumbnails: int = DEFAULT_MAX_THUMBNAILS,
+        thumbnail_edge: int = DEFAULT_THUMBNAIL_EDGE,
+    ) -> None:
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.logo_path = logo_path
+        self.section_cache = section_cache
+        self.large_batch_threshold = large_batch_threshold
+        self.max_table_rows = max(1, max_table_rows)
+        self.max_thumbnails = max(0, max_thumbnails)
+        self.thumbnail_edge = thumbnail_edge
 
         self.title_style = ParagraphStyle(
             name="Title",
@@ -220,7 +370,17 @@ class ReportBuilder:
         timeline: Sequence[dict[str, object]] | None = None,
         storage_root: Path | None = None,
     ) -> ReportArtifact:
-        context = ReportContext(
+        return self.render(self.build_context(result, timeline=timeline, storage_root=storage_root))
+
+    def build_context(
+        self,
+        result: PipelineResult,
+        *,
+        timeline: Sequence[dict[str, object]] | None = None,
+        storage_root: Path | None = None,
+    ) -> ReportContext:
+        """Snapshot of everything the PDF needs; picklable, so it can be rendered in another process."""
+        return ReportContext(
             batch_id=result.batch_id,
             generated_at=datetime.now(),
             observations=tuple(result.observations or []),
@@ -238,20 +398,65 @@ class ReportBuilder:
             summary_prompt_hash=result.summary_prompt_hash,
             summary_response_hash=result.summary_response_hash,
             summary_warnings=result.summary_warnings or [],
-            timeline=timeline or [],
+            timeline=[
+                dict(event)
+                for event in timeline or []
+                if not str(event.get("code") or event.get("label") or "").startswith(REPORT_STAGE_PREFIX)
+            ],
             storage_root=storage_root,
         )
-        filename = f"report-{context.batch_id}.pdf"
-        destination = self.output_dir / filename
-        self._render_pdf(destination, context)
 
-        checksum = self._compute_checksum(destination)
-        return ReportArtifact(path=destination, checksum_sha256=checksum)
+    def render(self, context: ReportContext) -> ReportArtifact:
+        """Render the PDF through a hashing writer and publish it atomically as ``report-<batch>.pdf``."""
+        destination = self.output_dir / f"report-{context.batch_id}.pdf"
+        detail_csv: Path | None = None
+        if self.is_large_batch(context):
+            detail_csv = self.output_dir / self._detail_csv_name(context)
+            write_observations_csv(context.observations, detail_csv)
+
+        store = ContentStore(self.output_dir / REPORT_STORE_DIRNAME, suffix=".pdf")
+        reused: tuple[str, ...] = ()
+        with store.writer() as sink:
+            # Assembling fragments and attaching the CSV both need PyMuPDF.
+            if self.section_cache and fitz is not None:
+                reused = self._render_from_sections(sink, context, attachment=detail_csv)
+            else:
+                self._render_pdf(sink, context, attachment=detail_csv)
+        stored = store.publish(sink, destination)
+        return ReportArtifact(
+            path=destination,
+            checksum_sha256=stored.checksum_sha256,
+            reused_sections=reused,
+            detail_csv=detail_csv,
+            deduplicated=stored.deduplicated,
+        )
 
-    def _render_pdf(self, destination: Path, context: ReportContext) -> None:
-        story: list = []
-        doc = SimpleDocTemplate(
-            str(destination),
+    def is_large_batch(self, context: ReportContext) -> bool:
+        return 0 < self.large_batch_threshold < len(context.observations)
+
+    def _detail_csv_name(self, context: ReportContext) -> str:
+        return f"report-{context.batch_id}-observations.csv"
+
+    def _attach_file(self, doc: fitz.Document, attachment: Path) -> None:
+        doc.embfile_add(attachment.name, attachment.read_bytes(), filename=attachment.name)
+
+    def _section_builders(self) -> dict[str, Callable[[ReportContext], list]]:
+        return {
+            "cover": self._build_cover,
+            "dashboard": self._build_dashboard_section,
+            "timeline": self._build_timeline_section,
+            "summary": self._build_summary_block,
+            "observations": self._build_observations_section,
+            "ocr": self._build_ocr_annex,
+            "technical_timeline": self._build_technical_timeline_section,
+            "annexes": self._build_annexes_section,
+        }
+
+    def _new_document(self, target: str | io.BytesIO | HashingWriter) -> SimpleDocTemplate:
+        # invariant: no creation timestamp or random ID, so identical inputs give identical bytes.
+        return SimpleDocTemplate(
+            target,
+            invariant=True,
             pagesize=A4,
             leftMargin=2 * cm,
             rightMargin=2 * cm,
@@ -259,21 +464,143 @@ class ReportBuilder:
             bottomMargin=2 * cm,
         )
 
-        story.extend(self._build_cover(context))
-        story.append(PageBreak())
-
-        story.extend(self._build_dashboard_section(context))
-        story.append(PageBreak())
-
-        story.extend(self._build_summary_block(context))
-        story.append(PageBreak())
-
-        story.extend(self._build_observations_section(context))
-        story.append(PageBreak())
-
-        story.extend(self._build_annexes_section(context))
+    def _render_pdf(self, sink: HashingWriter, context: ReportContext, *, attachment: Path | None = None) -> None:
+        story: list = []
+        builders = self._section_builders()
+        for index, name in enumerate(REPORT_SECTIONS):
+            if index:
+                story.append(PageBreak())
+            story.extend(builders[name](context))
+
+        if attachment is not None and fitz is None:
+            logger.warning("PyMuPDF unavailable: %s is not embedded in the report", attachment.name)
+            attachment = None
+        if attachment is None:
+            self._new_document(sink).build(story)
+            return
+        # Built on disk next to the sink, then streamed into it with the attachment.
+        source = sink.path.with_name(f"{sink.path.name}.src.pdf")
+        try:
+            self._new_document(str(source)).build(story)
+            with fitz.open(source) as doc:
+                self._attach_file(doc, attachment)
+                doc.save(sink, **PDF_SAVE_OPTIONS)
+        finally:
+            source.unlink(missing_ok=True)
+
+    def _render_from_sections(
+        self,
+        sink: HashingWriter,
+        context: ReportContext,
+        *,
+        attachment: Path | None = None,
+    ) -> tuple[str, ...]:
+        """Assemble the report from cached section fragments; return the names of reused sections."""
+        cache_dir = self.output_dir / SECTION_CACHE_DIRNAME / context.batch_id
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        builders = self._section_builders()
+        reused: list[str] = []
+        fragments: list[Path] = []
+        for name in REPORT_SECTIONS:
+            fragment = cache_dir / f"{name}-{self.section_key(name, context)}.pdf"
+            if fragment.exists():
+                reused.append(name)
+            else:
+                buffer = io.BytesIO()
+                self._new_document(buffer).build(builders[name](context))
+                self._write_fragment(fragment, buffer.getvalue())
+            fragments.append(fragment)
 
-        doc.build(story)
+        merged = fitz.open()
+        try:
+            for fragment in fragments:
+                with fitz.open(fragment) as part:
+                    merged.insert_pdf(part)
+            if attachment is not None:
+                self._attach_file(merged, attachment)
+            merged.save(sink, **PDF_SAVE_OPTIONS)
+        finally:
+            merged.close()
+        return tuple(reused)
+
+    def _write_fragment(self, fragment: Path, data: bytes) -> None:
+        # Earlier fragments of the same section are stale once the inputs changed.
+        prefix = fragment.name.rsplit("-", 1)[0]
+        for stale in fragment.parent.glob(f"{prefix}-*.pdf"):
+            stale.unlink(missing_ok=True)
+        temp = fragment.with_suffix(".tmp")
+        temp.write_bytes(data)
+        os.replace(temp, fragment)
+
+    def section_key(self, name: str, context: ReportContext) -> str:
+        """Content hash of everything section ``name`` renders."""
+        payload = json.dumps(
+            {"version": SECTION_LAYOUT_VERSION, "section": name, "inputs": self._section_inputs(name, context)},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _section_inputs(self, name: str, context: ReportContext) -> Any:
+        # Only what the section renders: a Gemini rerun must leave the OCR and timeline keys unchanged.
+        risk = asdict(context.risk) if context.risk else None
+        if name == "cover":
+            return {
+                "batch_id": context.batch_id,
+                "deposited_at": self._deposit_date(context),
+                "logo": str(self.logo_path) if self.logo_path and self.logo_path.exists() else None,
+                "risk": risk,
+                "summary": [context.summary_status, context.summary_source, context.summary_text],
+                "recommendation": (context.summary_recommendations or [])[:1],
+                "gemini": [context.gemini_status, context.gemini_provider],
+            }
+        if name == "dashboard":
+            return {
+                "severities": severity_counts(context.observations),
+                "risk": risk,
+                "statuses": [context.summary_status, context.gemini_status],
+                "timeline_steps": len(self._prepare_timeline_rows(context.timeline)),
+            }
+        if name == "timeline":
+            return self._prepare_timeline_rows(context.timeline)
+        if name == "summary":
+            return {
+                "summary": [context.summary_status, context.summary_source, context.gemini_provider, context.summary_text],
+                "findings": (context.summary_findings or [])[:4],
+                "recommendations": (context.summary_recommendations or [])[:4],
+                "warnings": (context.summary_warnings or [])[:4],
+            }
+        if name == "observations":
+            return {
+                "options": [self.large_batch_threshold, self.max_table_rows, self.max_thumbnails, self.thumbnail_edge],
+                "thumbnails": [source for source, _ in self._thumbnail_sources(context)],
+                # Plain tuples: dataclasses.asdict deep-copies and dominates on large batches.
+                "observations": [
+                    (obs.source_file, obs.label, obs.severity, obs.confidence, obs.bbox, obs.extra)
+                    for obs in context.observations
+                ],
+            }
+        if name == "ocr":
+            return self._ocr_excerpts(context.ocr_texts)
+        if name == "technical_timeline":
+            return self._prepare_timeline_rows(context.timeline, include_technical=True)
+        if name == "annexes":
+            return {
+                "gemini": [context.gemini_status, context.gemini_provider, context.gemini_duration_ms],
+                "summary": [context.summary_status, context.summary_source],
+                "hashes": [context.gemini_prompt_hash, context.summary_prompt_hash, context.summary_response_hash],
+                "warnings": (context.summary_warnings or [])[:4],
+            }
+        raise ValueError(f"Unknown report section: {name}")
+
+    def _deposit_date(self, context: ReportContext) -> str:
+        """Date of the earliest timeline event: stable across regenerations, unlike the render time."""
+        stamps = [self._parse_timestamp(event.get("timestamp") or event.get("time")) for event in context.timeline]
+        known = [stamp.replace(tzinfo=stamp.tzinfo or timezone.utc) for stamp in stamps if stamp is not None]
+        if not known:
+            return "-"
+        return min(known).astimezone().strftime("%d/%m/%Y %H:%M")
 
     def _build_cover(self, context: ReportContext) -> list:
         elements: list = []
@@ -287,10 +614,9 @@ class ReportBuilder:
         elements.append(Paragraph("AUDEX", self.badge_style))
         elements.append(Paragraph("Rapport d'audit", self.cover_title_style))
 
-        generated_at = context.generated_at.strftime("%d/%m/%Y %H:%M")
         meta_rows: list[list[str]] = [
             ["Batch ID", context.batch_id],
-            ["Date de génération", generated_at],
+            ["Date de dépôt", self._deposit_date(context)],
             ["Responsable", "Pipeline automatique AUDEX"],
         ]
         if context.risk:
@@ -415,7 +741,7 @@ class ReportBuilder:
                 chart.hAlign = "CENTER"
                 elements.append(chart)
             else:
-                elements.append(Paragraph("Graphique indisponible (matplotlib non disponible).", self.body_small_style))
+                elements.append(Paragraph("Graphique indisponible.", self.body_small_style))
 
             elements.append(Spacer(1, 12))
             elements.append(self._build_risk_table(context.risk.breakdown))
@@ -423,14 +749,17 @@ class ReportBuilder:
             elements.append(Spacer(1, 12))
             elements.append(Paragraph("Aucun score de risque calculé pour ce lot.", self.body_style))
 
+        return elements
+
+    def _build_timeline_section(self, context: ReportContext) -> list:
+        elements: list = [Paragraph("Timeline de traitement", self.title_style)]
+        timeline_rows = self._prepare_timeline_rows(context.timeline)
         if timeline_rows:
-            elements.append(Spacer(1, 18))
-            elements.append(Paragraph("Timeline de traitement", self.section_title_style))
+            elements.append(Spacer(1, 12))
             elements.append(self._build_timeline_table(timeline_rows))
         else:
             elements.append(Spacer(1, 12))
             elements.append(Paragraph("Timeline de traitement indisponible.", self.body_small_style))
-
         return elements
 
     def _build_summary_block(self, context: ReportContext) -> list:
@@ -444,33 +773,186 @@ class ReportBuilder:
         observations = list(context.observations)
 
         if observations:
-            elements.append(self._build_observation_table(observations))
+            if self.is_large_batch(context):
+                elements.extend(self._build_grouped_observations(context))
+            else:
+                elements.append(self._build_observation_table(observations))
             stats_table = self._build_observation_stats_table(observations)
             if stats_table is not None:
                 elements.append(Spacer(1, 12))
                 elements.append(Paragraph("Répartition des sévérités", self.section_title_style))
+                chart = severity_chart(observations)
+                if chart is not None:
+                    chart.hAlign = "LEFT"
+                    elements.append(chart)
+                    elements.append(Spacer(1, 6))
                 elements.append(stats_table)
             elements.append(Spacer(1, 12))
             elements.append(Paragraph("Prévisualisations visuelles", self.section_title_style))
+            elements.extend(self._build_thumbnails(context))
+        else:
+            elements.append(Paragraph("Aucune observation n'a été enregistrée pour ce lot.", self.body_style))
+
+        return elements
+
+    def _source_image_path(self, context: ReportContext, source_file: str) -> Path | None:
+        if context.storage_root is None:
+            return None
+        for candidate in (context.storage_root / context.batch_id / source_file, context.storage_root / source_file):
+            if candidate.is_file():
+                return candidate
+        return None
+
+    def _thumbnail_sources(self, context: ReportContext) -> list[tuple[str, list[AnnotatedBox]]]:
+        """Photos to illustrate, worst detections first, with the boxes to draw on each."""
+        if not self.max_thumbnails or context.storage_root is None:
+            return []
+        ranked = sorted(
+            boxes_by_file(context.observations).items(),
+            key=lambda item: (min(_severity_rank(box.severity) for box in item[1]), -len(item[1]), item[0]),
+        )
+        selected: list[tuple[str, list[AnnotatedBox]]] = []
+        for source_file, file_boxes in ranked:
+            if self._source_image_path(context, source_file) is not None:
+                selected.append((source_file, file_boxes))
+                if len(selected) >= self.max_thumbnails:
+                    break
+        return selected
+
+    def _build_thumbnails(self, context: ReportContext) -> list:
+        cells: list = []
+        sources = self._thumbnail_sources(context)
+        if sources and context.storage_root is not None:
+            cache = ThumbnailCache(context.storage_root / THUMBNAIL_DIRNAME, max_edge=self.thumbnail_edge)
+            for source_file, boxes in sources:
+                path = self._source_image_path(context, source_file)
+                thumbnail = cache.get_or_create(path, boxes) if path else None
+                if thumbnail is not None:
+                    cells.append(self._thumbnail_cell(source_file, boxes, thumbnail))
+        if not cells:
+            return [Paragraph("Aucune photo annotée n'est disponible pour ce lot.", self.body_small_style)]
+
+        rows = [cells[start : start + THUMBNAIL_COLUMNS] for start in range(0, len(cells), THUMBNAIL_COLUMNS)]
+        rows[-1] += [""] * (THUMBNAIL_COLUMNS - len(rows[-1]))
+        table = Table(rows, colWidths=[THUMBNAIL_DISPLAY_WIDTH + 0.5 * cm] * THUMBNAIL_COLUMNS, hAlign="LEFT")
+        table.setStyle(
+            TableStyle(
+                [
+                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                    ("LEFTPADDING", (0, 0), (-1, -1), 2),
+                    ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+                ]
+            )
+        )
+        return [table]
+
+    def _thumbnail_cell(self, source_file: str, boxes: Sequence[AnnotatedBox], thumbnail: Thumbnail) -> list:
+        width = THUMBNAIL_DISPLAY_WIDTH
+        height = width * thumbnail.height / thumbnail.width
+        if height > THUMBNAIL_DISPLAY_WIDTH:
+            width, height = width * THUMBNAIL_DISPLAY_WIDTH / height, THUMBNAIL_DISPLAY_WIDTH
+        worst = min((box.severity for box in boxes), key=_severity_rank)
+        labels = sorted({box.label for box in boxes})
+        caption = (
+            f"<b>{escape(source_file)}</b> — {len(boxes)} détection(s), sévérité max {escape(worst)} : "
+            f"{escape(', '.join(labels))}"
+        )
+        return [Image(str(thumbnail.path), width=width, height=height), Paragraph(caption, self.body_small_style)]
+
+    def _build_grouped_observations(self, context: ReportContext) -> list:
+        observations = context.observations
+        groups = group_observations(observations)
+        shown = groups[: self.max_table_rows]
+        elements: list = [
+            Paragraph(
+                f"Lot volumineux : {len(observations)} observations regroupées en {len(groups)} couples "
+                f"fichier / label. Le détail complet est joint au PDF ({self._detail_csv_name(context)}).",
+                self.body_small_style,
+            ),
+            Paragraph("Synthèse par label", self.section_title_style),
+            self._build_label_rollup_table(groups),
+            Spacer(1, 12),
+            Paragraph("Observations par fichier", self.section_title_style),
+        ]
+        for start in range(0, len(shown), TABLE_CHUNK_ROWS):
+            elements.append(self._build_group_table(shown[start : start + TABLE_CHUNK_ROWS]))
+        hidden = groups[len(shown) :]
+        if hidden:
+            hidden_count = sum(group.count for group in hidden)
+            elements.append(Spacer(1, 6))
             elements.append(
                 Paragraph(
-                    "Les vignettes seront intégrées dès que la pipeline vision exportera des images annotées.",
+                    f"{len(hidden)} groupes supplémentaires ({hidden_count} observations, sévérités moindres) "
+                    "ne sont pas détaillés ici : voir la pièce jointe CSV.",
                     self.body_small_style,
                 )
             )
-        else:
-            elements.append(Paragraph("Aucune observation n'a été enregistrée pour ce lot.", self.body_style))
-
         return elements
 
-    def _build_annexes_section(self, context: ReportContext) -> list:
-        elements: list = [Paragraph("Annexes techniques & traçabilité", self.title_style)]
+    def _build_label_rollup_table(self, groups: Sequence[ObservationGroup]) -> Table:
+        rollup: dict[str, list[Any]] = {}
+        for group in groups:
+            entry = rollup.setdefault(group.label, [0, 0, group.severity])
+            entry[0] += group.count
+            entry[1] += 1
+            if _severity_rank(group.severity) < _severity_rank(entry[2]):
+                entry[2] = group.severity
+        data = [["Label", "Observations", "Fichiers", "Sévérité max"]]
+        for label, (count, files, severity) in sorted(rollup.items(), key=lambda item: (-item[1][0], item[0])):
+            data.append([label.title(), str(count), str(files), severity.title()])
+        return self._styled_table(data)
+
+    def _build_group_table(self, groups: Sequence[ObservationGroup]) -> Table:
+        data = [["Fichier", "Label", "Occurrences", "Sévérité max", "Confiance max", "Confiance moy."]]
+        for group in groups:
+            data.append(
+                [
+                    group.source_file,
+                    group.label.title(),
+                    str(group.count),
+                    group.severity.title(),
+                    f"{group.max_confidence:.2f}",
+                    f"{group.mean_confidence:.2f}",
+                ]
+            )
+        return self._styled_table(data)
+
+    def _styled_table(self, data: list[list[str]]) -> Table:
+        table = Table(data, hAlign="LEFT", repeatRows=1)
+        table.setStyle(
+            TableStyle(
+                [
+                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1f2937")),
+                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                    ("FONTSIZE", (0, 0), (-1, -1), 8),
+                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.HexColor("#f9fafb"), colors.white]),
+                    ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+                    ("LEFTPADDING", (0, 0), (-1, -1), 4),
+                    ("RIGHTPADDING", (0, 0), (-1, -1), 4),
+                ]
+            )
+        )
+        return table
 
+    def _build_ocr_annex(self, context: ReportContext) -> list:
+        elements: list = [Paragraph("Annexes techniques & traçabilité", self.title_style)]
         elements.append(Paragraph("Extraits OCR pertinents", self.section_title_style))
         elements.extend(self._build_ocr_section(context.ocr_texts))
+        return elements
 
-        elements.append(Spacer(1, 12))
-        elements.append(Paragraph("Métadonnées Gemini & synthèse", self.section_title_style))
+    def _build_technical_timeline_section(self, context: ReportContext) -> list:
+        elements: list = [Paragraph("Timeline complète", self.section_title_style)]
+        full_timeline_rows = self._prepare_timeline_rows(context.timeline, include_technical=True)
+        if full_timeline_rows:
+            elements.append(self._build_timeline_table(full_timeline_rows))
+        else:
+            elements.append(Paragraph("Timeline de traitement indisponible.", self.body_small_style))
+        return elements
+
+    def _build_annexes_section(self, context: ReportContext) -> list:
+        elements: list = [Paragraph("Métadonnées Gemini & synthèse", self.section_title_style)]
         elements.append(self._build_metadata_table(context))
         trace_table = self._build_traceability_table(context)
         if trace_table:
@@ -482,12 +964,6 @@ class ReportBuilder:
             for warning in context.summary_warnings[:4]:
                 elements.append(Paragraph(f"• {warning}", self.body_small_style))
 
-        full_timeline_rows = self._prepare_timeline_rows(context.timeline, include_technical=True)
-        if full_timeline_rows:
-            elements.append(Spacer(1, 12))
-            elements.append(Paragraph("Timeline complète", self.section_title_style))
-            elements.append(self._build_timeline_table(full_timeline_rows))
-
         elements.append(Spacer(1, 18))
         elements.append(Paragraph("Clauses & disclaimers", self.section_title_style))
         elements.extend(self._build_disclaimer_section())
@@ -617,16 +1093,20 @@ class ReportBuilder:
 
         return elements
 
+    def _ocr_excerpts(self, ocr_entries: Sequence[OCRResult]) -> list[tuple[str, str]]:
+        # Only the rendered snippet: stored texts may be capped, the snippets still match.
+        excerpts: list[tuple[str, str]] = []
+        for entry in list(ocr_entries)[:OCR_EXCERPT_COUNT]:
+            text = entry.text.strip().replace("\n", " ")
+            snippet = text if len(text) <= OCR_EXCERPT_CHARS else f"{text[: OCR_EXCERPT_CHARS - 3]}..."
+            excerpts.append((entry.source_file, snippet))
+        return excerpts
+
     def _build_ocr_section(self, ocr_entries: Sequence[OCRResult]) -> list:
-        if not ocr_entries:
+        excerpts = self._ocr_excerpts(ocr_entries)
+        if not excerpts:
             return [Paragraph("Aucun extrait OCR disponible.", self.body_style)]
-
-        items: list = []
-        for entry in ocr_entries[:5]:
-            text = entry.text.strip().replace("\n", " ")
-            snippet = text if len(text) <= 160 else f"{text[:157]}..."
-            items.append(Paragraph(f"<b>{entry.source_file}</b> — {snippet}", self.body_style))
-        return items
+        return [Paragraph(f"<b>{source}</b> — {snippet}", self.body_style) for source, snippet in excerpts]
 
     def _build_metadata_table(self, context: ReportContext) -> Table:
         data = [
@@ -680,34 +1160,10 @@ class ReportBuilder:
         )
         return table
 
-    def _create_risk_chart(self, context: ReportContext) -> Image | None:
-        try:
-            import io
-            import matplotlib
-
-            matplotlib.use("Agg")
-            import matplotlib.pyplot as plt
-
-            labels = [item.label.title() for item in context.risk.breakdown]
-            scores = [item.score for item in context.risk.breakdown]
-
-            fig, ax = plt.subplots(figsize=(4, 3))
-            bars = ax.bar(labels, scores, color="#2563eb")
-            ax.set_title("Scores par catégorie")
-            ax.set_ylabel("Score")
-            ax.set_ylim(bottom=0)
-            ax.bar_label(bars, fmt="%.1f")
-            fig.tight_layout()
-
-            buffer = io.BytesIO()
-            fig.savefig(buffer, format="PNG")
-            plt.close(fig)
-            buffer.seek(0)
-
-            img = Image(buffer, width=12 * cm, height=9 * cm)
-            return img
-        except Exception:  # noqa: BLE001
+    def _create_risk_chart(self, context: ReportContext) -> Drawing | None:
+        if not context.risk:
             return None
+        return risk_bar_chart(context.risk.breakdown)
 
     def _build_timeline_table(self, timeline_rows: Sequence[dict[str, Any]]) -> Table:
         data: list[list[Any]] = [["Horodatage", "Phase", "Détails", "Progression"]]
@@ -907,10 +1363,3 @@ class ReportBuilder:
             return f"{seconds:.1f} s"
         minutes = seconds / 60
         return f"{minutes:.1f} min"
-
-    def _compute_checksum(self, path: Path) -> str:
-        hasher = hashlib.sha256()
-        with path.open("rb") as pdf_file:
-            while chunk := pdf_file.read(4096):
-                hasher.update(chunk)
-        return hasher.hexdigest()
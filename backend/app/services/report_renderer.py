@@ -0,0 +1,135 @@
+"""Report PDF rendering off the event loop, in a dedicated process pool.
+
+ReportLab's ``doc.build`` is CPU bound and holds the GIL, so rendering in a thread
+of the API process still stalls other requests. The
+:class:`ReportRenderPool` renders a picklable :class:`~app.services.report.ReportContext`
+in ``REPORT_RENDER_WORKERS`` spawned processes. At most ``REPORT_RENDER_QUEUE_SIZE``
+reports wait for a worker; further submissions wait for a free slot instead of
+piling up in the executor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from logging import getLogger
+from typing import Callable
+
+from app.core.config import settings
+from app.services.report import ReportArtifact, ReportBuilder, ReportContext
+
+logger = getLogger(__name__)
+
+# (state, queued reports) with state "queued" or "rendering".
+RenderProgressCallback = Callable[[str, int], None]
+
+
+class ReportRenderBusyError(RuntimeError):
+    """Raised when no render slot frees up before the render timeout."""
+
+
+def _render_in_worker(builder: ReportBuilder, context: ReportContext) -> ReportArtifact:
+    # The builder only holds its options and paragraph styles, so it pickles along with the context.
+    return builder.render(context)
+
+
+class ReportRenderPool:
+    """Bounded process pool rendering report PDFs (inline in a thread when ``max_workers`` is 0)."""
+
+    def __init__(self, max_workers: int, queue_size: int = 4, *, timeout: float = 300.0) -> None:
+        self.max_workers = max(0, max_workers)
+        self.queue_size = max(0, queue_size)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(1, self.max_workers) + self.queue_size)
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Reports submitted and not finished yet (rendering or queued)."""
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def submit(self, builder: ReportBuilder, context: ReportContext) -> Future[ReportArtifact]:
+        """Queue ``context`` for rendering; blocks while the queue is full."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise ReportRenderBusyError(f"no report render slot within {self.timeout:.0f}s")
+        with self._pending_lock:
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(_render_in_worker, builder, context)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _future: self._release())
+        return future
+
+    def _release(self) -> None:
+        with self._pending_lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def render(self, builder: ReportBuilder, context: ReportContext) -> ReportArtifact:
+        if self.max_workers == 0:
+            return builder.render(context)
+        return self.submit(builder, context).result(timeout=self.timeout)
+
+    async def render_async(
+        self,
+        builder: ReportBuilder,
+        context: ReportContext,
+        on_progress: RenderProgressCallback | None = None,
+    ) -> ReportArtifact:
+        """Render without blocking the event loop, reporting queue state through ``on_progress``."""
+        if self.max_workers == 0:
+            if on_progress is not None:
+                on_progress("rendering", 0)
+            return await asyncio.to_thread(builder.render, context)
+
+        queued_ahead = max(0, self.pending - self.max_workers + 1)
+        if on_progress is not None:
+            on_progress("queued" if queued_ahead else "rendering", queued_ahead)
+        start = time.perf_counter()
+        # Waiting for a slot blocks, so it happens off the loop as well.
+        future = await asyncio.to_thread(self.submit, builder, context)
+        artifact = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        logger.debug("Report %s rendered in %.2fs", context.batch_id, time.perf_counter() - start)
+        return artifact
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool: ReportRenderPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_report_render_pool() -> ReportRenderPool:
+    """Process-wide render pool sized from the ``REPORT_RENDER_*`` settings."""
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is None:
+            _pool = ReportRenderPool(
+                settings.REPORT_RENDER_WORKERS,
+                settings.REPORT_RENDER_QUEUE_SIZE,
+                timeout=settings.REPORT_RENDER_TIMEOUT_SECONDS,
+            )
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -5,11 +5,16 @@ import json
 import logging
 import re
 import time
-from dataclasses import dataclass
-from typing import Iterable, Sequence
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterable, Sequence
 
 from app.core.config import settings
 from app.pipelines.models import OCRResult, Observation, RiskScore
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError, get_gemini_circuit_breaker
+from app.services.extractive_summary import MAX_RECOMMENDATIONS, build_extractive_summary
+from app.services.gemini_client import extract_response_text, get_gemini_client
+from app.services.ollama_client import get_ollama_client
+from app.services.response_cache import ResponseCache, get_summary_cache, make_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +34,37 @@ VOCABULARY_REPLACEMENTS: dict[str, str] = {
 
 SUMMARY_CHAR_LIMIT = 3000  # Augmenté pour permettre des synthèses plus détaillées
 
+SUMMARY_GENERATION_CONFIG: dict[str, Any] = {
+    "temperature": 0.3,
+    "top_p": 0.8,
+    "top_k": 40,
+    "response_mime_type": "application/json",
+}
+
+ENGINE_GEMINI = "gemini"
+ENGINE_EXTRACTIVE = "extractive"
+EXTRACTIVE_PROVIDER = "local-extractive"
+
+# Summary fields concatenated (in this order) into the summary text.
+SUMMARY_TEXT_FIELDS = ("context", "critical_areas", "priorities", "major_risks")
+
+# Local fallback prompt: (items per section, OCR snippet chars, indented schema), tried
+# in order until the prompt fits the fallback model context.
+FALLBACK_PROMPT_LEVELS: tuple[tuple[int, int, bool], ...] = (
+    (5, 160, True),
+    (5, 160, False),
+    (3, 120, False),
+    (2, 80, False),
+    (1, 60, False),
+)
+
+# Receives ``(delta, text)``: the newly readable text and the whole partial summary so far.
+SummaryDeltaCallback = Callable[[str, str], None]
+
+_PARTIAL_KEY = re.compile(r'\s*,?\s*"(\w+)"\s*:\s*"')
+_CLOSED_STRING = re.compile(r'((?:[^"\\]|\\.)*)"', re.DOTALL)
+_TRAILING_ESCAPE = re.compile(r"\\(?:u[0-9a-fA-F]{0,3})?$")
+
 
 @dataclass(slots=True)
 class SummaryRequest:
@@ -50,6 +86,86 @@ class SummaryResult:
     prompt_hash: str | None = None
     response_hash: str | None = None
     duration_ms: int | None = None
+    first_text_ms: int | None = None
+    cached: bool = False
+    # Hash of the compacted prompt actually sent to the fallback model (prompt_hash stays the request's).
+    fallback_prompt_hash: str | None = None
+
+
+def _read_partial_string(text: str, pos: int) -> tuple[str, int | None]:
+    """Decode the JSON string body starting at ``pos``; ``end`` is ``None`` while it is unterminated."""
+    match = _CLOSED_STRING.match(text, pos)
+    if match:
+        raw, end = match.group(1), match.end()
+    else:
+        raw, end = _TRAILING_ESCAPE.sub("", text[pos:]), None
+    try:
+        return json.loads(f'"{raw}"'), end
+    except ValueError:
+        return raw, end
+
+
+def partial_summary_text(buffer: str) -> str | None:
+    """Summary text readable from a (possibly incomplete) JSON summary response.
+
+    Reads the ``summary`` object fields that have started so far, the last one possibly
+    cut mid-sentence, so that text can be shown before the response is complete.
+    """
+    start = re.search(r'"summary"\s*:\s*', buffer)
+    if start is None:
+        return None
+    rest = buffer[start.end():]
+    if rest.startswith('"'):
+        value, _ = _read_partial_string(rest, 1)
+        return value or None
+    if not rest.startswith("{"):
+        return None
+    parts: list[str] = []
+    pos = 1
+    while True:
+        match = _PARTIAL_KEY.match(rest, pos)
+        if match is None:
+            break
+        value, end = _read_partial_string(rest, match.end())
+        if match.group(1) in SUMMARY_TEXT_FIELDS and value:
+            parts.append(value)
+        if end is None:
+            break
+        pos = end
+    return " ".join(parts) or None
+
+
+class SummaryStream:
+    """Accumulates streamed response chunks and reports newly readable summary text."""
+
+    def __init__(self, on_delta: SummaryDeltaCallback, render: Callable[[str], str | None]) -> None:
+        self.on_delta = on_delta
+        self.render = render
+        self.buffer = ""
+        self.text = ""
+        self.deltas = 0
+        self.first_text_ms: int | None = None
+        self._start = time.perf_counter()
+
+    def restart(self) -> None:
+        """Forget the chunks of a failed attempt (the text already shown is kept)."""
+        self.buffer = ""
+
+    def feed(self, chunk: str) -> None:
+        self.buffer += chunk
+        partial = partial_summary_text(self.buffer)
+        text = self.render(partial) if partial else None
+        if not text or text == self.text:
+            return
+        delta = text[len(self.text):] if text.startswith(self.text) else text
+        self.text = text
+        self.deltas += 1
+        if self.first_text_ms is None:
+            self.first_text_ms = int((time.perf_counter() - self._start) * 1000)
+        try:
+            self.on_delta(delta, text)
+        except Exception as exc:  # noqa: BLE001 - a listener must not break the summary
+            logger.debug("Summary delta listener failed: %s", exc)
 
 
 class ReportSummaryService:
@@ -58,17 +174,37 @@ class ReportSummaryService:
     PROVIDER = "google-gemini"
     PROMPT_VERSION = "summary-1.1"
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        circuit_breaker: CircuitBreaker | None = None,
+        summary_cache: ResponseCache | None = None,
+    ) -> None:
         self.enabled = settings.GEMINI_SUMMARY_ENABLED
         self.required = settings.GEMINI_SUMMARY_REQUIRED
         self.api_key = settings.GEMINI_SUMMARY_API_KEY or settings.GEMINI_API_KEY
         self.model = settings.GEMINI_SUMMARY_MODEL
+        self.endpoint = settings.GEMINI_API_ENDPOINT
         self.timeout = settings.GEMINI_SUMMARY_TIMEOUT_SECONDS
         self.max_retries = settings.GEMINI_SUMMARY_MAX_RETRIES
+        self.streaming = settings.GEMINI_SUMMARY_STREAMING
+        self.engine = (settings.SUMMARY_ENGINE or ENGINE_GEMINI).strip().lower()
+        self.placeholder_enabled = settings.SUMMARY_PLACEHOLDER_ENABLED
         self.fallback_enabled = settings.SUMMARY_FALLBACK_ENABLED
         self.fallback_model = settings.SUMMARY_FALLBACK_MODEL
+        self.fallback_url = settings.SUMMARY_FALLBACK_URL
+        self.fallback_context_tokens = settings.SUMMARY_FALLBACK_CONTEXT_TOKENS
+        self.fallback_max_output_tokens = settings.SUMMARY_FALLBACK_MAX_OUTPUT_TOKENS
+        self.circuit_breaker = circuit_breaker or get_gemini_circuit_breaker()
+        self.summary_cache = summary_cache if summary_cache is not None else get_summary_cache()
+
+    def generate(self, request: SummaryRequest, *, on_delta: SummaryDeltaCallback | None = None) -> SummaryResult:
+        """Generate the summary; with ``on_delta`` (and streaming enabled) partial text is reported as it arrives."""
+        if self.engine == ENGINE_EXTRACTIVE:
+            result = self._extractive_summary(request)
+            if on_delta is not None and result.text:
+                on_delta(result.text, result.text)
+            return result
 
-    def generate(self, request: SummaryRequest) -> SummaryResult:
         if not self.enabled:
             return SummaryResult(
                 status="disabled",
@@ -93,16 +229,36 @@ class ReportSummaryService:
 
         prompt = self._build_prompt(request)
         prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        cache_key = self._cache_key(prompt_hash)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            logger.info("Summary cache hit for %s (prompt %s)", request.batch_id, prompt_hash[:12])
+            if on_delta is not None and cached.text:
+                on_delta(cached.text, cached.text)
+            return cached
+
+        if on_delta is not None and self.placeholder_enabled:
+            # Instant local text, replaced by the LLM summary as soon as it streams in.
+            placeholder = self._extractive_summary(request)
+            if placeholder.text:
+                on_delta(placeholder.text, placeholder.text)
+
+        stream: SummaryStream | None = None
+        if on_delta is not None and self.streaming:
+            stream = SummaryStream(on_delta, lambda text: self._compose_summary(text, request.risk))
 
         try:
-            response_text, duration_ms = self._call_gemini(prompt)
+            if stream is not None:
+                response_text, duration_ms = self._call_gemini(prompt, stream=stream)
+            else:
+                response_text, duration_ms = self._call_gemini(prompt)
             summary, findings, recommendations, warnings = self._parse_response(response_text)
             summary = self._compose_summary(summary, request.risk)
             findings = self._sanitize_list(findings)
             recommendations = self._sanitize_list(recommendations)
             warnings = self._sanitize_list(warnings, limit=3, sentence_case=False)
             response_hash = hashlib.sha256(response_text.encode("utf-8")).hexdigest()
-            return SummaryResult(
+            result = SummaryResult(
                 status="ok" if summary or findings or recommendations else "no_content",
                 text=summary,
                 findings=findings,
@@ -112,13 +268,32 @@ class ReportSummaryService:
                 prompt_hash=prompt_hash,
                 response_hash=response_hash,
                 duration_ms=duration_ms,
+                first_text_ms=stream.first_text_ms if stream is not None else None,
+            )
+            if result.status == "ok" and cache_key is not None:
+                self.summary_cache.put(cache_key, json.dumps(asdict(result), ensure_ascii=False))
+            return result
+        except CircuitOpenError as exc:
+            logger.warning("Gemini summary skipped for %s: %s", request.batch_id, exc)
+            if self.fallback_enabled:
+                return self._fallback_summary(request, prompt_hash, str(exc), stream)
+            if self.required:
+                raise
+            return SummaryResult(
+                status="skipped",
+                text=None,
+                findings=[],
+                recommendations=[],
+                warnings=["summary-circuit-open"],
+                source=self.PROVIDER,
+                prompt_hash=prompt_hash,
             )
         except Exception as exc:  # noqa: BLE001
             logger.warning("Gemini summary failed for %s: %s", request.batch_id, exc)
             if self.required and not self.fallback_enabled:
                 raise
             if self.fallback_enabled:
-                return self._fallback_summary(request, prompt_hash, str(exc))
+                return self._fallback_summary(request, prompt_hash, str(exc), stream)
             return SummaryResult(
                 status="failed",
                 text=None,
@@ -131,7 +306,29 @@ class ReportSummaryService:
                 duration_ms=None,
             )
 
-    def _build_prompt(self, request: SummaryRequest) -> str:
+    def _cache_key(self, prompt_hash: str) -> str | None:
+        if self.summary_cache is None:
+            return None
+        return make_cache_key(prompt_hash, self.model, self.PROMPT_VERSION)
+
+    def _cached_result(self, cache_key: str | None) -> SummaryResult | None:
+        raw = self.summary_cache.get(cache_key) if cache_key is not None else None
+        if raw is None:
+            return None
+        try:
+            return SummaryResult(**{**json.loads(raw), "cached": True})
+        except (TypeError, ValueError) as exc:  # entry written by an older SummaryResult layout
+            logger.debug("Ignoring unreadable summary cache entry: %s", exc)
+            return None
+
+    def _build_prompt(
+        self,
+        request: SummaryRequest,
+        *,
+        max_items: int = 5,
+        snippet_chars: int = 160,
+        indent_schema: bool = True,
+    ) -> str:
         risk_section = "Aucun score de risque enregistré."
         if request.risk:
             lines = [
@@ -140,7 +337,7 @@ class ReportSummaryService:
             ]
             if request.risk.breakdown:
                 lines.append("- Principales catégories :")
-                for breakdown in request.risk.breakdown[:5]:
+                for breakdown in request.risk.breakdown[:max_items]:
                     severity = self._translate_severity(breakdown.severity)
                     lines.append(
                         f"  * {breakdown.label} · gravité {severity} · {breakdown.count} cas · score {breakdown.score:.1f}"
@@ -154,7 +351,7 @@ class ReportSummaryService:
             if not observations:
                 return f"Aucune observation {label}."
             lines = [f"Observations {label} :"]
-            for obs in list(observations)[:5]:
+            for obs in list(observations)[:max_items]:
                 severity = self._translate_severity(obs.severity)
                 confidence = "-"
                 if obs.confidence is not None:
@@ -173,10 +370,10 @@ class ReportSummaryService:
         ocr_snippets = "Aucun extrait OCR pertinent."
         if request.ocr_texts:
             snippets: list[str] = []
-            for entry in request.ocr_texts[:5]:
+            for entry in request.ocr_texts[:max_items]:
                 snippet = entry.text.strip().replace("\n", " ")
                 if snippet:
-                    snippets.append(f"- {entry.source_file} • {snippet[:160]}")
+                    snippets.append(f"- {entry.source_file} • {snippet[:snippet_chars]}")
             if snippets:
                 ocr_snippets = "Extraits OCR :\n" + "\n".join(snippets)
 
@@ -214,7 +411,7 @@ class ReportSummaryService:
                 }
             ],
         }
-        schema_json = json.dumps(summary_schema, ensure_ascii=False, indent=2)
+        schema_json = json.dumps(summary_schema, ensure_ascii=False, indent=2 if indent_schema else None)
 
         prompt = f"""
 Tu es un consultant QHSE. Fournis une synthèse claire et actionnable en français. Interdiction de citer les moteurs
@@ -262,45 +459,44 @@ Tu es un consultant QHSE. Fournis une synthèse claire et actionnable en frança
 """
         return prompt.strip()
 
-    def _call_gemini(self, prompt: str) -> tuple[str, int]:
+    def _call_gemini(self, prompt: str, stream: SummaryStream | None = None) -> tuple[str, int]:
         start = time.perf_counter()
-        import google.generativeai as genai  # type: ignore
-
-        genai.configure(api_key=self.api_key)
-        model = genai.GenerativeModel(
-            model_name=self.model,
-            generation_config={
-                "temperature": 0.3,
-                "top_p": 0.8,
-                "top_k": 40,
-                "response_mime_type": "application/json",
-            },
-        )
+        client = get_gemini_client(self.api_key, self.endpoint)
+        contents = [{"role": "user", "parts": [{"text": prompt}]}]
 
         attempts = self.max_retries + 1
         last_exc: Exception | None = None
         for attempt in range(1, attempts + 1):
+            self.circuit_breaker.check()
             try:
-                logger.debug("Gemini summary attempt %s/%s", attempt, attempts)
-                response = model.generate_content(
-                    [{"role": "user", "parts": [{"text": prompt}]}],
-                    request_options={"timeout": self.timeout},
-                )
-                text = getattr(response, "text", None)
+                logger.debug("Gemini summary attempt %s/%s (stream=%s)", attempt, attempts, stream is not None)
+                if stream is not None:
+                    stream.restart()
+                    for chunk in client.stream(
+                        self.model,
+                        contents,
+                        generation_config=SUMMARY_GENERATION_CONFIG,
+                        timeout=self.timeout,
+                    ):
+                        stream.feed(chunk)
+                    text = stream.buffer
+                else:
+                    response = client.generate(
+                        self.model,
+                        contents,
+                        generation_config=SUMMARY_GENERATION_CONFIG,
+                        timeout=self.timeout,
+                    )
+                    text = extract_response_text(response)
                 if text:
+                    self.circuit_breaker.record_success()
                     duration_ms = int((time.perf_counter() - start) * 1000)
                     return text, duration_ms
-                candidates = getattr(response, "candidates", None)
-                if candidates:
-                    candidate_content = getattr(candidates[0], "content", None)
-                    candidate_parts = getattr(candidate_content, "parts", []) if candidate_content else []
-                    texts = [getattr(part, "text", "") for part in candidate_parts if getattr(part, "text", "")]
-                    if texts:
-                        duration_ms = int((time.perf_counter() - start) * 1000)
-                        return "\n".join(texts), duration_ms
                 raise RuntimeError("Empty response from Gemini summary.")
             except Exception as exc:  # noqa: BLE001
                 last_exc = exc
+                if self.circuit_breaker.record_failure(exc):
+                    raise CircuitOpenError(f"circuit {self.circuit_breaker.name} open") from exc
                 if attempt < attempts:
                     time.sleep(min(2 * attempt, 6))
                     continue
@@ -392,15 +588,7 @@ Tu es un consultant QHSE. Fournis une synthèse claire et actionnable en frança
         # Construire le résumé à partir des composants
         summary_dict = parsed.get("summary", {})
         if isinstance(summary_dict, dict):
-            summary_parts = []
-            if summary_dict.get("context"):
-                summary_parts.append(str(summary_dict["context"]))
-            if summary_dict.get("critical_areas"):
-                summary_parts.append(str(summary_dict["critical_areas"]))
-            if summary_dict.get("priorities"):
-                summary_parts.append(str(summary_dict["priorities"]))
-            if summary_dict.get("major_risks"):
-                summary_parts.append(str(summary_dict["major_risks"]))
+            summary_parts = [str(summary_dict[key]) for key in SUMMARY_TEXT_FIELDS if summary_dict.get(key)]
             summary = " ".join(summary_parts) if summary_parts else None
         else:
             summary = str(summary_dict) if summary_dict else None
@@ -472,26 +660,98 @@ Tu es un consultant QHSE. Fournis une synthèse claire et actionnable en frança
             _ensure_list(warnings),
         )
 
-    def _fallback_summary(self, request: SummaryRequest, prompt_hash: str, error: str) -> SummaryResult:
+    def _build_fallback_prompt(self, request: SummaryRequest) -> str:
+        """Largest prompt that fits the fallback model context next to its answer."""
+        budget = max(256, self.fallback_context_tokens - self.fallback_max_output_tokens)
+        prompt = ""
+        for max_items, snippet_chars, indent_schema in FALLBACK_PROMPT_LEVELS:
+            prompt = self._build_prompt(
+                request,
+                max_items=max_items,
+                snippet_chars=snippet_chars,
+                indent_schema=indent_schema,
+            )
+            if len(prompt) // 4 <= budget:  # ≈4 characters per token
+                break
+        return prompt
+
+    def _fallback_summary(
+        self,
+        request: SummaryRequest,
+        prompt_hash: str,
+        error: str,
+        stream: SummaryStream | None = None,
+    ) -> SummaryResult:
         logger.info("Using fallback summary model %s due to %s", self.fallback_model, error)
-        text = (
-            "Analyse avancée indisponible. Résumé généré localement : "
-            "les observations locales doivent être traitées selon les priorités habituelles."
-        )
-        text = self._compose_summary(text, request.risk) or text
-        findings = self._sanitize_list(["Analyse avancée indisponible"])
-        recommendations = self._sanitize_list(
-            ["Relancer la synthèse distante quand la connexion est rétablie."]
-        )
-        warnings = self._sanitize_list([f"summary-fallback:{error}"], sentence_case=False)
+        prompt = self._build_fallback_prompt(request)
+        try:
+            if stream is not None:
+                stream.restart()
+            completion = get_ollama_client(self.fallback_url).generate(
+                self.fallback_model,
+                prompt,
+                options={
+                    "num_ctx": self.fallback_context_tokens,
+                    "num_predict": self.fallback_max_output_tokens,
+                    "temperature": SUMMARY_GENERATION_CONFIG["temperature"],
+                },
+                on_chunk=stream.feed if stream is not None else None,
+            )
+            summary, findings, recommendations, warnings = self._parse_response(completion.text)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Local fallback summary (%s) failed: %s", self.fallback_model, exc)
+            return self._static_fallback_summary(request, prompt_hash, error)
+
+        summary = self._compose_summary(summary, request.risk)
+        findings = self._sanitize_list(findings)
+        recommendations = self._sanitize_list(recommendations)
+        if not (summary or findings or recommendations):
+            return self._static_fallback_summary(request, prompt_hash, error)
+        warnings = self._sanitize_list([f"summary-fallback:{error}", *warnings], limit=3, sentence_case=False)
         return SummaryResult(
             status="fallback",
-            text=text,
+            text=summary,
             findings=findings,
             recommendations=recommendations,
             warnings=warnings,
             source=self.fallback_model,
             prompt_hash=prompt_hash,
+            response_hash=hashlib.sha256(completion.text.encode("utf-8")).hexdigest(),
+            duration_ms=completion.duration_ms,
+            first_text_ms=stream.first_text_ms if stream is not None else completion.first_token_ms,
+            fallback_prompt_hash=hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        )
+
+    def _static_fallback_summary(self, request: SummaryRequest, prompt_hash: str, error: str) -> SummaryResult:
+        return self._extractive_summary(
+            request,
+            status="fallback",
+            intro="Analyse avancée indisponible, synthèse établie localement.",
+            warnings=[f"summary-fallback:{error}"],
+            prompt_hash=prompt_hash,
+        )
+
+    def _extractive_summary(
+        self,
+        request: SummaryRequest,
+        *,
+        status: str = "ok",
+        intro: str | None = None,
+        warnings: Sequence[str] = (),
+        prompt_hash: str | None = None,
+    ) -> SummaryResult:
+        start = time.perf_counter()
+        extractive = build_extractive_summary(request)
+        text = f"{intro} {extractive.text}" if intro else extractive.text
+        text = self._compose_summary(text, request.risk) or text
+        return SummaryResult(
+            status=status,
+            text=text,
+            findings=self._sanitize_list(extractive.findings),
+            recommendations=self._sanitize_list(extractive.recommendations, limit=MAX_RECOMMENDATIONS),
+            warnings=self._sanitize_list([*warnings, *extractive.warnings], limit=3, sentence_case=False),
+            source=EXTRACTIVE_PROVIDER,
+            prompt_hash=prompt_hash,
             response_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
-            duration_ms=None,
+            duration_ms=int((time.perf_counter() - start) * 1000),
         )
@@ -0,0 +1,189 @@
+"""Durable cache for AI provider responses (SQLite file, TTL + size-bounded LRU)."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from logging import getLogger
+from pathlib import Path
+from typing import Callable
+
+from app.core.config import settings
+
+logger = getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+def make_cache_key(*parts: str | None) -> str:
+    """Stable key from the parts identifying a request (image hash, prompt hash, model...)."""
+    return hashlib.sha256("\x1f".join(part or "" for part in parts).encode("utf-8")).hexdigest()
+
+
+def hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    hasher = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe key/value store persisted in SQLite.
+
+    Entries older than ``ttl_seconds`` are ignored and purged; once the stored values
+    exceed ``max_bytes`` the least recently read entries are evicted. ``0`` disables
+    the corresponding bound.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        ttl_seconds: int = 0,
+        max_bytes: int = 0,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = max(0, ttl_seconds)
+        self.max_bytes = max(0, max_bytes)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Opened on first use so that constructing the cache never touches the disk.
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(_SCHEMA)
+        return self._connection
+
+    def get(self, key: str) -> str | None:
+        """Return the cached value, or ``None`` on miss, expiry or storage error."""
+        try:
+            return self._get(key)
+        except sqlite3.Error as exc:
+            logger.warning("Response cache %s read failed: %s", self.path, exc)
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        try:
+            self._put(key, value)
+        except sqlite3.Error as exc:
+            logger.warning("Response cache %s write failed: %s", self.path, exc)
+
+    def _get(self, key: str) -> str | None:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return value
+
+    def _put(self, key: str, value: str) -> None:
+        now = self._clock()
+        size = len(value.encode("utf-8"))
+        if self.max_bytes and size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._evict_locked(now)
+
+    def _evict_locked(self, now: float) -> None:
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        if not self.max_bytes:
+            return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.debug("Response cache %s evicted %d entr(ies) to stay under %d bytes", self.path.name, evicted, self.max_bytes)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+_gemini_cache: ResponseCache | None = None
+_gemini_cache_lock = threading.Lock()
+
+
+def get_gemini_response_cache() -> ResponseCache | None:
+    """Process-wide Gemini image-analysis cache, or ``None`` when disabled."""
+    global _gemini_cache  # noqa: PLW0603
+    if not settings.GEMINI_CACHE_ENABLED:
+        return None
+    with _gemini_cache_lock:
+        if _gemini_cache is None:
+            _gemini_cache = ResponseCache(
+                settings.GEMINI_CACHE_PATH,
+                ttl_seconds=settings.GEMINI_CACHE_TTL_SECONDS,
+                max_bytes=max(0, settings.GEMINI_CACHE_MAX_MB) * 1024 * 1024,
+            )
+        return _gemini_cache
+
+
+_summary_cache: ResponseCache | None = None
+_summary_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> ResponseCache | None:
+    """Process-wide cache of generated report summaries, or ``None`` when disabled."""
+    global _summary_cache  # noqa: PLW0603
+    if not settings.SUMMARY_CACHE_ENABLED:
+        return None
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            _summary_cache = ResponseCache(
+                settings.SUMMARY_CACHE_PATH,
+                ttl_seconds=settings.SUMMARY_CACHE_TTL_SECONDS,
+                max_bytes=max(0, settings.SUMMARY_CACHE_MAX_MB) * 1024 * 1024,
+            )
+        return _summary_cache
@@ -0,0 +1,282 @@
+"""Streaming extractors for plain-text and DOCX uploads.
+
+Large files are decoded chunk by chunk: only the first ``max_chars`` characters are
+kept in memory (and stored in ``ocr_texts``); once that cap is exceeded the full text
+is streamed to a sidecar ``<file>.fulltext.txt`` next to the upload.
+"""
+
+from __future__ import annotations
+
+import codecs
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+from xml.etree.ElementTree import iterparse
+
+try:  # pragma: no cover - optional dependency
+    from charset_normalizer import from_bytes as detect_charset
+except Exception:  # noqa: BLE001
+    detect_charset = None  # type: ignore[assignment]
+
+READ_CHUNK_BYTES = 256 * 1024
+DETECTION_SAMPLE_BYTES = 64 * 1024
+SIDECAR_SUFFIX = ".fulltext.txt"
+FALLBACK_ENCODING = "latin-1"
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+@dataclass(slots=True)
+class ExtractedText:
+    text: str
+    total_chars: int
+    truncated: bool = False
+    encoding: str | None = None
+    sidecar_path: str | None = None
+    input_capped: bool = False
+    warnings: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "total_chars": self.total_chars,
+            "stored_chars": len(self.text),
+            "truncated": self.truncated,
+            "sidecar_path": self.sidecar_path,
+            "input_capped": self.input_capped,
+        }
+
+
+class CappedTextWriter:
+    """Keep the first ``max_chars`` characters in memory, spill the full text to a sidecar."""
+
+    def __init__(self, max_chars: int, sidecar_path: Path) -> None:
+        self._max_chars = max(0, max_chars)
+        self._sidecar_path = sidecar_path
+        self._head: list[str] = []
+        self._head_chars = 0
+        self._total_chars = 0
+        self._sidecar: Any = None
+        self._started = False
+
+    def write(self, piece: str) -> None:
+        if not self._started:
+            piece = piece.lstrip()
+            if not piece:
+                return
+            self._started = True
+
+        self._total_chars += len(piece)
+        if self._sidecar is not None:
+            self._sidecar.write(piece)
+            return
+
+        if self._head_chars + len(piece) <= self._max_chars:
+            self._head.append(piece)
+            self._head_chars += len(piece)
+            return
+
+        # Cap exceeded: flush what we kept so far, then stream everything to disk.
+        self._sidecar = self._sidecar_path.open("w", encoding="utf-8")
+        self._sidecar.writelines(self._head)
+        self._sidecar.write(piece)
+        room = self._max_chars - self._head_chars
+        if room > 0:
+            self._head.append(piece[:room])
+            self._head_chars += room
+
+    def close(self) -> ExtractedText:
+        truncated = self._sidecar is not None
+        if truncated:
+            self._sidecar.close()
+        elif self._sidecar_path.exists():
+            self._sidecar_path.unlink()  # stale sidecar from a previous run
+        return ExtractedText(
+            text="".join(self._head).rstrip(),
+            total_chars=self._total_chars,
+            truncated=truncated,
+            sidecar_path=str(self._sidecar_path) if truncated else None,
+        )
+
+
+def sidecar_path_for(path: Path) -> Path:
+    return path.with_name(f"{path.name}{SIDECAR_SUFFIX}")
+
+
+def detect_encoding(sample: bytes) -> str:
+    """Guess the charset of ``sample`` (BOM, then UTF-8, then charset-normalizer, then latin-1)."""
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    if detect_charset is not None:
+        best = detect_charset(sample).best()
+        if best is not None and best.encoding:
+            return codecs.lookup(best.encoding).name
+    return FALLBACK_ENCODING
+
+
+class _CountingReader:
+    """File-like wrapper stopping after ``limit`` bytes (``0`` = no limit)."""
+
+    def __init__(self, raw: BinaryIO, limit: int) -> None:
+        self._raw = raw
+        self._limit = limit
+        self.consumed = 0
+        self.capped = False
+
+    def read(self, size: int = -1) -> bytes:
+        if self._limit:
+            remaining = self._limit - self.consumed
+            if remaining <= 0:
+                self.capped = self.capped or bool(self._raw.read(1))
+                return b""
+            size = remaining if size is None or size < 0 else min(size, remaining)
+        chunk = self._raw.read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+def iter_decoded_text(stream: BinaryIO, warnings: list[str]) -> Iterator[tuple[str, str]]:
+    """Yield ``(encoding, text)`` pieces from a binary stream, detecting the charset incrementally.
+
+    The charset is guessed from the first sample; if a later chunk is not valid in
+    that charset, decoding switches to latin-1 for the rest of the stream.
+    """
+    sample = stream.read(DETECTION_SAMPLE_BYTES)
+    if not sample:
+        return
+    encoding = detect_encoding(sample)
+    if encoding == FALLBACK_ENCODING:
+        warnings.append("text-decoding-latin1")
+    elif encoding not in {"utf-8", "utf-8-sig"}:
+        warnings.append(f"text-decoding-{encoding}")
+    decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+
+    chunk = sample
+    while chunk:
+        try:
+            text = decoder.decode(chunk, final=False)
+        except UnicodeDecodeError:
+            encoding = FALLBACK_ENCODING
+            if "text-decoding-latin1" not in warnings:
+                warnings.append("text-decoding-latin1")
+            decoder = codecs.getincrementaldecoder(encoding)(errors="ignore")
+            text = decoder.decode(chunk, final=False)
+        if text:
+            yield encoding, text
+        chunk = stream.read(READ_CHUNK_BYTES)
+    tail = _final(decoder)
+    if tail:
+        yield encoding, tail
+
+
+def _final(decoder: codecs.IncrementalDecoder) -> str:
+    try:
+        return decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return ""
+
+
+def extract_plain_text(path: Path, max_chars: int, max_input_bytes: int = 0) -> ExtractedText:
+    """Stream a text file, keeping at most ``max_chars`` characters in memory."""
+    warnings: list[str] = []
+    writer = CappedTextWriter(max_chars, sidecar_path_for(path))
+    encoding: str | None = None
+    with path.open("rb") as raw:
+        reader = _CountingReader(raw, max_input_bytes)
+        for encoding, piece in iter_decoded_text(reader, warnings):
+            writer.write(piece)
+    result = writer.close()
+    result.encoding = encoding
+    result.input_capped = reader.capped
+    result.warnings = warnings
+    if reader.capped:
+        result.warnings.append("text-input-capped")
+    return result
+
+
+def _paragraph_text(element: Any) -> str:
+    parts: list[str] = []
+    for node in element.iter():
+        if node.tag == f"{_WORD_NS}t" and node.text:
+            parts.append(node.text)
+        elif node.tag == f"{_WORD_NS}tab":
+            parts.append("\t")
+        elif node.tag in (f"{_WORD_NS}br", f"{_WORD_NS}cr"):
+            parts.append("\n")
+    return "".join(parts).strip()
+
+
+def iter_docx_blocks(stream: BinaryIO) -> Iterator[str]:
+    """Yield DOCX paragraphs and table rows (``cell | cell``) in document order.
+
+    ``word/document.xml`` is parsed incrementally and processed elements are cleared,
+    so memory stays bounded by the largest paragraph rather than the whole document.
+    """
+    # One frame per open table: [current row cells, current cell paragraphs]
+    tables: list[tuple[list[str], list[str]]] = []
+    for event, element in iterparse(stream, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            if tag == f"{_WORD_NS}tbl":
+                tables.append(([], []))
+            continue
+
+        if tag == f"{_WORD_NS}p":
+            text = _paragraph_text(element)
+            element.clear()
+            if not text:
+                continue
+            if tables:
+                tables[-1][1].append(text)
+            else:
+                yield text
+        elif tag == f"{_WORD_NS}tc" and tables:
+            cells, paragraphs = tables[-1]
+            cell_text = "\n".join(paragraphs).strip()
+            if cell_text:
+                cells.append(cell_text)
+            paragraphs.clear()
+            element.clear()
+        elif tag == f"{_WORD_NS}tr" and tables:
+            cells = tables[-1][0]
+            if cells:
+                yield " | ".join(cells)
+            cells.clear()
+            element.clear()
+        elif tag == f"{_WORD_NS}tbl" and tables:
+            tables.pop()
+            element.clear()
+        elif tag == f"{_WORD_NS}body":
+            element.clear()
+
+
+def extract_docx_text(path: Path, max_chars: int, max_input_bytes: int = 0) -> ExtractedText:
+    """Stream the text of a DOCX file, keeping at most ``max_chars`` characters in memory."""
+    writer = CappedTextWriter(max_chars, sidecar_path_for(path))
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as raw:
+        reader = _CountingReader(raw, max_input_bytes)
+        first = True
+        try:
+            for block in iter_docx_blocks(reader):  # type: ignore[arg-type]
+                writer.write(block if first else f"\n{block}")
+                first = False
+        except SyntaxError:
+            # ParseError when the byte cap cuts the XML; keep what was extracted so far.
+            if not reader.capped:
+                raise
+    result = writer.close()
+    result.input_capped = reader.capped
+    if reader.capped:
+        result.warnings.append("text-input-capped")
+    return result
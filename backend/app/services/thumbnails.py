@@ -0,0 +1,174 @@
+"""Vignettes annotées des photos d'un lot (boîtes YOLO dessinées sur une copie réduite).
+
+Chaque vignette est calculée une seule fois puis rangée dans un cache adressé par son
+contenu : la clé combine l'empreinte SHA-256 de la photo source, les boîtes dessinées et
+les paramètres de réduction. Le rapport PDF et l'API servent ces petits JPEG au lieu des
+photos pleine résolution.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+from dataclasses import dataclass
+from logging import getLogger
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from PIL import Image, ImageDraw, ImageOps
+
+from app.pipelines.models import Observation
+from app.services.report_charts import SEVERITY_COLORS, UNKNOWN_SEVERITY_COLOR
+
+logger = getLogger(__name__)
+
+# Incrémenter après toute modification du dessin : les anciennes vignettes ne sont plus reprises.
+THUMBNAIL_VERSION = "1"
+THUMBNAIL_DIRNAME = "thumbnails"
+DEFAULT_THUMBNAIL_EDGE = 320
+DEFAULT_THUMBNAIL_QUALITY = 75
+
+_EXIF_ORIENTATION = 0x0112
+# Orientations EXIF qui échangent largeur et hauteur.
+_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+BoundingBox = tuple[int, int, int, int]
+
+
+@dataclass(slots=True, frozen=True)
+class AnnotatedBox:
+    bbox: BoundingBox
+    label: str
+    severity: str
+
+
+@dataclass(slots=True)
+class Thumbnail:
+    path: Path
+    key: str
+    width: int
+    height: int
+    boxes: int
+    cached: bool = False
+
+
+def _hex(severity: str) -> str:
+    color = SEVERITY_COLORS.get((severity or "").lower(), UNKNOWN_SEVERITY_COLOR)
+    return "#" + color.hexval()[2:]
+
+
+def boxes_by_file(observations: Iterable[Observation]) -> dict[str, list[AnnotatedBox]]:
+    """Boîtes à dessiner, par fichier source (observations sans bbox ignorées)."""
+    boxes: dict[str, list[AnnotatedBox]] = {}
+    for obs in observations:
+        if obs.bbox and len(obs.bbox) == 4:
+            box = AnnotatedBox(bbox=tuple(int(v) for v in obs.bbox), label=obs.label, severity=obs.severity)
+            boxes.setdefault(obs.source_file, []).append(box)
+    return boxes
+
+
+def file_digest(path: Path) -> str:
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+def render_thumbnail(data: bytes, boxes: Sequence[AnnotatedBox], max_edge: int, quality: int) -> tuple[bytes, int, int]:
+    """JPEG réduit à ``max_edge`` pixels (côté long) avec les boîtes dessinées à l'échelle."""
+    with Image.open(io.BytesIO(data)) as source:
+        width, height = source.size
+        if source.getexif().get(_EXIF_ORIENTATION) in _TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        # draft() laisse le décodeur JPEG réduire l'image à la volée (facteur 1/2 à 1/8).
+        source.draft("RGB", (max_edge, max_edge))
+        image = ImageOps.exif_transpose(source)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+    scale_x = image.width / width
+    scale_y = image.height / height
+    draw = ImageDraw.Draw(image)
+    line = max(1, round(max(image.size) / 160))
+    for box in boxes:
+        x1, y1, x2, y2 = box.bbox
+        rect = (x1 * scale_x, y1 * scale_y, x2 * scale_x, y2 * scale_y)
+        color = _hex(box.severity)
+        draw.rectangle(rect, outline=color, width=line)
+        text_x, text_y = rect[0], max(0.0, rect[1] - 11)
+        left, top, right, bottom = draw.textbbox((text_x, text_y), box.label)
+        draw.rectangle((left - 1, top - 1, right + 1, bottom + 1), fill=color)
+        draw.text((text_x, text_y), box.label, fill="white")
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue(), image.width, image.height
+
+
+class ThumbnailCache:
+    """Vignettes annotées stockées sous ``root/<clé[:2]>/<clé>.jpg``.
+
+    Aucun état en mémoire : le processus de rendu des rapports et l'API peuvent partager le
+    même répertoire, l'écriture (fichier temporaire puis renommage) étant atomique.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        max_edge: int = DEFAULT_THUMBNAIL_EDGE,
+        quality: int = DEFAULT_THUMBNAIL_QUALITY,
+    ) -> None:
+        self.root = Path(root)
+        self.max_edge = max(16, max_edge)
+        self.quality = quality
+
+    def key(self, source_digest: str, boxes: Sequence[AnnotatedBox]) -> str:
+        payload = json.dumps(
+            {
+                "version": THUMBNAIL_VERSION,
+                "source": source_digest,
+                "edge": self.max_edge,
+                "quality": self.quality,
+                "boxes": [[list(box.bbox), box.label, box.severity] for box in boxes],
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.jpg"
+
+    def get_or_create(
+        self,
+        source: Path,
+        boxes: Sequence[AnnotatedBox],
+        *,
+        source_digest: str | None = None,
+    ) -> Thumbnail | None:
+        """Vignette de ``source`` ; ``None`` si la photo est absente ou illisible."""
+        if not source.is_file():
+            return None
+        boxes = sorted(boxes, key=lambda box: (box.bbox, box.label, box.severity))
+        key = self.key(source_digest or file_digest(source), boxes)
+        target = self.path_for(key)
+        if target.exists():
+            try:
+                with Image.open(target) as cached:
+                    width, height = cached.size
+                return Thumbnail(path=target, key=key, width=width, height=height, boxes=len(boxes), cached=True)
+            except OSError:
+                target.unlink(missing_ok=True)
+
+        try:
+            data, width, height = render_thumbnail(source.read_bytes(), boxes, self.max_edge, self.quality)
+        except Exception as exc:  # noqa: BLE001 - undecodable image: no thumbnail
+            logger.debug("Thumbnail skipped for %s: %s", source.name, exc)
+            return None
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        temp.write_bytes(data)
+        os.replace(temp, target)
+        return Thumbnail(path=target, key=key, width=width, height=height, boxes=len(boxes))
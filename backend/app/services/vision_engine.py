@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import threading
 from pathlib import Path
-from typing import Iterable, List, Protocol
+from typing import Any, Iterable, List, Protocol
 
 try:  # pragma: no cover - ultralytics n'est pas installé durant les tests.
     from ultralytics import YOLO  # type: ignore
@@ -38,6 +38,9 @@ class LegacyVisionEngine:
     def detect(self, path: Path, zone: str | None = None) -> List[Observation]:
         return legacy_vision.detect_anomalies(path)
 
+    def detect_image(self, image: Any, source_name: str, zone: str | None = None) -> List[Observation]:
+        return legacy_vision.detect_anomalies_in_image(image, source_name)
+
 
 class YOLOVisionEngine:
     """Moteur YOLOv8n + règles métiers AUDEX."""
@@ -73,11 +76,30 @@ class YOLOVisionEngine:
         return self._model
 
     def detect(self, path: Path, zone: str | None = None) -> List[Observation]:
+        observations = self._predict(str(path), path.name, zone)
+        if observations is None:
+            # Retour au legacy en cas d'échec (modèle manquant, erreur I/O, etc.)
+            observations = legacy_vision.detect_anomalies(path)
+
+        # Ajouter les heuristiques qualité (luminosité/flou), même en mode fallback.
+        observations.extend(vision_rules.apply_quality_checks(path, zone=zone))
+
+        return observations
+
+    def detect_image(self, image: Any, source_name: str, zone: str | None = None) -> List[Observation]:
+        """Analyse une image BGR déjà décodée (ex. image intégrée à un DOCX/PDF)."""
+        observations = self._predict(image, source_name, zone)
+        if observations is None:
+            observations = legacy_vision.detect_anomalies_in_image(image, source_name)
+        observations.extend(vision_rules.apply_quality_checks_to_image(image, source_name, zone=zone))
+        return observations
+
+    def _predict(self, source: Any, source_name: str, zone: str | None) -> List[Observation] | None:
         observations: list[Observation] = []
         try:
             model = self._load_model()
             results = model.predict(  # type: ignore[call-arg]
-                source=str(path),
+                source=source,
                 conf=self._confidence,
                 verbose=False,
                 device="cpu",
@@ -111,7 +133,7 @@ class YOLOVisionEngine:
                     zone_norm = zone.strip().lower() if isinstance(zone, str) and zone.strip() else None
 
                     observation = Observation(
-                        source_file=path.name,
+                        source_file=source_name,
                         label=category,
                         confidence=confidence,
                         severity=severity,
@@ -130,11 +152,7 @@ class YOLOVisionEngine:
                     observations.append(observation)
 
         except Exception:
-            # Retour au legacy en cas d'échec (modèle manquant, erreur I/O, etc.)
-            observations.extend(legacy_vision.detect_anomalies(path))
-
-        # Ajouter les heuristiques qualité (luminosité/flou), même en mode fallback.
-        observations.extend(vision_rules.apply_quality_checks(path, zone=zone))
+            return None
 
         return observations
 
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Mapping, Sequence
+from typing import Any, Mapping, Sequence
 
 try:  # pragma: no cover - OpenCV optionnel dans l'environnement de tests.
     import cv2  # type: ignore
@@ -87,13 +87,21 @@ def map_class(class_name: str, confidence: float, zone: str | None = None) -> tu
 
 def apply_quality_checks(image_path: Path, zone: str | None = None) -> list[Observation]:
     """Détecte les problèmes de luminosité ou de flou."""
-    observations: list[Observation] = []
-
     if cv2 is None or np is None:
-        return observations
+        return []
 
     image = cv2.imread(str(image_path))
     if image is None:
+        return []
+
+    return apply_quality_checks_to_image(image, image_path.name, zone=zone)
+
+
+def apply_quality_checks_to_image(image: Any, source_name: str, zone: str | None = None) -> list[Observation]:
+    """Variante de :func:`apply_quality_checks` pour une image BGR déjà décodée."""
+    observations: list[Observation] = []
+
+    if cv2 is None or np is None:
         return observations
 
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
@@ -105,7 +113,7 @@ def apply_quality_checks(image_path: Path, zone: str | None = None) -> list[Obse
     if mean_brightness < 55.0:
         observations.append(
             Observation(
-                source_file=image_path.name,
+                source_file=source_name,
                 label="cleanliness_issue",
                 confidence=0.4,
                 severity="medium",
@@ -121,7 +129,7 @@ def apply_quality_checks(image_path: Path, zone: str | None = None) -> list[Obse
     if laplacian_var < 35.0:
         observations.append(
             Observation(
-                source_file=image_path.name,
+                source_file=source_name,
                 label="cleanliness_issue",
                 confidence=0.4,
                 severity="medium",
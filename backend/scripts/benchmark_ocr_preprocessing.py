@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Benchmark the adaptive OCR preprocessing planner.
+
+Usage:
+    python backend/scripts/benchmark_ocr_preprocessing.py [--dataset test_audex_dataset] [--repeat 3] [--ocr]
+
+For every image of the dataset, prints the quality metrics, the profile picked by the
+planner and the cost of each profile. With ``--ocr`` the EasyOCR read time and the
+number of extracted characters are reported as well (requires EasyOCR weights).
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import cv2
+
+from app.core.config import settings
+from app.services import ocr_preprocessing
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp"}
+DEFAULT_DATASET = Path(__file__).resolve().parents[2] / "test_audex_dataset"
+
+
+def _time_profile(gray, profile: str, repeat: int) -> tuple[float, object]:
+    durations: list[float] = []
+    processed = gray
+    for _ in range(repeat):
+        start = time.perf_counter()
+        processed = ocr_preprocessing.apply_profile(gray, profile)
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations), processed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark adaptive OCR preprocessing profiles.")
+    parser.add_argument("--dataset", type=Path, default=DEFAULT_DATASET, help="Folder scanned recursively for images.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per profile (median is reported).")
+    parser.add_argument("--ocr", action="store_true", help="Also run EasyOCR on each profile output.")
+    args = parser.parse_args()
+
+    if not args.dataset.exists():
+        raise SystemExit(f"Dataset folder '{args.dataset}' not found.")
+
+    images = sorted(path for path in args.dataset.rglob("*") if path.suffix.lower() in IMAGE_SUFFIXES)
+    if not images:
+        raise SystemExit(f"No image found under '{args.dataset}'.")
+
+    reader = None
+    if args.ocr:
+        import easyocr  # type: ignore
+
+        reader = easyocr.Reader(settings.OCR_LANGUAGES, gpu=False)  # type: ignore[attr-defined]
+
+    totals = {profile: 0.0 for profile in ocr_preprocessing.PROFILES}
+    adaptive_total = 0.0
+    chosen_counts = {profile: 0 for profile in ocr_preprocessing.PROFILES}
+
+    header = f"{'file':45} {'size':>10} {'noise':>6} {'contr.':>6} {'chosen':>6} " + " ".join(
+        f"{profile + ' ms':>9}" for profile in ocr_preprocessing.PROFILES
+    )
+    print(header)
+    print("-" * len(header))
+
+    for path in images:
+        gray = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            print(f"{path.name:45} unreadable")
+            continue
+
+        _, plan = ocr_preprocessing.preprocess(gray, "auto")
+        quality = plan.quality
+        chosen_counts[plan.profile] += 1
+
+        timings: dict[str, float] = {}
+        ocr_notes: list[str] = []
+        for profile in ocr_preprocessing.PROFILES:
+            timings[profile], processed = _time_profile(gray, profile, max(1, args.repeat))
+            totals[profile] += timings[profile]
+            if reader is not None:
+                start = time.perf_counter()
+                results = reader.readtext(processed, detail=0, paragraph=True)  # type: ignore[attr-defined]
+                read_ms = (time.perf_counter() - start) * 1000
+                chars = sum(len(item) for item in results)
+                ocr_notes.append(f"{profile}: {read_ms:.0f} ms / {chars} chars")
+        adaptive_total += plan.assess_ms + timings[plan.profile]
+
+        relative = path.relative_to(args.dataset).as_posix()
+        size = f"{quality.width}x{quality.height}" if quality else "-"
+        print(
+            f"{relative[:45]:45} {size:>10} {quality.noise_sigma:6.2f} {quality.contrast:6.1f} {plan.profile:>6} "
+            + " ".join(f"{timings[profile]:9.2f}" for profile in ocr_preprocessing.PROFILES)
+        )
+        if ocr_notes:
+            print("    " + " | ".join(ocr_notes))
+
+    print()
+    print("Profiles chosen: " + ", ".join(f"{name}={count}" for name, count in chosen_counts.items()))
+    print(f"Always-full preprocessing: {totals[ocr_preprocessing.PROFILE_FULL]:.1f} ms")
+    print(f"Adaptive preprocessing (incl. assessment): {adaptive_total:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
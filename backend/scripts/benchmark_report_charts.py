@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Compare the native ReportLab charts with the former matplotlib raster chart.
+
+Usage:
+    python backend/scripts/benchmark_report_charts.py [--categories 6] [--observations 200] [--repeat 5]
+
+Builds a synthetic pipeline result, then reports for each chart backend the first-call
+cost (including the matplotlib import), the median chart time, the median full report
+time and the resulting PDF size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from reportlab.lib.units import cm
+from reportlab.platypus import Image
+
+from app.pipelines.models import Observation, PipelineResult, RiskBreakdown, RiskScore
+from app.services.report import ReportBuilder, ReportContext
+
+SEVERITIES = ("critical", "high", "medium", "low")
+
+
+class MatplotlibReportBuilder(ReportBuilder):
+    """ReportBuilder with the previous matplotlib PNG chart, kept for comparison only."""
+
+    def _create_risk_chart(self, context: ReportContext) -> Image | None:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        labels = [item.label.title() for item in context.risk.breakdown]
+        scores = [item.score for item in context.risk.breakdown]
+
+        fig, ax = plt.subplots(figsize=(4, 3))
+        bars = ax.bar(labels, scores, color="#2563eb")
+        ax.set_title("Scores par catégorie")
+        ax.set_ylabel("Score")
+        ax.set_ylim(bottom=0)
+        ax.bar_label(bars, fmt="%.1f")
+        fig.tight_layout()
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="PNG")
+        plt.close(fig)
+        buffer.seek(0)
+        return Image(buffer, width=12 * cm, height=9 * cm)
+
+
+def _synthetic_result(categories: int, observations: int, seed: int) -> PipelineResult:
+    rng = random.Random(seed)
+    labels = [f"categorie_{index}" for index in range(categories)]
+    items = [
+        Observation(
+            source_file=f"photo-{index % 50}.jpg",
+            label=rng.choice(labels),
+            confidence=round(rng.uniform(0.4, 0.99), 2),
+            severity=rng.choice(SEVERITIES),
+        )
+        for index in range(observations)
+    ]
+    breakdown = [
+        RiskBreakdown(label=label, severity=rng.choice(SEVERITIES), count=rng.randint(1, 20), score=rng.uniform(1, 30))
+        for label in labels
+    ]
+    total = sum(item.score for item in breakdown)
+    return PipelineResult(
+        batch_id="bench-charts",
+        observations=items,
+        ocr_texts=[],
+        risk=RiskScore(batch_id="bench-charts", total_score=total, normalized_score=min(1.0, total / 100), breakdown=breakdown),
+        summary_text="Synthèse de démonstration.",
+        summary_status="ok",
+    )
+
+
+def _measure(builder: ReportBuilder, result: PipelineResult, repeat: int) -> dict[str, float]:
+    context = builder.build_context(result)
+    start = time.perf_counter()
+    builder._create_risk_chart(context)
+    first_ms = (time.perf_counter() - start) * 1000
+
+    chart_ms: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        builder._create_risk_chart(context)
+        chart_ms.append((time.perf_counter() - start) * 1000)
+
+    report_ms: list[float] = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        artifact = builder.render(builder.build_context(result))
+        report_ms.append((time.perf_counter() - start) * 1000)
+        size = artifact.path.stat().st_size
+    return {
+        "first_ms": first_ms,
+        "chart_ms": statistics.median(chart_ms),
+        "report_ms": statistics.median(report_ms),
+        "pdf_kb": size / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--categories", type=int, default=6)
+    parser.add_argument("--observations", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    result = _synthetic_result(args.categories, args.observations, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Native first, so the matplotlib import is not already paid for it.
+        rows = {
+            "reportlab": _measure(ReportBuilder(Path(tmp) / "native"), result, args.repeat),
+            "matplotlib": _measure(MatplotlibReportBuilder(Path(tmp) / "raster"), result, args.repeat),
+        }
+
+    print(f"categories={args.categories} observations={args.observations} repeat={args.repeat}")
+    print(f"{'backend':<12}{'first chart':>14}{'chart':>12}{'report':>12}{'PDF size':>12}")
+    for name, row in rows.items():
+        print(
+            f"{name:<12}{row['first_ms']:>12.1f}ms{row['chart_ms']:>10.1f}ms"
+            f"{row['report_ms']:>10.1f}ms{row['pdf_kb']:>10.1f}KB"
+        )
+
+
+if __name__ == "__main__":
+    main()
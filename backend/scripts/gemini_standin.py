@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Run the local Gemini stand-in, or benchmark the analyzers against it.
+
+Usage:
+    # Serve on a fixed port, then export GEMINI_API_ENDPOINT=http://127.0.0.1:8787
+    python backend/scripts/gemini_standin.py serve --port 8787 --latency lognormal:800:0.5 --quota-rate 0.05
+
+    # Start an in-process stand-in and push a dataset through AdvancedAnalyzer
+    python backend/scripts/gemini_standin.py bench [--dataset test_audex_dataset] [--copies 4] \
+        [--concurrency 4] [--group-size 1] [--rpm 0] [--latency fixed:300] [--quota-rate 0.1]
+
+``bench`` disables the response cache so that every image reaches the stand-in, and
+prints wall time, per-image latency, request outcomes and the analysis status.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from tests.gemini_standin import OUTCOMES, GeminiStandinServer, LatencyProfile, StandinBehavior
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp"}
+DEFAULT_DATASET = Path(__file__).resolve().parents[2] / "test_audex_dataset"
+
+
+def _behavior(args: argparse.Namespace) -> StandinBehavior:
+    script = [item for item in (args.script or "").split(",") if item]
+    unknown = set(script) - set(OUTCOMES)
+    if unknown:
+        raise SystemExit(f"Unknown outcome(s) in --script: {', '.join(sorted(unknown))}")
+    return StandinBehavior(
+        latency=LatencyProfile.parse(args.latency),
+        quota_error_rate=args.quota_rate,
+        retry_delay_seconds=args.retry_delay,
+        malformed_rate=args.malformed_rate,
+        timeout_rate=args.timeout_rate,
+        error_rate=args.error_rate,
+        hang_seconds=args.hang_seconds,
+        script=script,
+        seed=args.seed,
+    )
+
+
+def serve(args: argparse.Namespace) -> None:
+    server = GeminiStandinServer(_behavior(args), host=args.host, port=args.port).start()
+    print(f"Gemini stand-in on {server.url} — export GEMINI_API_ENDPOINT={server.url}")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"requests={server.requests} images={server.images} outcomes={dict(server.outcomes)}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+def bench(args: argparse.Namespace) -> None:
+    images = sorted(path for path in args.dataset.rglob("*") if path.suffix.lower() in IMAGE_SUFFIXES)
+    if not images:
+        raise SystemExit(f"No images found in {args.dataset}")
+    jobs = [(path, "zone-bench", "generic") for path in images] * max(1, args.copies)
+
+    with GeminiStandinServer(_behavior(args)) as server:
+        settings.GEMINI_ENABLED = True
+        settings.GEMINI_API_KEY = settings.GEMINI_API_KEY or "standin-key"
+        settings.GEMINI_API_ENDPOINT = server.url
+        settings.GEMINI_MAX_CONCURRENCY = args.concurrency
+        settings.GEMINI_GROUP_SIZE = args.group_size
+        settings.GEMINI_TIMEOUT_SECONDS = args.timeout
+
+        from app.services.advanced_analyzer import AdvancedAnalyzer
+        from app.services.rate_limiter import TokenBucketRateLimiter
+
+        analyzer = AdvancedAnalyzer(rate_limiter=TokenBucketRateLimiter(args.rpm, settings.GEMINI_TPM_LIMIT))
+        analyzer.response_cache = None
+        start = time.perf_counter()
+        result = analyzer.analyze("standin-bench", jobs)
+        elapsed = time.perf_counter() - start
+
+        print(f"images={len(jobs)} concurrency={args.concurrency} group_size={args.group_size} latency={args.latency}")
+        print(f"wall={elapsed:.2f}s per-image={elapsed / len(jobs) * 1000:.0f}ms status={result.status}")
+        print(f"requests={server.requests} outcomes={dict(server.outcomes)} warnings={len(result.warnings)}")
+        print(f"upload={result.upload_stats} grouped={result.grouped_images} fallbacks={result.group_fallbacks}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name in ("serve", "bench"):
+        sub = subparsers.add_parser(name)
+        sub.add_argument("--latency", default="fixed:0", help="fixed:MS, uniform:MS:SPREAD or lognormal:MS:SIGMA")
+        sub.add_argument("--quota-rate", type=float, default=0.0)
+        sub.add_argument("--retry-delay", type=float, default=2.0, help="RetryInfo delay sent with quota errors (s)")
+        sub.add_argument("--malformed-rate", type=float, default=0.0)
+        sub.add_argument("--timeout-rate", type=float, default=0.0)
+        sub.add_argument("--error-rate", type=float, default=0.0)
+        sub.add_argument("--hang-seconds", type=float, default=30.0)
+        sub.add_argument("--script", default="", help=f"Forced first outcomes, comma separated ({'|'.join(OUTCOMES)})")
+        sub.add_argument("--seed", type=int, default=None)
+    subparsers.choices["serve"].add_argument("--host", default="127.0.0.1")
+    subparsers.choices["serve"].add_argument("--port", type=int, default=8787)
+    bench_parser = subparsers.choices["bench"]
+    bench_parser.add_argument("--dataset", type=Path, default=DEFAULT_DATASET)
+    bench_parser.add_argument("--copies", type=int, default=1, help="Repeat the dataset to build a larger batch")
+    bench_parser.add_argument("--concurrency", type=int, default=settings.GEMINI_MAX_CONCURRENCY)
+    bench_parser.add_argument("--group-size", type=int, default=settings.GEMINI_GROUP_SIZE)
+    bench_parser.add_argument("--timeout", type=int, default=settings.GEMINI_TIMEOUT_SECONDS)
+    bench_parser.add_argument("--rpm", type=int, default=0, help="Requests/minute limit (0 = unlimited)")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args)
+    else:
+        bench(args)
+
+
+if __name__ == "__main__":
+    main()
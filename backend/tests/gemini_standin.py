@@ -0,0 +1,309 @@
+"""Local stand-in for the Gemini REST ``generateContent`` / ``streamGenerateContent`` API.
+
+Used for offline tests and load/latency benchmarks: point ``GEMINI_API_ENDPOINT`` at
+:attr:`GeminiStandinServer.url` and both :class:`AdvancedAnalyzer` and
+:class:`ReportSummaryService` talk to it through the regular client stack (REST
+transport, retries, rate limiter, circuit breaker).
+
+Each request draws one outcome:
+
+- ``ok``: a valid response (Schéma v1.4 per image, JSON array in grouped mode, or a
+  summary payload), returned after a latency sampled from :class:`LatencyProfile`;
+- ``quota``: HTTP 429 ``RESOURCE_EXHAUSTED`` carrying a ``google.rpc.RetryInfo`` delay;
+- ``malformed``: HTTP 200 whose text is truncated JSON;
+- ``timeout``: the response is held back for ``hang_seconds`` (beyond client timeouts);
+- ``error``: HTTP 500 ``INTERNAL``.
+
+Streamed calls get the same outcomes; ``ok``/``malformed`` text is split into
+``stream_chunk_chars`` pieces spread evenly over the sampled latency.
+
+``script`` forces the outcomes of the first requests (deterministic tests); afterwards
+outcomes are drawn from the configured rates.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import getLogger
+from typing import Any
+
+logger = getLogger(__name__)
+
+OUTCOMES = ("ok", "quota", "malformed", "timeout", "error")
+_ROUTE = re.compile(r"^/v1(?:beta)?/models/(?P<model>[^:/?]+):(?P<method>generateContent|streamGenerateContent)")
+_SEVERITIES = ("low", "medium", "high", "critical")
+
+
+@dataclass(slots=True)
+class LatencyProfile:
+    """Response latency: ``fixed``, ``uniform`` (mean ± spread ms) or ``lognormal`` (sigma = spread)."""
+
+    distribution: str = "fixed"
+    mean_ms: float = 0.0
+    spread: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyProfile":
+        """``"fixed:200"``, ``"uniform:300:100"`` or ``"lognormal:800:0.5"``."""
+        name, *values = spec.split(":")
+        numbers = [float(value) for value in values]
+        return cls(name, numbers[0] if numbers else 0.0, numbers[1] if len(numbers) > 1 else 0.0)
+
+    def sample(self, rng: random.Random) -> float:
+        """Latency in seconds."""
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.distribution == "uniform":
+            value = rng.uniform(self.mean_ms - self.spread, self.mean_ms + self.spread)
+        elif self.distribution == "lognormal":
+            # Parameterised so that the median equals mean_ms.
+            value = rng.lognormvariate(0.0, self.spread) * self.mean_ms
+        else:
+            value = self.mean_ms
+        return max(0.0, value) / 1000
+
+
+@dataclass(slots=True)
+class StandinBehavior:
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    quota_error_rate: float = 0.0
+    retry_delay_seconds: float = 2.0
+    malformed_rate: float = 0.0
+    timeout_rate: float = 0.0
+    error_rate: float = 0.0
+    hang_seconds: float = 30.0
+    stream_chunk_chars: int = 64
+    script: list[str] = field(default_factory=list)
+    seed: int | None = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_StandinHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - signature imposed by http.server
+        logger.debug("gemini stand-in: " + format, *args)
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        match = _ROUTE.match(self.path)
+        if match is None:
+            self._send_json(404, _error_body(404, f"Unknown route {self.path}", "NOT_FOUND"))
+            return
+        try:
+            request = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, _error_body(400, "Invalid JSON payload", "INVALID_ARGUMENT"))
+            return
+        self.server.standin.handle(self, match.group("model"), request, stream=match.group("method") != "generateContent")
+
+    def _send_json(self, code: int, payload: dict[str, Any]) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, payloads: list[dict[str, Any]], interval: float, stopping: threading.Event) -> None:
+        """Send ``payloads`` as a chunked JSON array, one element every ``interval`` seconds."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, payload in enumerate(payloads):
+            if interval:
+                stopping.wait(interval)
+            prefix = "[" if index == 0 else ","
+            self._write_chunk((prefix + json.dumps(payload, ensure_ascii=False)).encode("utf-8"))
+        self._write_chunk(b"]" if payloads else b"[]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+class _StandinHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    standin: "GeminiStandinServer"
+
+
+class GeminiStandinServer:
+    """Threaded HTTP server; use as a context manager or call :meth:`start`/:meth:`stop`."""
+
+    def __init__(self, behavior: StandinBehavior | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.behavior = behavior or StandinBehavior()
+        self._rng = random.Random(self.behavior.seed)
+        self._lock = threading.Lock()
+        self._script = list(self.behavior.script)
+        self._stopping = threading.Event()
+        self._httpd = _StandinHTTPServer((host, port), _Handler)
+        self._httpd.standin = self
+        self._thread: threading.Thread | None = None
+        self.outcomes: Counter[str] = Counter()
+        self.requests = 0
+        self.images = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "GeminiStandinServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="gemini-standin", daemon=True)
+        self._thread.start()
+        logger.info("Gemini stand-in listening on %s", self.url)
+        return self
+
+    def stop(self) -> None:
+        self._stopping.set()  # releases held-back "timeout" responses
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "GeminiStandinServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _draw(self) -> tuple[str, float]:
+        behavior = self.behavior
+        with self._lock:
+            self.requests += 1
+            latency = behavior.latency.sample(self._rng)
+            if self._script:
+                outcome = self._script.pop(0)
+            else:
+                roll = self._rng.random()
+                outcome = "ok"
+                threshold = 0.0
+                for name, rate in (
+                    ("quota", behavior.quota_error_rate),
+                    ("malformed", behavior.malformed_rate),
+                    ("timeout", behavior.timeout_rate),
+                    ("error", behavior.error_rate),
+                ):
+                    threshold += rate
+                    if roll < threshold:
+                        outcome = name
+                        break
+            self.outcomes[outcome] += 1
+            return outcome, latency
+
+    def handle(self, handler: _Handler, model: str, request: dict[str, Any], *, stream: bool = False) -> None:
+        prompt, images = _read_contents(request)
+        with self._lock:
+            self.images += len(images)
+        outcome, latency = self._draw()
+
+        if outcome == "timeout":
+            self._stopping.wait(self.behavior.hang_seconds)
+        elif latency and not (stream and outcome in {"ok", "malformed"}):
+            self._stopping.wait(latency)
+
+        if outcome == "quota":
+            delay = self.behavior.retry_delay_seconds
+            body = _error_body(429, "Resource has been exhausted (e.g. check quota).", "RESOURCE_EXHAUSTED")
+            body["error"]["details"] = [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": f"{delay}s"}]
+            handler._send_json(429, body)
+        elif outcome == "error":
+            handler._send_json(500, _error_body(500, "Internal error encountered.", "INTERNAL"))
+        else:
+            text = json.dumps(_build_payload(prompt, images), ensure_ascii=False)
+            if outcome == "malformed":
+                text = text[: max(1, len(text) // 2)]
+            if not stream:
+                handler._send_json(200, _generate_response(text, prompt, images))
+                return
+            size = max(1, self.behavior.stream_chunk_chars)
+            pieces = [text[index : index + size] for index in range(0, len(text), size)] or [""]
+            payloads = [_generate_response(piece, prompt, images) for piece in pieces]
+            handler._send_stream(payloads, latency / len(payloads), self._stopping)
+
+
+def _read_contents(request: dict[str, Any]) -> tuple[str, list[bytes]]:
+    texts: list[str] = []
+    images: list[bytes] = []
+    for content in request.get("contents", []):
+        for part in content.get("parts", []):
+            if "text" in part:
+                texts.append(part["text"])
+            inline = part.get("inlineData") or part.get("inline_data")
+            if inline:
+                images.append(base64.b64decode(inline.get("data", "")))
+    return "\n".join(texts), images
+
+
+def _image_payload(image: bytes) -> dict[str, Any]:
+    digest = hashlib.sha256(image).digest()
+    severity = _SEVERITIES[digest[0] % len(_SEVERITIES)]
+    return {
+        "schema_version": "1.4",
+        "security_level": "high" if severity in {"high", "critical"} else "medium",
+        "perimeter_score": digest[1] % 11,
+        "access_control_score": digest[2] % 11,
+        "fire_safety_score": digest[3] % 11,
+        "structural_score": digest[4] % 11,
+        "hygiene_score": digest[5] % 11,
+        "vulnerabilities": [
+            {
+                "category": "perimeter",
+                "type": "fence_breach",
+                "description": "Brèche simulée dans la clôture",
+                "severity": severity,
+                "location": "périmètre",
+                "recommendation": "Réparer la clôture",
+            }
+        ],
+        "security_assets": [],
+        "immediate_risks": [],
+        "notes": {"uncertainties": ["réponse simulée"], "assumptions": []},
+    }
+
+
+def _build_payload(prompt: str, images: list[bytes]) -> Any:
+    if "MODE LOT" in prompt:
+        return [dict(_image_payload(image), image_index=index) for index, image in enumerate(images, start=1)]
+    if images:
+        return _image_payload(images[0])
+    return {
+        "summary": "Synthèse simulée : niveau de risque à confirmer sur site.",
+        "key_findings": ["Observation simulée"],
+        "recommendations": ["Action simulée A", "Action simulée B"],
+        "warnings": [],
+    }
+
+
+def _generate_response(text: str, prompt: str, images: list[bytes]) -> dict[str, Any]:
+    prompt_tokens = len(prompt) // 4 + 258 * len(images)
+    output_tokens = len(text) // 4
+    return {
+        "candidates": [
+            {
+                "content": {"role": "model", "parts": [{"text": text}]},
+                "finishReason": "STOP",
+                "index": 0,
+            }
+        ],
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens,
+        },
+    }
+
+
+def _error_body(code: int, message: str, status: str) -> dict[str, Any]:
+    return {"error": {"code": code, "message": message, "status": status}}
+
@@ -1,16 +1,28 @@
 from __future__ import annotations
+
 import json
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
 from app.core.config import settings
+from app.pipelines.models import Observation
 from app.services.advanced_analyzer import (
     AdvancedAnalyzer,
     GeminiAnalysisResult,
     build_gemini_summary,
     gemini_to_observations,
 )
-from app.pipelines.models import Observation
+
+
+@pytest.fixture()
+def gemini_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Analyzers built by the test see Gemini enabled with a dummy key."""
+    monkeypatch.setattr(settings, "GEMINI_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", "dummy-key", raising=False)
+
+
 def _fake_gemini_response() -> str:
     return json.dumps(
         {
@@ -33,6 +45,8 @@ def _fake_gemini_response() -> str:
             "immediate_risks": ["Intrusion possible"]
         }
     )
+
+
 def test_gemini_to_observations_maps_vulnerabilities(tmp_path: Path) -> None:
     image_path = tmp_path / "scene.jpg"
     image_path.write_bytes(b"fake")
@@ -48,6 +62,8 @@ def test_gemini_to_observations_maps_vulnerabilities(tmp_path: Path) -> None:
     assert level_obs.label == "security_level_alert"
     assert level_obs.severity == "critical"
     assert level_obs.extra["security_level"] == "critical"
+
+
 def test_advanced_analyzer_disabled(tmp_path: Path) -> None:
     analyzer = AdvancedAnalyzer()
     with patch.object(analyzer, "enabled", False):
@@ -60,14 +76,15 @@ def test_advanced_analyzer_disabled(tmp_path: Path) -> None:
     assert result.payloads == []
     assert result.prompt_hash is None
     assert result.duration_ms is None
+
+
 @patch("app.services.advanced_analyzer.AdvancedAnalyzer._call_gemini", return_value=_fake_gemini_response())
-def test_advanced_analyzer_generates_summary(mock_call, tmp_path: Path) -> None:
+def test_advanced_analyzer_generates_summary(mock_call, tmp_path: Path, gemini_enabled: None) -> None:
     analyzer = AdvancedAnalyzer()
-    with patch.object(analyzer, "enabled", True), patch.object(analyzer, "api_key", "dummy-key"):
-        result = analyzer.analyze(
-            "batch-x",
-            [(tmp_path / "scene.jpg", "main_gate", "datacenter")],
-        )
+    result = analyzer.analyze(
+        "batch-x",
+        [(tmp_path / "scene.jpg", "main_gate", "datacenter")],
+    )
     assert result.status == "ok"
     assert result.observations
     assert result.summary is not None
@@ -81,7 +98,222 @@ def test_advanced_analyzer_generates_summary(mock_call, tmp_path: Path) -> None:
     assert result.duration_ms is not None
     assert result.payloads and len(result.payloads) == 1
     assert result.payloads[0]["security_level"] == "critical"
+
+
 def test_build_gemini_summary_handles_empty() -> None:
     assert build_gemini_summary([], []) is None
     summary = build_gemini_summary([Observation("file", "security_level_alert", 0.9, "high")], ["warn"])
     assert summary is not None
+
+
+def test_advanced_analyzer_runs_images_concurrently_in_order(tmp_path: Path, gemini_enabled: None) -> None:
+    import threading
+    import time
+
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_call(image_path: Path, prompt: str, prompt_hash: str) -> str:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.1)
+        with lock:
+            in_flight -= 1
+        payload = json.loads(_fake_gemini_response())
+        payload["notes"] = {"image": image_path.name}
+        return json.dumps(payload)
+
+    analyzer = AdvancedAnalyzer()
+    images = [(tmp_path / f"scene-{index}.jpg", None, None) for index in range(6)]
+    with patch.object(analyzer, "max_concurrency", 3), patch.object(analyzer, "_call_gemini", side_effect=fake_call):
+        result = analyzer.analyze("batch-x", images)
+
+    assert 1 < peak <= 3
+    assert [payload["notes"]["image"] for payload in result.payloads] == [path.name for path, _, _ in images]
+
+
+def test_advanced_analyzer_replays_cached_responses(tmp_path: Path, gemini_enabled: None) -> None:
+    from app.services.response_cache import ResponseCache
+
+    image_path = tmp_path / "scene.jpg"
+    image_path.write_bytes(b"jpeg-bytes")
+    cache = ResponseCache(tmp_path / "cache.sqlite3", ttl_seconds=3600, max_bytes=0)
+    analyzer = AdvancedAnalyzer(response_cache=cache)
+    with patch.object(analyzer, "_call_gemini", return_value=_fake_gemini_response()) as mock_call:
+        first = analyzer.analyze("batch-1", [(image_path, "main_gate", "bank")])
+        second = analyzer.analyze("batch-2", [(image_path, "main_gate", "bank")])
+        other_prompt = analyzer.analyze("batch-3", [(image_path, "main_gate", "ngo")])
+
+    assert mock_call.call_count == 2
+    assert (first.cache_hits, first.cache_misses) == (0, 1)
+    assert (second.cache_hits, second.cache_misses) == (1, 0)
+    assert other_prompt.cache_misses == 1
+    assert [obs.label for obs in second.observations] == [obs.label for obs in first.observations]
+    assert second.payloads == first.payloads
+
+
+def test_advanced_analyzer_reports_upload_stats(tmp_path: Path, gemini_enabled: None) -> None:
+    from PIL import Image
+
+    image_path = tmp_path / "scene.png"
+    Image.effect_noise((2400, 1800), 50).convert("RGB").save(image_path)
+    analyzer = AdvancedAnalyzer(response_cache=None)
+    with patch.object(analyzer, "response_cache", None), patch.object(
+        analyzer, "_call_gemini", return_value=_fake_gemini_response()
+    ):
+        result = analyzer.analyze("batch-upload", [(image_path, None, None)])
+
+    stats = result.upload_stats
+    assert stats["images"] == 1
+    assert stats["original_bytes"] == image_path.stat().st_size
+    assert 0 < stats["uploaded_bytes"] < stats["original_bytes"]
+    assert stats["bytes_saved"] == stats["original_bytes"] - stats["uploaded_bytes"]
+    assert stats["call_ms"] >= 0
+
+
+def test_parse_group_response_validates_and_orders_entries() -> None:
+    from app.services.advanced_analyzer import parse_group_response
+
+    entry = json.loads(_fake_gemini_response())
+    response = json.dumps({"images": [dict(entry, image_index=2, notes="b"), dict(entry, image_index=1, notes="a")]})
+    payloads = parse_group_response(response, 2)
+    assert payloads is not None
+    assert [payload["notes"] for payload in payloads] == ["a", "b"]
+    assert all("image_index" not in payload for payload in payloads)
+    assert parse_group_response(json.dumps([entry, entry]), 2) is not None
+    assert parse_group_response(json.dumps([entry]), 2) is None
+    assert parse_group_response(json.dumps([dict(entry, image_index=1), dict(entry, image_index=1)]), 2) is None
+    assert parse_group_response("not json", 2) is None
+
+
+def test_advanced_analyzer_groups_images_by_zone_and_site_type(tmp_path: Path, gemini_enabled: None) -> None:
+    entry = json.loads(_fake_gemini_response())
+    group_calls: list[list[str]] = []
+
+    def fake_group(image_paths: list[Path], prompt: str, prompt_hash: str) -> str:
+        group_calls.append([path.name for path in image_paths])
+        assert "MODE LOT" in prompt
+        return json.dumps([dict(entry, image_index=i + 1, notes=path.name) for i, path in enumerate(image_paths)])
+
+    images = [
+        (tmp_path / "a.jpg", "gate", "bank"),
+        (tmp_path / "b.jpg", "yard", "bank"),
+        (tmp_path / "c.jpg", "gate", "bank"),
+        (tmp_path / "d.jpg", "gate", "bank"),
+    ]
+    analyzer = AdvancedAnalyzer()
+    with patch.object(analyzer, "response_cache", None), patch.object(analyzer, "group_size", 3), patch.object(
+        analyzer, "_call_gemini_group", side_effect=fake_group
+    ), patch.object(analyzer, "_call_gemini", return_value=json.dumps(dict(entry, notes="b.jpg"))) as single:
+        result = analyzer.analyze("batch-group", images)
+
+    assert group_calls == [["a.jpg", "c.jpg", "d.jpg"]]
+    assert single.call_count == 1
+    assert [payload["notes"] for payload in result.payloads] == ["a.jpg", "b.jpg", "c.jpg", "d.jpg"]
+    assert (result.grouped_images, result.group_fallbacks) == (3, 0)
+
+
+def test_advanced_analyzer_falls_back_when_group_response_invalid(tmp_path: Path, gemini_enabled: None) -> None:
+    from app.services.response_cache import ResponseCache
+
+    images = [(tmp_path / f"scene-{index}.jpg", "gate", "bank") for index in range(2)]
+    for path, _, _ in images:
+        path.write_bytes(path.name.encode())
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    analyzer = AdvancedAnalyzer(response_cache=cache)
+    with patch.object(analyzer, "group_size", 4), patch.object(
+        analyzer, "_call_gemini_group", return_value='[{"image_index": 1}]'
+    ), patch.object(
+        analyzer, "_call_gemini", return_value=_fake_gemini_response()
+    ) as single:
+        result = analyzer.analyze("batch-fallback", images)
+        replay = analyzer.analyze("batch-replay", images)
+
+    assert single.call_count == 2
+    assert result.group_fallbacks == 2
+    assert len(result.payloads) == 2
+    assert (replay.cache_hits, replay.group_fallbacks) == (2, 0)
+
+
+def test_advanced_analyzer_trips_shared_breaker_and_skips(tmp_path: Path, gemini_enabled: None) -> None:
+    from app.services.circuit_breaker import CircuitBreaker
+
+    class ResourceExhausted(Exception):
+        pass
+
+    class _QuotaClient:
+        calls = 0
+
+        def generate(self, *args: object, **kwargs: object) -> object:
+            _QuotaClient.calls += 1
+            raise ResourceExhausted("429 Quota exceeded")
+
+    image_path = tmp_path / "scene.jpg"
+    image_path.write_bytes(b"jpeg-bytes")
+    breaker = CircuitBreaker("gemini-test", failure_threshold=2, reset_seconds=300)
+    analyzer = AdvancedAnalyzer(circuit_breaker=breaker)
+    with patch.object(analyzer, "response_cache", None), patch.object(analyzer, "max_retries", 5), patch.object(
+        analyzer, "max_concurrency", 1
+    ), patch(
+        "app.services.advanced_analyzer.get_gemini_client", return_value=_QuotaClient()
+    ), patch("app.services.advanced_analyzer.time.sleep"):
+        first = analyzer.analyze("batch-quota", [(image_path, None, None), (image_path, None, None)])
+        second = analyzer.analyze("batch-after", [(image_path, None, None)])
+
+    assert _QuotaClient.calls == 2
+    assert breaker.state == "open"
+    assert first.status == "skipped"
+    assert any(warning.startswith("gemini-circuit-open") for warning in first.warnings)
+    assert (second.status, second.warnings) == ("skipped", ["gemini-circuit-open"])
+
+
+def test_advanced_analyzer_reports_progress_and_honours_cancellation(tmp_path: Path, gemini_enabled: None) -> None:
+    import threading
+
+    from app.services.advanced_analyzer import AnalysisCancelled
+
+    cancel = threading.Event()
+    progress: list[tuple[int, int, str]] = []
+
+    def on_progress(done: int, total: int, name: str) -> None:
+        progress.append((done, total, name))
+        if done == 2:
+            cancel.set()
+
+    analyzer = AdvancedAnalyzer()
+    images = [(tmp_path / f"scene-{index}.jpg", None, None) for index in range(4)]
+    with patch.object(analyzer, "max_concurrency", 1), patch.object(
+        analyzer, "_call_gemini", return_value=_fake_gemini_response()
+    ) as mock_call:
+        result = analyzer.analyze("batch-progress", images[:1], progress=on_progress)
+        assert result.status == "ok"
+        progress.clear()
+        with pytest.raises(AnalysisCancelled):
+            analyzer.analyze("batch-cancel", images, progress=on_progress, cancel_event=cancel)
+
+    assert [entry[:2] for entry in progress] == [(1, 4), (2, 4)]
+    assert progress[-1][2] == "scene-1.jpg"
+    assert mock_call.call_count == 3
+
+
+def test_rate_limit_timeout_during_half_open_probe_releases_it(tmp_path: Path) -> None:
+    from app.services.circuit_breaker import CircuitBreaker
+    from app.services.rate_limiter import RateLimitTimeout
+
+    class _SaturatedLimiter:
+        def acquire(self, tokens: int, timeout: float | None = None) -> float:
+            raise RateLimitTimeout("no capacity before deadline")
+
+    breaker = CircuitBreaker("gemini-test", failure_threshold=1, reset_seconds=0)
+    breaker.record_failure(TimeoutError("timed out"))
+    analyzer = AdvancedAnalyzer(rate_limiter=_SaturatedLimiter(), circuit_breaker=breaker)  # type: ignore[arg-type]
+    with patch("app.services.advanced_analyzer.get_gemini_client"):
+        with pytest.raises(RuntimeError, match="Gemini call failed"):
+            analyzer._generate([{"text": "scene"}], "prompt", "hash", label="scene.jpg")
+
+    assert breaker.state == "half_open"
+    assert not breaker.is_open()
+    assert breaker.allow()  # the probe is available again
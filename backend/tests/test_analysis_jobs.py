@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from app.services.analysis_jobs import AnalysisJob, AnalysisJobManager
+from app.services.events import event_bus
+
+
+async def _wait_finished(job: AnalysisJob) -> None:
+    assert job.task is not None
+    await job.task
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_deduplicated_per_batch_and_publish_events() -> None:
+    manager = AnalysisJobManager(max_concurrent=2)
+    release = asyncio.Event()
+    queue = await event_bus.subscribe()
+
+    async def runner(job: AnalysisJob) -> None:
+        await release.wait()
+        job.analysis_id = 42
+
+    try:
+        job, created = manager.submit("batch-1", 3, runner, requested_by="qa")
+        again, created_again = manager.submit("batch-1", 3, runner, requested_by="qa")
+        assert created and not created_again
+        assert again is job
+        await asyncio.sleep(0.01)
+        assert job.status == "running"
+
+        release.set()
+        await _wait_finished(job)
+        assert job.status == "completed" and job.analysis_id == 42
+        assert manager.active_for("batch-1") is None
+
+        statuses = []
+        while not queue.empty():
+            message = json.loads(queue.get_nowait())
+            if message.get("batchId") == "batch-1":
+                statuses.append(message["analysisJob"]["status"])
+        assert statuses[0] == "queued" and statuses[-1] == "completed"
+    finally:
+        await event_bus.unsubscribe(queue)
+
+
+@pytest.mark.asyncio
+async def test_queued_job_cancels_immediately_and_running_job_via_event() -> None:
+    manager = AnalysisJobManager(max_concurrent=1)
+    started = asyncio.Event()
+
+    async def runner(job: AnalysisJob) -> None:
+        started.set()
+        while not job.cancel_event.is_set():
+            await asyncio.sleep(0.01)
+
+    running, _ = manager.submit("batch-a", 1, runner, requested_by="qa")
+    queued, _ = manager.submit("batch-b", 1, runner, requested_by="qa")
+    await started.wait()
+    assert queued.status == "queued"
+
+    manager.cancel(queued.job_id)
+    await asyncio.gather(queued.task, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert queued.status == "cancelled"
+    assert manager.active_for("batch-b") is None
+
+    manager.cancel(running.job_id)
+    await _wait_finished(running)
+    assert running.status == "cancelled"
+    assert manager.cancel("unknown") is None
+
+
+@pytest.mark.asyncio
+async def test_failing_runner_marks_job_failed() -> None:
+    manager = AnalysisJobManager()
+
+    async def runner(job: AnalysisJob) -> None:
+        raise RuntimeError("boom")
+
+    job, _ = manager.submit("batch-x", 1, runner, requested_by="qa")
+    await _wait_finished(job)
+    assert (job.status, job.error) == ("failed", "boom")
+
+
+@pytest.mark.asyncio
+async def test_rerun_job_persists_cache_statistics_with_the_analysis(tmp_path: Path) -> None:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlmodel import SQLModel
+
+    from app.api.v1.endpoints.ingestion import _run_analysis_job, _serialize_gemini_record
+    from app.repositories import batches as batch_repo
+    from app.services.advanced_analyzer import GeminiAnalysisResult
+
+    class _CachedAnalyzer:
+        model = "gemini-test"
+
+        def analyze(self, batch_id: str, images: object, **kwargs: object) -> GeminiAnalysisResult:
+            return GeminiAnalysisResult(
+                observations=[], summary=None, status="no_insights", warnings=[], cache_hits=2, cache_misses=1
+            )
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'jobs.db').as_posix()}", future=True)
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        async with factory() as session:
+            await batch_repo.create_batch(session, "batch-cache", "completed", [])
+
+        job = AnalysisJob(job_id="job-cache", batch_id="batch-cache", requested_by="qa", total_images=3)
+        await _run_analysis_job(job, _CachedAnalyzer(), [], factory, tmp_path)  # type: ignore[arg-type]
+
+        async with factory() as session:
+            record = await batch_repo.get_latest_gemini_analysis(session, "batch-cache")
+    finally:
+        await engine.dispose()
+
+    assert record is not None and record.id == job.analysis_id
+    assert (record.cache_hits, record.cache_misses) == (2, 1)
+    serialized = _serialize_gemini_record(record)
+    assert (serialized.cache_hits, serialized.cache_misses) == (2, 1)
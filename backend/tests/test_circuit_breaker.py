@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+from fastapi import status
+from httpx import ASGITransport
+
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError, is_quota_or_timeout
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ResourceExhausted(Exception):
+    pass
+
+
+def test_quota_and_timeout_failures_are_recognised() -> None:
+    assert is_quota_or_timeout(ResourceExhausted("429 Quota exceeded"))
+    assert is_quota_or_timeout(TimeoutError())
+    assert is_quota_or_timeout(RuntimeError("Deadline Exceeded"))
+    assert not is_quota_or_timeout(ValueError("invalid image"))
+    assert not is_quota_or_timeout(CircuitOpenError("circuit gemini open"))
+
+
+def test_breaker_opens_after_threshold_and_probes_after_reset() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=30, clock=clock)
+    assert not breaker.record_failure(ResourceExhausted("quota"))
+    assert breaker.record_failure(ResourceExhausted("quota"))
+    assert breaker.state == "open" and breaker.is_open()
+    assert not breaker.allow()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    clock.now += 31
+    assert not breaker.is_open()
+    assert breaker.allow()  # the single half-open probe
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["trips"] == 1
+    assert breaker.snapshot()["rejected_calls"] == 3
+
+
+def test_failed_probe_reopens_and_unrelated_errors_reset_count() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=10, clock=clock)
+    breaker.record_failure(TimeoutError("timed out"))
+    breaker.record_failure(ValueError("bad payload"))
+    assert breaker.snapshot()["consecutive_failures"] == 0
+
+    breaker.record_failure(TimeoutError("timed out"))
+    breaker.record_failure(TimeoutError("timed out"))
+    clock.now += 11
+    assert breaker.allow()
+    assert breaker.record_failure(TimeoutError("timed out"))
+    assert breaker.state == "open"
+    assert breaker.snapshot()["retry_in_seconds"] == 10.0
+
+
+@pytest.mark.asyncio
+async def test_circuit_state_endpoint() -> None:
+    from app.main import app
+
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/v1/ingestion/gemini/circuit")
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["name"] == "gemini"
+    assert body["state"] in {"closed", "open", "half_open"}
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from app.services import report
+from app.services.content_store import ContentStore, HashingWriter
+from app.services.report import REPORT_STORE_DIRNAME, ReportBuilder
+from tests.test_report import _dummy_pipeline_result
+
+
+def _publish(store: ContentStore, data: bytes, destination: Path):
+    with store.writer() as sink:
+        sink.write(data[:3])
+        sink.write(data[3:])
+    return store.publish(sink, destination)
+
+
+def test_publish_hashes_while_writing_and_deduplicates(tmp_path: Path) -> None:
+    store = ContentStore(tmp_path / "store", suffix=".pdf")
+    destination = tmp_path / "report-a.pdf"
+
+    first = _publish(store, b"%PDF-one", destination)
+    again = _publish(store, b"%PDF-one", tmp_path / "report-b.pdf")
+
+    assert first.checksum_sha256 == hashlib.sha256(b"%PDF-one").hexdigest()
+    assert destination.read_bytes() == b"%PDF-one"
+    assert not first.deduplicated and again.deduplicated
+    assert again.blob == first.blob
+    assert [path.name for path in (tmp_path / "store").iterdir()] == [first.blob.name]
+
+
+def test_republishing_replaces_and_prunes_the_previous_blob(tmp_path: Path) -> None:
+    store = ContentStore(tmp_path / "store", suffix=".pdf")
+    destination = tmp_path / "report-a.pdf"
+
+    old = _publish(store, b"%PDF-old", destination)
+    _publish(store, b"%PDF-old", destination)
+    new = _publish(store, b"%PDF-new", destination)
+
+    assert destination.read_bytes() == b"%PDF-new"
+    assert not old.blob.exists() and new.blob.exists()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["report-a.pdf", "store"]
+
+
+def test_resolve_finds_the_blob_behind_a_published_name(tmp_path: Path) -> None:
+    store = ContentStore(tmp_path / "store", suffix=".pdf")
+    destination = tmp_path / "report-a.pdf"
+    old = _publish(store, b"%PDF-old", destination)
+    new = _publish(store, b"%PDF-new", destination)
+    copy = tmp_path / "report-copy.pdf"
+    copy.write_bytes(b"%PDF-new")
+
+    assert store.resolve(destination, checksum_hint=new.checksum_sha256) == new.blob
+    assert store.resolve(destination, checksum_hint=old.checksum_sha256) == new.blob
+    assert store.resolve(destination) == new.blob
+    assert store.resolve(copy) is None
+    assert store.resolve(tmp_path / "missing.pdf") is None
+
+
+def test_failed_render_leaves_the_published_report_untouched(tmp_path: Path) -> None:
+    store = ContentStore(tmp_path / "store")
+    destination = tmp_path / "report-a.pdf"
+    _publish(store, b"%PDF-good", destination)
+
+    with pytest.raises(RuntimeError):
+        with store.writer() as sink:
+            sink.write(b"%PDF-partial")
+            raise RuntimeError("render failed")
+
+    assert destination.read_bytes() == b"%PDF-good"
+    assert len(list((tmp_path / "store").iterdir())) == 1
+
+
+@pytest.mark.parametrize("section_cache", [True, False])
+def test_identical_reports_are_not_rewritten(tmp_path: Path, section_cache: bool) -> None:
+    builder = ReportBuilder(output_dir=tmp_path, section_cache=section_cache)
+    context = builder.build_context(_dummy_pipeline_result(tmp_path))
+
+    first = builder.render(context)
+    second = builder.render(context)
+
+    assert second.checksum_sha256 == first.checksum_sha256 == hashlib.sha256(first.path.read_bytes()).hexdigest()
+    assert second.deduplicated
+    assert len(list((tmp_path / REPORT_STORE_DIRNAME).iterdir())) == 1
+
+
+@pytest.mark.parametrize("section_cache", [True, False])
+def test_pdf_is_streamed_into_the_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, section_cache: bool) -> None:
+    writes: list[int] = []
+    original = HashingWriter.write
+
+    def recording_write(self: HashingWriter, data: bytes) -> int:
+        writes.append(len(data))
+        return original(self, data)
+
+    monkeypatch.setattr(HashingWriter, "write", recording_write)
+    builder = ReportBuilder(output_dir=tmp_path, section_cache=section_cache, large_batch_threshold=1)
+    artifact = builder.render(builder.build_context(_dummy_pipeline_result(tmp_path)))
+
+    assert artifact.detail_csv is not None
+    assert len(writes) > 1 and max(writes) < sum(writes) == artifact.path.stat().st_size
+    assert [path.name for path in (tmp_path / REPORT_STORE_DIRNAME).iterdir()] == [f"{artifact.checksum_sha256}.pdf"]
+
+
+def test_reports_render_without_pymupdf(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(report, "fitz", None)
+    builder = ReportBuilder(output_dir=tmp_path, large_batch_threshold=1)
+
+    artifact = builder.render(builder.build_context(_dummy_pipeline_result(tmp_path)))
+
+    assert artifact.path.read_bytes().startswith(b"%PDF")
+    assert artifact.reused_sections == () and artifact.detail_csv is not None
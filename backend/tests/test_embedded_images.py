@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from app.services import embedded_images
+from app.services.ocr_engine import EasyOCREngine, EasyOCRReaderPool
+
+pytest.importorskip("cv2")
+pytest.importorskip("numpy")
+
+
+def _png(color: tuple[int, int, int], size: tuple[int, int] = (200, 120)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _make_docx(path: Path, media: dict[str, bytes]) -> Path:
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(
+            "word/document.xml",
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            "<w:body><w:p><w:r><w:t>Annexe photos</w:t></w:r></w:p></w:body></w:document>",
+        )
+        for name, data in media.items():
+            archive.writestr(f"word/media/{name}", data)
+    return path
+
+
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def test_docx_images_are_deduplicated_and_filtered(tmp_path: Path) -> None:
+    red = _png((255, 0, 0))
+    path = _make_docx(
+        tmp_path / "rapport.docx",
+        {"image1.png": red, "image2.png": red, "image3.png": _png((0, 0, 255)), "image4.emf": b"vector"},
+    )
+    stats = embedded_images.EmbeddedImageStats()
+
+    images = list(embedded_images.iter_embedded_images(path, "rapport.docx", DOCX, stats=stats))
+
+    assert [image.name for image in images] == ["image1.png", "image3.png"]
+    assert images[0].label == "rapport.docx#image1.png"
+    assert (stats.found, stats.unique, stats.duplicates, stats.skipped) == (4, 2, 1, 1)
+
+
+def test_seen_hashes_are_shared_and_cap_applies(tmp_path: Path) -> None:
+    first = _make_docx(tmp_path / "a.docx", {"image1.png": _png((1, 2, 3))})
+    second = _make_docx(
+        tmp_path / "b.docx",
+        {"image1.png": _png((1, 2, 3)), "image2.png": _png((4, 5, 6)), "image3.png": _png((7, 8, 9))},
+    )
+    seen: set[str] = set()
+    assert len(list(embedded_images.iter_embedded_images(first, "a.docx", DOCX, seen=seen))) == 1
+
+    stats = embedded_images.EmbeddedImageStats()
+    images = list(embedded_images.iter_embedded_images(second, "b.docx", DOCX, seen=seen, stats=stats, max_images=1))
+    assert [image.name for image in images] == ["image2.png"]
+    assert stats.duplicates == 1
+    assert "embedded-images-capped" in stats.warnings
+
+
+def test_pdf_images_skip_rasterized_pages(tmp_path: Path) -> None:
+    fitz = pytest.importorskip("fitz")
+    document = fitz.open()
+    for color in ((255, 0, 0), (0, 255, 0)):
+        page = document.new_page()
+        page.insert_image(fitz.Rect(50, 50, 250, 170), stream=_png(color))
+    path = tmp_path / "annexes.pdf"
+    document.save(str(path))
+    document.close()
+
+    all_images = list(embedded_images.iter_embedded_images(path, "annexes.pdf", "application/pdf"))
+    assert [image.page for image in all_images] == [1, 2]
+
+    remaining = list(embedded_images.iter_embedded_images(path, "annexes.pdf", "application/pdf", skip_pages={1}))
+    assert [image.page for image in remaining] == [2]
+
+
+def test_decode_image_ignores_decorations() -> None:
+    assert embedded_images.decode_image(_png((0, 0, 0), size=(16, 16)), min_side=64) is None
+    decoded = embedded_images.decode_image(_png((0, 0, 0), size=(300, 100)), min_side=64)
+    assert decoded is not None and decoded.shape == (100, 300, 3)
+
+
+class _FakeReader:
+    def readtext(self, image, detail: int = 1, paragraph: bool = True):  # noqa: ANN001
+        return [([0, 0, 1, 1], "Sortie de secours", 0.9)]
+
+
+def test_engine_ocrs_docx_images_and_feeds_sink(tmp_path: Path) -> None:
+    known = _png((10, 10, 10))
+    path = _make_docx(tmp_path / "visite.docx", {"image1.png": known, "image2.png": _png((200, 30, 30))})
+    pool = EasyOCRReaderPool(max_readers=1, memory_budget_bytes=0, factory=lambda languages: _FakeReader())
+    engine = EasyOCREngine(["fr"], preprocess_mode="none", reader_pool=pool)
+    received: list[str] = []
+    engine.set_embedded_image_sink(
+        lambda image, decoded: received.append(image.label),
+        known_hashes=[hashlib.sha256(known).hexdigest()],
+    )
+
+    result = engine._extract_docx(path, "visite.docx", ("fr",))
+
+    assert received == ["visite.docx#image2.png"]
+    assert result.text.startswith("Annexe photos")
+    assert "[image2.png]\nSortie de secours" in result.text
+    assert result.extra["embedded_images"]["duplicates"] == 1
+    assert result.extra["embedded_images"]["analysed"] == 1
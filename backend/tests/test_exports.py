@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.db.session import get_session
+from app.main import app
+from app.models import AuditBatch, BatchReport, OCRText, ProcessingEvent, RiskScoreEntry, VisionObservation
+from app.services import exports
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'exports.db').as_posix()}", future=True)
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with factory() as session:
+        started = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+        session.add(AuditBatch(id="batch-x", status="completed", report_hash="f" * 64))
+        session.add_all(
+            VisionObservation(
+                batch_id="batch-x",
+                filename=f"photo-{index}.jpg",
+                label="incendie",
+                severity="high" if index % 2 else "low",
+                confidence=0.9,
+                bbox=[1, 2, 3, 4],
+                source="local",
+            )
+            for index in range(1200)
+        )
+        session.add_all(
+            [
+                OCRText(batch_id="batch-x", filename="long.txt", engine="text", content="Extincteur ", chunk_index=0),
+                OCRText(batch_id="batch-x", filename="long.txt", engine="text", content="absent.", chunk_index=1),
+                OCRText(batch_id="batch-x", filename="note.txt", engine="text", content="<script>x</script>"),
+                ProcessingEvent(batch_id="batch-x", code="ingestion:received", label="Reçu", progress=5, timestamp=started),
+                ProcessingEvent(
+                    batch_id="batch-x",
+                    code="report:available",
+                    label="Disponible",
+                    progress=100,
+                    timestamp=started + timedelta(minutes=2),
+                ),
+                RiskScoreEntry(
+                    batch_id="batch-x",
+                    total_score=12.5,
+                    normalized_score=0.125,
+                    breakdown=[{"label": "incendie", "severity": "high", "count": 600, "score": 12.5}],
+                ),
+                BatchReport(batch_id="batch-x", summary_text="Synthèse du lot.", status="ok", findings=["Extincteur"]),
+            ]
+        )
+        await session.commit()
+
+    async def _session_override():
+        async with factory() as session:
+            session.info["session_factory"] = factory
+            yield session
+
+    app.dependency_overrides[get_session] = _session_override
+    try:
+        yield factory
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+        await engine.dispose()
+
+
+async def _get(path: str):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(f"/api/v1/ingestion{path}")
+
+
+@pytest.mark.asyncio
+async def test_observations_ndjson_export_streams_all_rows(session_factory) -> None:
+    response = await _get("/batches/batch-x/exports/observations?format=ndjson")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert len(lines) == 1200
+    first = json.loads(lines[0])
+    assert first["filename"] == "photo-0.jpg" and first["bbox"] == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_csv_exports_merge_ocr_chunks_and_order_timeline(session_factory) -> None:
+    ocr = await _get("/batches/batch-x/exports/ocr?format=csv")
+    timeline = await _get("/batches/batch-x/exports/timeline?format=csv")
+
+    ocr_rows = list(csv.DictReader(io.StringIO(ocr.text)))
+    assert [row["filename"] for row in ocr_rows] == ["long.txt", "note.txt"]
+    assert ocr_rows[0]["text"] == "Extincteur absent."
+    assert 'attachment; filename="batch-x-ocr.csv"' == ocr.headers["content-disposition"]
+    assert [row["code"] for row in csv.DictReader(io.StringIO(timeline.text))] == ["ingestion:received", "report:available"]
+
+
+@pytest.mark.asyncio
+async def test_export_validation_errors(session_factory) -> None:
+    assert (await _get("/batches/batch-x/exports/files")).status_code == 404
+    assert (await _get("/batches/batch-x/exports/observations?format=xml")).status_code == 400
+    assert (await _get("/batches/unknown/exports/observations")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_html_report_is_self_contained_and_escaped(session_factory) -> None:
+    response = await _get("/reports/batch-x/html")
+
+    assert response.status_code == 200
+    body = response.text
+    assert body.startswith("<!DOCTYPE html>") and body.rstrip().endswith("</html>")
+    assert "Synthèse du lot." in body and "12.5 pts" in body
+    assert body.count('<td class="sev-high">') == 600
+    assert "&lt;script&gt;" in body and "<script>" not in body
+    assert "<link" not in body and "src=" not in body
+
+
+@pytest.mark.asyncio
+async def test_export_is_emitted_in_bounded_blocks(session_factory) -> None:
+    blocks = [block async for block in exports.stream_export(session_factory, "batch-x", "observations", "ndjson")]
+
+    assert len(blocks) == 3  # 1200 rows in blocks of EXPORT_CHUNK_ROWS
+    assert sum(block.count(b"\n") for block in blocks) == 1200
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import gemini_client
+
+pytestmark = pytest.mark.skipif(not gemini_client.is_available(), reason="google-generativeai not installed")
+
+CONFIG = {"temperature": 0.2, "response_mime_type": "application/json"}
+
+
+def test_client_is_shared_per_api_key() -> None:
+    first = gemini_client.get_gemini_client("key-a")
+    assert gemini_client.get_gemini_client("key-a") is first
+    assert gemini_client.get_gemini_client("key-b") is not first
+
+
+def test_model_handles_are_cached_and_share_one_connection() -> None:
+    client = gemini_client.GeminiClient("key-c")
+    handle = client.model("gemini-2.0-flash", CONFIG)
+
+    assert client.model("gemini-2.0-flash", dict(reversed(list(CONFIG.items())))) is handle
+    other = client.model("gemini-2.0-flash", {**CONFIG, "temperature": 0.3})
+    assert other is not handle
+    assert other._client is handle._client
+
+
+def test_model_handles_send_requests_through_the_shared_service(monkeypatch: pytest.MonkeyPatch) -> None:
+    requests: list[object] = []
+
+    class _Service:
+        def generate_content(self, request, **kwargs):  # noqa: ANN001, ANN003
+            requests.append(request)
+            return gemini_client.glm.GenerateContentResponse()
+
+    client = gemini_client.GeminiClient("key-d")
+    monkeypatch.setattr(client, "_service", _Service())
+    handle = client.model("gemini-2.0-flash", CONFIG)
+    assert "_client" in vars(handle), "google-generativeai no longer exposes GenerativeModel._client"
+
+    client.generate("gemini-2.0-flash", "bonjour", generation_config=CONFIG)
+
+    assert len(requests) == 1
+    assert requests[0].model == "models/gemini-2.0-flash"
+
+
+def test_extract_response_text_falls_back_to_candidates() -> None:
+    part = SimpleNamespace(text='{"ok": true}')
+    response = SimpleNamespace(text=None, candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+    assert gemini_client.extract_response_text(response) == '{"ok": true}'
+    assert gemini_client.extract_response_text(SimpleNamespace(text=None, candidates=[])) is None
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from app.core.config import settings
+from app.services.advanced_analyzer import AdvancedAnalyzer, _extract_retry_delay_seconds
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.rate_limiter import TokenBucketRateLimiter
+from app.services.report_summary import ReportSummaryService
+from tests.gemini_standin import GeminiStandinServer, LatencyProfile, StandinBehavior
+from tests.test_report_summary import _make_request
+
+
+@pytest.fixture()
+def scene(tmp_path: Path) -> Path:
+    path = tmp_path / "scene.jpg"
+    Image.new("RGB", (64, 48), (120, 80, 40)).save(path)
+    return path
+
+
+def _analyzer(monkeypatch: pytest.MonkeyPatch, server: GeminiStandinServer, **overrides: object) -> AdvancedAnalyzer:
+    monkeypatch.setattr(settings, "GEMINI_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", "standin-key", raising=False)
+    monkeypatch.setattr(settings, "GEMINI_API_ENDPOINT", server.url, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_MAX_RETRIES", 2, raising=False)
+    for name, value in overrides.items():
+        monkeypatch.setattr(settings, name, value, raising=False)
+    analyzer = AdvancedAnalyzer(
+        rate_limiter=TokenBucketRateLimiter(0),
+        circuit_breaker=CircuitBreaker("standin-test", failure_threshold=5, reset_seconds=60),
+    )
+    analyzer.response_cache = None
+    return analyzer
+
+
+def test_latency_profile_parse_and_sample() -> None:
+    import random
+
+    profile = LatencyProfile.parse("uniform:300:100")
+    assert (profile.distribution, profile.mean_ms, profile.spread) == ("uniform", 300.0, 100.0)
+    assert 0.2 <= profile.sample(random.Random(1)) <= 0.4
+    assert LatencyProfile.parse("fixed:0").sample(random.Random(1)) == 0.0
+
+
+def test_analyzer_round_trip_through_standin(monkeypatch: pytest.MonkeyPatch, scene: Path) -> None:
+    with GeminiStandinServer(StandinBehavior(latency=LatencyProfile.parse("fixed:20"))) as server:
+        analyzer = _analyzer(monkeypatch, server)
+        result = analyzer.analyze("batch-standin", [(scene, "gate", "generic")])
+
+    assert result.status == "ok"
+    assert result.observations
+    assert server.requests == 1
+    assert server.images == 1
+    assert result.upload_stats["images"] == 1
+
+
+def test_quota_error_is_retried_with_retry_info_delay(monkeypatch: pytest.MonkeyPatch, scene: Path) -> None:
+    behavior = StandinBehavior(retry_delay_seconds=0.2, script=["quota", "ok"])
+    with GeminiStandinServer(behavior) as server:
+        analyzer = _analyzer(monkeypatch, server)
+        result = analyzer.analyze("batch-quota", [(scene, "gate", "generic")])
+
+    assert result.status == "ok"
+    assert server.outcomes == {"quota": 1, "ok": 1}
+    assert analyzer.circuit_breaker.state == "closed"
+
+
+def test_malformed_response_is_reported(monkeypatch: pytest.MonkeyPatch, scene: Path) -> None:
+    with GeminiStandinServer(StandinBehavior(script=["malformed"])) as server:
+        analyzer = _analyzer(monkeypatch, server)
+        result = analyzer.analyze("batch-malformed", [(scene, "gate", "generic")])
+
+    assert any(warning.startswith("gemini-response-invalid:scene.jpg") for warning in result.warnings)
+    assert not result.observations
+
+
+def test_timeouts_trip_the_circuit_breaker(monkeypatch: pytest.MonkeyPatch, scene: Path) -> None:
+    behavior = StandinBehavior(timeout_rate=1.0, hang_seconds=5)
+    with GeminiStandinServer(behavior) as server:
+        analyzer = _analyzer(monkeypatch, server, GEMINI_TIMEOUT_SECONDS=1, GEMINI_MAX_RETRIES=0)
+        analyzer.circuit_breaker = CircuitBreaker("standin-timeout", failure_threshold=1, reset_seconds=60)
+        result = analyzer.analyze("batch-timeout", [(scene, "gate", "generic")])
+
+    assert analyzer.circuit_breaker.state == "open"
+    assert any(warning.startswith("gemini-circuit-open") for warning in result.warnings)
+
+
+def test_report_summary_through_standin(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_REQUIRED", False, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_API_KEY", "standin-key", raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_MAX_RETRIES", 0, raising=False)
+    monkeypatch.setattr(settings, "SUMMARY_FALLBACK_ENABLED", False, raising=False)
+    with GeminiStandinServer() as server:
+        monkeypatch.setattr(settings, "GEMINI_API_ENDPOINT", server.url, raising=False)
+        service = ReportSummaryService(circuit_breaker=CircuitBreaker("standin-summary"))
+        service.summary_cache = None
+        result = service.generate(_make_request())
+
+    assert result.status == "ok"
+    assert result.text and "simulée" in result.text
+    assert result.recommendations == ["Action simulée A", "Action simulée B"]
+
+
+def test_retry_delay_is_read_from_rest_error_details() -> None:
+    class TooManyRequests(Exception):
+        details = [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "2.5s"}]
+
+    assert _extract_retry_delay_seconds(TooManyRequests("429 quota")) == 2.5
+    assert _extract_retry_delay_seconds(ValueError("bad request")) is None
+
+
+def test_streamed_summary_through_standin(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_API_KEY", "standin-key", raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_MAX_RETRIES", 0, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_STREAMING", True, raising=False)
+    behavior = StandinBehavior(latency=LatencyProfile.parse("fixed:400"), stream_chunk_chars=24)
+    with GeminiStandinServer(behavior) as server:
+        monkeypatch.setattr(settings, "GEMINI_API_ENDPOINT", server.url, raising=False)
+        service = ReportSummaryService(circuit_breaker=CircuitBreaker("standin-stream"))
+        service.summary_cache = None
+        texts: list[str] = []
+        result = service.generate(_make_request(), on_delta=lambda delta, text: texts.append(text))
+
+    assert result.status == "ok"
+    assert len(texts) > 1 and texts[-1] == result.text
+    assert result.first_text_ms is not None and result.first_text_ms < result.duration_ms
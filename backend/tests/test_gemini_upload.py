@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+from PIL import Image
+
+from app.services.gemini_upload import PreparedImage, UploadCache, UploadStats, prepare_upload
+
+
+def _photo(path: Path, size: tuple[int, int] = (3000, 2000)) -> Path:
+    image = Image.effect_noise(size, 60).convert("RGB")
+    image.save(path, format="PNG")
+    return path
+
+
+def test_prepare_upload_resizes_and_reencodes(tmp_path: Path) -> None:
+    path = _photo(tmp_path / "scene.png")
+    prepared = prepare_upload(path, max_edge=1000, fmt="jpeg", quality=70, cache=UploadCache(0))
+
+    assert prepared.transformed
+    assert prepared.mime_type == "image/jpeg"
+    assert prepared.original_bytes == path.stat().st_size
+    assert prepared.bytes_saved > 0
+    with Image.open(io.BytesIO(prepared.data)) as encoded:
+        assert max(encoded.size) == 1000
+        assert encoded.size == (1000, 667)
+
+
+def test_prepare_upload_never_upscales_and_supports_webp(tmp_path: Path) -> None:
+    path = _photo(tmp_path / "small.png", size=(400, 300))
+    prepared = prepare_upload(path, max_edge=1600, fmt="webp", quality=60, cache=UploadCache(0))
+
+    assert prepared.mime_type == "image/webp"
+    with Image.open(io.BytesIO(prepared.data)) as encoded:
+        assert encoded.size == (400, 300)
+
+
+def test_prepare_upload_keeps_original_when_disabled_or_undecodable(tmp_path: Path) -> None:
+    path = _photo(tmp_path / "scene.png", size=(200, 200))
+    original = prepare_upload(path, max_edge=100, fmt="original", quality=80, cache=UploadCache(0))
+    assert not original.transformed
+    assert original.data == path.read_bytes()
+    assert original.mime_type == "image/png"
+
+    broken = tmp_path / "broken.jpg"
+    broken.write_bytes(b"not an image")
+    fallback = prepare_upload(broken, max_edge=100, fmt="jpeg", quality=80, cache=UploadCache(0))
+    assert fallback.data == b"not an image"
+    assert fallback.mime_type == "image/jpeg"
+
+
+def test_prepare_upload_caches_until_file_changes(tmp_path: Path) -> None:
+    path = _photo(tmp_path / "scene.png", size=(800, 600))
+    cache = UploadCache(16 * 1024 * 1024)
+    first = prepare_upload(path, max_edge=400, fmt="jpeg", quality=80, cache=cache)
+    second = prepare_upload(path, max_edge=400, fmt="jpeg", quality=80, cache=cache)
+    other_quality = prepare_upload(path, max_edge=400, fmt="jpeg", quality=50, cache=cache)
+
+    assert not first.cached and second.cached and not other_quality.cached
+    assert second.data == first.data
+    assert second.encode_ms == 0.0
+
+    _photo(path, size=(900, 600))
+    assert not prepare_upload(path, max_edge=400, fmt="jpeg", quality=80, cache=cache).cached
+
+
+def test_upload_cache_evicts_least_recently_used() -> None:
+    cache = UploadCache(10)
+    cache.put(("a",), PreparedImage(data=b"x" * 4, mime_type="image/jpeg", original_bytes=8))
+    cache.put(("b",), PreparedImage(data=b"y" * 4, mime_type="image/jpeg", original_bytes=8))
+    assert cache.get(("a",)) is not None
+    cache.put(("c",), PreparedImage(data=b"z" * 4, mime_type="image/jpeg", original_bytes=8))
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) is not None and cache.get(("c",)) is not None
+    assert cache.size == 8
+
+
+def test_upload_stats_report_bytes_saved_and_latency() -> None:
+    stats = UploadStats()
+    stats.add(PreparedImage(data=b"x" * 100, mime_type="image/jpeg", original_bytes=1000, encode_ms=5.0), 200.0)
+    stats.add(PreparedImage(data=b"x" * 300, mime_type="image/jpeg", original_bytes=300), 100.0)
+
+    assert stats.as_dict() == {
+        "images": 2,
+        "original_bytes": 1300,
+        "uploaded_bytes": 400,
+        "bytes_saved": 900,
+        "encode_ms": 5.0,
+        "call_ms": 300.0,
+        "avg_call_ms": 150.0,
+    }
@@ -416,7 +416,13 @@ async def test_manual_gemini_analysis_endpoint(tmp_path: Path, isolated_session:
                 )
 
                 post_status = post_response.status_code
-                analysis_data = post_response.json()
+                job_data = post_response.json()
+                for _ in range(50):
+                    job_response = await client.get(f"/api/v1/ingestion/analysis-jobs/{job_data['job_id']}")
+                    job_data = job_response.json()
+                    if job_data["status"] not in {"queued", "running"}:
+                        break
+                    await asyncio.sleep(0.05)
 
             history_response = await client.get(
                 f"/api/v1/ingestion/batches/{batch_id}/analysis",
@@ -429,9 +435,12 @@ async def test_manual_gemini_analysis_endpoint(tmp_path: Path, isolated_session:
             detail_status = detail_response.status_code
             detail_body = detail_response.json()
 
-        assert post_status == status.HTTP_200_OK, post_response.text
-        assert analysis_data["status"] == "ok"
-        assert analysis_data["requested_by"] == "qa-tester"
+        assert post_status == status.HTTP_202_ACCEPTED, post_response.text
+        assert job_data["status"] == "completed"
+        assert job_data["result_status"] == "ok"
+        assert job_data["requested_by"] == "qa-tester"
+        assert job_data["analysis_id"] is not None
+        analysis_data = next(item for item in history_payload["history"] if item["id"] == job_data["analysis_id"])
         assert analysis_data["prompt_hash"] == "a" * 64
         assert analysis_data["observations"][0]["label"] == "security_fence_breach"
 
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from pathlib import Path
+
+from PIL import Image
+
+from app.pipelines import ocr as legacy_ocr
+from app.schemas.ingestion import FileMetadata
+from app.services.ocr_engine import EasyOCREngine, EasyOCRReaderPool, LegacyOCREngine
+
+
+def _make_images(tmp_path: Path, count: int) -> list[Path]:
+    paths: list[Path] = []
+    for index in range(count):
+        path = tmp_path / f"page-{index}.png"
+        Image.new("RGB", (100 + index, 50), (255, 255, 255)).save(path)
+        paths.append(path)
+    return paths
+
+
+def test_tesseract_languages_maps_easyocr_codes() -> None:
+    assert legacy_ocr.tesseract_languages(["fr", "en", "FR"]) == "fra+eng"
+    assert legacy_ocr.tesseract_languages([]) is None
+
+
+def test_extract_texts_pool_matches_serial_order(tmp_path: Path) -> None:
+    images = _make_images(tmp_path, 3)
+    serial = legacy_ocr.extract_texts(images, max_workers=1)
+    pooled = legacy_ocr.TesseractPool(max_workers=2)
+    try:
+        assert pooled.map(images) == serial
+    finally:
+        pooled.shutdown()
+
+
+def _image_files(paths: list[Path], metadata: list[dict | None] | None = None) -> list[FileMetadata]:
+    return [
+        FileMetadata(
+            filename=path.name,
+            content_type="image/png",
+            size_bytes=path.stat().st_size,
+            checksum_sha256="noop",
+            stored_path=str(path),
+            metadata=(metadata or [None] * len(paths))[index],
+        )
+        for index, path in enumerate(paths)
+    ]
+
+
+def test_legacy_engine_consumes_prefetched_results(tmp_path: Path, monkeypatch) -> None:
+    images = _make_images(tmp_path, 2)
+    files = _image_files(images)
+    pool = legacy_ocr.TesseractPool(max_workers=2, lang="eng")
+    monkeypatch.setattr(legacy_ocr, "get_tesseract_pool", lambda workers, lang: pool)
+    engine = LegacyOCREngine(max_workers=2, languages=["en"])
+    try:
+        engine.prefetch(files)
+        assert set(engine._pending) == {(str(path), "eng") for path in images}
+        results = [engine.extract(file_meta) for file_meta in files]
+    finally:
+        pool.shutdown()
+
+    assert not engine._pending
+    assert [result.text for result in results] == [legacy_ocr.extract_text(path, "eng").strip() for path in images]
+    assert all(not result.warnings for result in results)
+
+
+class _RecordingPool:
+    def __init__(self, lang: str | None, submitted: list[tuple[str, str | None]]) -> None:
+        self.lang = lang
+        self._submitted = submitted
+
+    def submit(self, image_path: Path) -> Future[str]:
+        self._submitted.append((image_path.name, self.lang))
+        future: Future[str] = Future()
+        future.set_result(f"{image_path.name}:{self.lang}")
+        return future
+
+
+def test_legacy_engine_prefetches_with_per_file_languages(tmp_path: Path, monkeypatch) -> None:
+    images = _make_images(tmp_path, 2)
+    tagged, plain = _image_files(images, [{"ocr_languages": ["ar"]}, None])
+    submitted: list[tuple[str, str | None]] = []
+    monkeypatch.setattr(legacy_ocr, "get_tesseract_pool", lambda workers, lang: _RecordingPool(lang, submitted))
+    engine = LegacyOCREngine(max_workers=2, languages=["fr", "en"])
+    engine.set_batch_languages(["en"])
+
+    engine.prefetch([tagged, plain])
+
+    assert submitted == [("page-0.png", "ara"), ("page-1.png", "eng")]
+    assert engine.extract(tagged).text == "page-0.png:ara"
+    assert engine.extract(plain).text == "page-1.png:eng"
+    assert not engine._pending
+
+
+def test_easyocr_failure_falls_back_to_tesseract_in_the_file_languages(tmp_path: Path, monkeypatch) -> None:
+    (image,) = _image_files(_make_images(tmp_path, 1), [{"ocr_languages": ["ar", "fr"]}])
+    calls: list[str | None] = []
+    monkeypatch.setattr(legacy_ocr, "extract_text", lambda path, lang=None: calls.append(lang) or "texte")
+    engine = EasyOCREngine(["fr", "en"], preprocess_mode="none", reader_pool=EasyOCRReaderPool(1, 0))
+
+    def broken(*args, **kwargs):  # noqa: ANN002, ANN003
+        raise RuntimeError("reader crashed")
+
+    monkeypatch.setattr(engine, "_extract_image", broken)
+    result = engine.extract(image)
+
+    assert result.text == "texte"
+    assert result.warnings == ["ocr-fallback:easyocr"]
+    assert calls == ["ara+fra"]
+
+
+def test_tesseract_pool_is_shared_per_worker_count_and_language() -> None:
+    french = legacy_ocr.get_tesseract_pool(2, "fra")
+    try:
+        assert legacy_ocr.get_tesseract_pool(2, "fra") is french
+        assert legacy_ocr.get_tesseract_pool(2, "ara").lang == "ara"
+        assert legacy_ocr.get_tesseract_pool(3, "fra") is not french
+    finally:
+        for pool in legacy_ocr._pools.values():
+            pool.shutdown()
+
+
+def test_missing_traineddata_falls_back_to_installed_languages(monkeypatch) -> None:
+    monkeypatch.setattr(legacy_ocr, "_installed_languages", lambda: frozenset({"eng", "osd"}))
+
+    assert legacy_ocr.usable_tesseract_languages("fra+eng") == "eng"
+    assert legacy_ocr.usable_tesseract_languages("fra") == "eng"
+    assert legacy_ocr.usable_tesseract_languages(None) is None
+
+    monkeypatch.setattr(legacy_ocr, "_installed_languages", lambda: None)
+    assert legacy_ocr.usable_tesseract_languages("fra+eng") == "fra+eng"
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from app.schemas.ingestion import FileMetadata
+from app.services.ocr_engine import (
+    EasyOCREngine,
+    EasyOCRReaderPool,
+    languages_from_metadata,
+    normalize_languages,
+)
+
+
+class _FakeReader:
+    def __init__(self, languages: tuple[str, ...]) -> None:
+        self.languages = languages
+
+
+def _make_pool(max_readers: int = 2, budget: int = 0, size: int = 100) -> tuple[EasyOCRReaderPool, list]:
+    built: list[tuple[str, ...]] = []
+
+    def factory(languages: tuple[str, ...]) -> _FakeReader:
+        built.append(languages)
+        return _FakeReader(languages)
+
+    pool = EasyOCRReaderPool(
+        max_readers=max_readers,
+        memory_budget_bytes=budget,
+        factory=factory,
+        size_estimator=lambda reader: size,
+    )
+    return pool, built
+
+
+def test_normalize_languages_builds_canonical_key() -> None:
+    assert normalize_languages(["FR", "en", "fr", " "]) == ("en", "fr")
+    assert normalize_languages("en, ar") == ("ar", "en")
+    assert normalize_languages(None) == ()
+    assert languages_from_metadata({"ocr_languages": ["ar", "fr"]}) == ("ar", "fr")
+    assert languages_from_metadata({"zone": "gate"}) == ()
+
+
+def test_reader_pool_reuses_readers_per_language_set() -> None:
+    pool, built = _make_pool()
+    first = pool.acquire(["fr", "en"])
+    second = pool.acquire(["en", "fr"])
+    assert first is second
+    assert built == [("en", "fr")]
+
+
+def test_reader_pool_evicts_least_recently_used() -> None:
+    pool, built = _make_pool(max_readers=2)
+    pool.acquire(["fr"])
+    pool.acquire(["en"])
+    pool.acquire(["fr"])  # refresh "fr"
+    pool.acquire(["ar"])
+    assert pool.keys() == [("fr",), ("ar",)]
+    pool.acquire(["en"])
+    assert built.count(("en",)) == 2
+
+
+def test_reader_pool_respects_memory_budget() -> None:
+    pool, _ = _make_pool(max_readers=5, budget=250, size=100)
+    pool.acquire(["fr"])
+    pool.acquire(["en"])
+    pool.acquire(["ar"])
+    assert pool.keys() == [("en",), ("ar",)]
+    assert pool.resident_bytes == 200
+
+
+def test_reader_pool_remembers_failed_language_sets() -> None:
+    calls: list[tuple[str, ...]] = []
+
+    def failing_factory(languages: tuple[str, ...]) -> _FakeReader:
+        calls.append(languages)
+        raise ValueError("unsupported language")
+
+    pool = EasyOCRReaderPool(max_readers=2, memory_budget_bytes=0, factory=failing_factory)
+    events: list[str] = []
+    for _ in range(2):
+        try:
+            pool.acquire(["xx"], lambda stage, data: events.append(stage))
+        except Exception:  # noqa: BLE001
+            pass
+    assert calls == [("xx",)]
+    assert events == ["ocr:warmup:start", "ocr:warmup:error"]
+
+
+def test_reader_pool_retries_failed_language_sets_after_delay() -> None:
+    now = [0.0]
+    attempts: list[tuple[str, ...]] = []
+
+    def flaky_factory(languages: tuple[str, ...]) -> _FakeReader:
+        attempts.append(languages)
+        if len(attempts) == 1:
+            raise OSError("model download failed")
+        return _FakeReader(languages)
+
+    pool = EasyOCRReaderPool(
+        max_readers=2, memory_budget_bytes=0, factory=flaky_factory, retry_after_seconds=60, clock=lambda: now[0]
+    )
+    for _ in range(2):
+        try:
+            pool.acquire(["fr"])
+        except (OSError, RuntimeError):
+            pass
+    assert len(attempts) == 1
+
+    now[0] = 61.0
+    assert pool.acquire(["fr"]).languages == ("fr",)
+    assert len(attempts) == 2
+
+
+def test_reader_pool_lends_a_reader_to_one_thread_at_a_time() -> None:
+    pool, built = _make_pool()
+    active: list[int] = []
+    overlaps: list[int] = []
+
+    def worker() -> None:
+        with pool.checkout(["fr"]) as reader:
+            active.append(1)
+            overlaps.append(len(active))
+            time.sleep(0.01)
+            active.pop()
+            assert reader.languages == ("fr",)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert built == [("fr",)]
+    assert overlaps == [1, 1, 1, 1]
+
+
+def test_engine_selects_languages_from_metadata_then_batch() -> None:
+    pool, _ = _make_pool()
+    engine = EasyOCREngine(["fr", "en"], reader_pool=pool)
+    plain = FileMetadata(
+        filename="a.jpg",
+        content_type="image/jpeg",
+        size_bytes=1,
+        checksum_sha256="noop",
+        stored_path="a.jpg",
+    )
+    tagged = plain.model_copy(update={"metadata": {"ocr_languages": ["ar"]}})
+
+    assert engine.resolve_languages(plain) == ("en", "fr")
+    assert engine.resolve_languages(tagged) == ("ar",)
+    engine.set_batch_languages(["en"])
+    assert engine.resolve_languages(plain) == ("en",)
+    engine.set_batch_languages(None)
+    assert engine.resolve_languages(plain) == ("en", "fr")
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageDraw
+from pydantic import ValidationError
+
+from app.core.config import Settings
+from app.services import ocr_preprocessing
+from app.services.ocr_engine import EasyOCREngine
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+
+def _clean_gray(width: int = 640, height: int = 480):
+    image = np.full((height, width), 245, dtype=np.uint8)
+    image[100:140, 80:560] = 20
+    image[200:240, 80:400] = 20
+    return image
+
+
+def _noisy_gray(width: int = 640, height: int = 480):
+    rng = np.random.default_rng(seed=7)
+    noise = rng.normal(0, 40, size=(height, width))
+    return np.clip(_clean_gray(width, height).astype(np.float64) + noise, 0, 255).astype(np.uint8)
+
+
+def test_planner_skips_preprocessing_for_clean_images() -> None:
+    processed, plan = ocr_preprocessing.preprocess(_clean_gray())
+    assert plan.profile == ocr_preprocessing.PROFILE_NONE
+    assert plan.forced is False
+    assert plan.quality is not None
+    assert plan.quality.width == 640 and plan.quality.height == 480
+    assert processed.shape == (480, 640)
+
+
+def test_planner_uses_full_denoise_for_noisy_images() -> None:
+    _, plan = ocr_preprocessing.preprocess(_noisy_gray())
+    assert plan.profile == ocr_preprocessing.PROFILE_FULL
+    assert plan.quality is not None and plan.quality.noise_sigma >= ocr_preprocessing.NOISE_FULL_THRESHOLD
+
+
+def test_planner_downgrades_full_denoise_on_small_images() -> None:
+    _, plan = ocr_preprocessing.preprocess(_noisy_gray(width=300, height=200))
+    assert plan.profile == ocr_preprocessing.PROFILE_FAST
+
+
+def test_forced_mode_and_plan_serialisation() -> None:
+    _, plan = ocr_preprocessing.preprocess(_clean_gray(), mode="full")
+    assert plan.profile == ocr_preprocessing.PROFILE_FULL
+    payload = plan.as_dict()
+    assert payload["forced"] is True
+    assert payload["total_ms"] >= 0
+    assert payload["assess_ms"] == 0
+    assert plan.quality is None
+
+    _, auto_plan = ocr_preprocessing.preprocess(_clean_gray())
+    assert {"noise_sigma", "contrast", "width", "height"} <= auto_plan.as_dict().keys()
+
+    with pytest.raises(ValueError):
+        ocr_preprocessing.preprocess(_clean_gray(), mode="aggressive")
+
+
+def test_forced_mode_skips_quality_assessment(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(gray):  # noqa: ANN001
+        raise AssertionError("assess_quality must only run in auto mode")
+
+    monkeypatch.setattr(ocr_preprocessing, "assess_quality", fail)
+    processed, plan = ocr_preprocessing.preprocess(_clean_gray(), mode="fast")
+    assert plan.profile == ocr_preprocessing.PROFILE_FAST
+    assert processed.shape == (480, 640)
+
+
+def test_invalid_preprocess_mode_is_rejected_up_front() -> None:
+    with pytest.raises(ValueError):
+        EasyOCREngine(["fr"], preprocess_mode="aggressive")
+    with pytest.raises(ValidationError):
+        Settings(OCR_PREPROCESS_MODE="aggressive")
+    assert Settings(OCR_PREPROCESS_MODE=" FULL ").OCR_PREPROCESS_MODE == "full"
+
+
+def test_easyocr_engine_records_preprocessing_plan(tmp_path: Path) -> None:
+    image_path = tmp_path / "screenshot.png"
+    image = Image.new("RGB", (640, 480), (245, 245, 245))
+    ImageDraw.Draw(image).rectangle((80, 100, 560, 140), fill=(20, 20, 20))
+    image.save(image_path)
+
+    engine = EasyOCREngine(["fr"], preprocess_mode="auto")
+    processed, plan = engine._prepare_image(image_path)
+    assert plan is not None
+    assert plan.profile == ocr_preprocessing.PROFILE_NONE
+    assert getattr(processed, "shape", None) == (480, 640)
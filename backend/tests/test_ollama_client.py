@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import pytest
+
+from app.core.config import settings
+from app.services.ollama_client import OllamaClient, model_name
+from app.services.report_summary import ReportSummaryService
+from tests.test_report_summary import _make_request
+
+LOCAL_SUMMARY = json.dumps(
+    {
+        "summary": {"context": "Synthèse locale : extincteur manquant près de la sortie."},
+        "key_findings": ["Extincteur manquant"],
+        "recommendations": ["Installer un extincteur", "Vérifier les issues de secours"],
+        "warnings": [],
+    },
+    ensure_ascii=False,
+)
+
+
+class _OllamaStandin(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, text: str = LOCAL_SUMMARY, delay: float = 0.0) -> None:
+        super().__init__(("127.0.0.1", 0), _OllamaHandler)
+        self.text = text
+        self.delay = delay
+        self.requests: list[dict[str, Any]] = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _OllamaHandler(BaseHTTPRequestHandler):
+    server: _OllamaStandin
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def do_POST(self) -> None:  # noqa: N802
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.requests.append(payload)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.delay)
+            lines: list[dict[str, Any]] = [
+                {"model": payload["model"], "response": server.text[index : index + 20], "done": False}
+                for index in range(0, len(server.text), 20)
+            ]
+            lines.append({"response": "", "done": True, "prompt_eval_count": 321, "eval_count": 45})
+            body = "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+@pytest.fixture()
+def ollama() -> Iterator[_OllamaStandin]:
+    server = _OllamaStandin()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_model_name_strips_provider_prefix() -> None:
+    assert model_name("ollama/llama3.1") == "llama3.1"
+    assert model_name("mistral") == "mistral"
+
+
+def test_client_streams_chunks(ollama: _OllamaStandin) -> None:
+    client = OllamaClient(ollama.url, timeout=5)
+    chunks: list[str] = []
+    completion = client.generate("ollama/llama3.1", "prompt", options={"num_ctx": 2048}, on_chunk=chunks.append)
+    client.close()
+
+    assert completion.text == LOCAL_SUMMARY
+    assert "".join(chunks) == LOCAL_SUMMARY and len(chunks) > 1
+    assert (completion.prompt_tokens, completion.output_tokens) == (321, 45)
+    assert completion.first_token_ms is not None
+    request = ollama.requests[0]
+    assert request["model"] == "llama3.1"
+    assert request["stream"] is True and request["format"] == "json"
+    assert request["options"] == {"num_ctx": 2048}
+
+
+def test_client_bounds_concurrent_generations(ollama: _OllamaStandin) -> None:
+    ollama.delay = 0.2
+    client = OllamaClient(ollama.url, timeout=5, max_concurrency=1)
+    threads = [threading.Thread(target=client.generate, args=("llama3.1", "prompt")) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    client.close()
+
+    assert len(ollama.requests) == 3
+    assert ollama.max_active == 1
+
+
+def _fallback_service(monkeypatch: pytest.MonkeyPatch, url: str) -> ReportSummaryService:
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_REQUIRED", False, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_API_KEY", "test-key", raising=False)
+    monkeypatch.setattr(settings, "SUMMARY_FALLBACK_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "SUMMARY_FALLBACK_MODEL", "ollama/llama3.1", raising=False)
+    monkeypatch.setattr(settings, "SUMMARY_FALLBACK_URL", url, raising=False)
+    service = ReportSummaryService()
+    service.summary_cache = None
+
+    def _raise(*args: object, **kwargs: object) -> tuple[str, int]:
+        raise TimeoutError("Deadline Exceeded")
+
+    monkeypatch.setattr(service, "_call_gemini", _raise)
+    return service
+
+
+def test_summary_falls_back_to_local_model(monkeypatch: pytest.MonkeyPatch, ollama: _OllamaStandin) -> None:
+    service = _fallback_service(monkeypatch, ollama.url)
+    texts: list[str] = []
+
+    result = service.generate(_make_request(), on_delta=lambda delta, text: texts.append(text))
+
+    assert result.status == "fallback"
+    assert result.source == "ollama/llama3.1"
+    assert result.text is not None and "Synthèse locale" in result.text
+    assert result.recommendations == ["Installer un extincteur", "Vérifier les issues de secours"]
+    assert result.warnings[0].startswith("summary-fallback:")
+    assert texts and texts[-1] == result.text
+    assert ollama.requests[0]["options"]["num_ctx"] == settings.SUMMARY_FALLBACK_CONTEXT_TOKENS
+
+
+def test_fallback_result_keeps_the_request_prompt_hash(monkeypatch: pytest.MonkeyPatch, ollama: _OllamaStandin) -> None:
+    monkeypatch.setattr(settings, "SUMMARY_FALLBACK_CONTEXT_TOKENS", 1100, raising=False)
+    monkeypatch.setattr(settings, "SUMMARY_FALLBACK_MAX_OUTPUT_TOKENS", 600, raising=False)
+    service = _fallback_service(monkeypatch, ollama.url)
+    request_prompt = service._build_prompt(_make_request())
+
+    result = service.generate(_make_request())
+
+    sent_prompt = ollama.requests[0]["prompt"]
+    assert sent_prompt != request_prompt
+    assert result.prompt_hash == hashlib.sha256(request_prompt.encode("utf-8")).hexdigest()
+    assert result.fallback_prompt_hash == hashlib.sha256(sent_prompt.encode("utf-8")).hexdigest()
+
+
+def test_summary_uses_static_text_when_local_model_is_unreachable(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = _fallback_service(monkeypatch, "http://127.0.0.1:9")
+
+    result = service.generate(_make_request())
+
+    assert result.status == "fallback"
+    assert result.text is not None and "Analyse avancée indisponible" in result.text
+
+
+def test_fallback_prompt_shrinks_to_fit_context(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "SUMMARY_FALLBACK_CONTEXT_TOKENS", 4096, raising=False)
+    roomy = ReportSummaryService()._build_fallback_prompt(_make_request())
+    monkeypatch.setattr(settings, "SUMMARY_FALLBACK_CONTEXT_TOKENS", 1100, raising=False)
+    monkeypatch.setattr(settings, "SUMMARY_FALLBACK_MAX_OUTPUT_TOKENS", 600, raising=False)
+    compact = ReportSummaryService()._build_fallback_prompt(_make_request())
+
+    assert len(compact) < len(roomy)
+    assert "### Format attendu" in compact
@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
 from PIL import Image
 
 from app.schemas.ingestion import FileMetadata
@@ -114,3 +115,45 @@ def test_pipeline_passes_zone_to_vision_engine(tmp_path: Path) -> None:
     assert result.observations_local is not None
     assert len(result.observations_local) == 1
     assert result.observations_local[0].label == "incendie"
+
+
+def test_pipeline_detaches_ocr_hooks_when_a_stage_fails(tmp_path: Path) -> None:
+    text_path = tmp_path / "notes.txt"
+    text_path.write_text("Check extinguisher placement.", encoding="utf-8")
+
+    class FailingOCREngine:
+        engine_id = "failing"
+
+        def __init__(self) -> None:
+            self.batch_languages: list[list[str] | None] = []
+            self.sinks: list[object] = []
+
+        def set_batch_languages(self, languages: list[str] | None) -> None:
+            self.batch_languages.append(languages)
+
+        def set_embedded_image_sink(self, sink: object, known_hashes: list[str] | None = None) -> None:
+            self.sinks.append(sink)
+
+        def extract(self, file_meta: FileMetadata):
+            raise RuntimeError("ocr backend crashed")
+
+    ocr_engine = FailingOCREngine()
+    with patch("app.services.pipeline.get_ocr_engine", return_value=ocr_engine):
+        pipeline = IngestionPipeline(tmp_path)
+
+    files = [
+        FileMetadata(
+            filename=text_path.name,
+            content_type="text/plain",
+            size_bytes=text_path.stat().st_size,
+            checksum_sha256="noop",
+            stored_path=str(text_path),
+            metadata={"ocr_languages": ["fr"]},
+        )
+    ]
+
+    with pytest.raises(RuntimeError, match="ocr backend crashed"):
+        pipeline.run(batch_id="batch-fail", files=files)
+
+    assert ocr_engine.batch_languages[-1] is None
+    assert len(ocr_engine.sinks) == 2 and ocr_engine.sinks[-1] is None
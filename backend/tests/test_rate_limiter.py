@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services.rate_limiter import RateLimitTimeout, TokenBucketRateLimiter, estimate_gemini_tokens
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _limiter(rpm: int, tpm: int = 0) -> tuple[TokenBucketRateLimiter, _FakeClock]:
+    clock = _FakeClock()
+    return TokenBucketRateLimiter(rpm, tpm, clock=clock, sleep=clock.sleep), clock
+
+
+def test_requests_per_minute_allows_burst_then_throttles() -> None:
+    limiter, clock = _limiter(rpm=60)
+    for _ in range(60):
+        assert limiter.acquire() == 0.0
+    waited = limiter.acquire()
+    assert waited == pytest.approx(1.0, abs=0.01)
+    assert clock.now == pytest.approx(1.0, abs=0.01)
+
+
+def test_tokens_per_minute_bucket_and_settle() -> None:
+    limiter, clock = _limiter(rpm=0, tpm=600)
+    limiter.acquire(500)
+    limiter.settle(500, 200)  # real usage was lower: 300 tokens are given back
+    assert limiter.acquire(400) == 0.0
+    waited = limiter.acquire(100)
+    assert waited == pytest.approx(10.0, abs=0.3)
+
+
+def test_penalize_blocks_every_caller_and_respects_timeout() -> None:
+    limiter, clock = _limiter(rpm=0)
+    limiter.penalize(30)
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(timeout=5)
+    assert limiter.acquire() == pytest.approx(30.0, abs=0.3)
+
+
+def test_estimate_gemini_tokens_counts_image_cost() -> None:
+    assert estimate_gemini_tokens("x" * 400, images=2) == 100 + 2 * 258
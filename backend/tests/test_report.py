@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import hashlib
 from pathlib import Path
+from typing import Callable
+from unittest.mock import patch
 
 import fitz
+import pytest
 
 from app.pipelines.models import OCRResult, Observation, PipelineResult, RiskBreakdown, RiskScore
-from app.services.report import ReportBuilder
+from app.services.analysis_jobs import AnalysisJob
+from app.services.report import ReportBuilder, group_observations
 
 
 def _dummy_pipeline_result(tmp_path: Path) -> PipelineResult:
@@ -76,3 +80,202 @@ def test_report_builder_generates_pdf(tmp_path: Path) -> None:
     assert "Rapport d'audit" in text_content
     assert "Tableau de bord synthétique" in text_content
     assert "Clauses & disclaimers" in text_content
+
+
+def test_report_sections_are_reused_when_inputs_do_not_change(tmp_path: Path) -> None:
+    builder = ReportBuilder(output_dir=tmp_path)
+    result = _dummy_pipeline_result(tmp_path)
+    context = builder.build_context(result)
+
+    first = builder.render(context)
+    assert first.reused_sections == ()
+
+    context.summary_text = "Synthèse mise à jour après relance de l'analyse."
+    second = builder.render(context)
+
+    assert set(second.reused_sections) == {
+        "dashboard",
+        "timeline",
+        "observations",
+        "ocr",
+        "technical_timeline",
+        "annexes",
+    }
+    assert second.checksum_sha256 != first.checksum_sha256
+    fragments = sorted(path.name.rsplit("-", 1)[0] for path in (tmp_path / "sections" / "batch-123").glob("*.pdf"))
+    assert fragments == [
+        "annexes",
+        "cover",
+        "dashboard",
+        "observations",
+        "ocr",
+        "summary",
+        "technical_timeline",
+        "timeline",
+    ]
+
+    doc = fitz.open(second.path)
+    text_content = " ".join(page.get_text() for page in doc)
+    page_count = doc.page_count
+    doc.close()
+    assert "Synthèse mise à jour" in text_content
+    assert "Clauses & disclaimers" in text_content
+
+    single = ReportBuilder(output_dir=tmp_path / "single", section_cache=False).render(context)
+    with fitz.open(single.path) as reference:
+        assert reference.page_count == page_count
+
+
+def test_report_context_is_rebuilt_from_stored_rows(tmp_path: Path) -> None:
+    from app.api.v1.endpoints.ingestion import _report_context_from_batch
+    from app.models import AuditBatch, BatchReport, OCRText, ProcessingEvent, RiskScoreEntry, VisionObservation
+
+    batch = AuditBatch(id="batch-db", status="completed", report_path=str(tmp_path / "report-batch-db.pdf"))
+    batch.observations = [
+        VisionObservation(
+            batch_id="batch-db",
+            filename="fire.jpg",
+            label="incendie",
+            severity="high",
+            confidence=0.9,
+            source="gemini",
+        )
+    ]
+    batch.ocr_texts = [
+        OCRText(batch_id="batch-db", filename="notes.txt", content="Extincteur ", chunk_index=0),
+        OCRText(batch_id="batch-db", filename="notes.txt", content="absent.", chunk_index=1),
+    ]
+    batch.risk_score = RiskScoreEntry(
+        batch_id="batch-db",
+        total_score=14.0,
+        normalized_score=0.14,
+        breakdown=[{"label": "incendie", "severity": "high", "count": 1, "score": 14.0}],
+    )
+    batch.report_summary = BatchReport(batch_id="batch-db", summary_text="Synthèse stockée.", status="ok", findings=["A"])
+    batch.events = [ProcessingEvent(batch_id="batch-db", code="ingestion:received", label="Fichiers reçus", progress=5)]
+    batch.gemini_analyses = []
+
+    context = _report_context_from_batch(ReportBuilder(output_dir=tmp_path), batch, tmp_path)
+
+    assert context.observations[0].extra["source"] == "gemini"
+    assert context.ocr_texts[0].text == "Extincteur absent."
+    assert context.risk is not None and context.risk.breakdown[0].score == 14.0
+    assert context.summary_text == "Synthèse stockée." and context.summary_findings == ["A"]
+    assert context.timeline[0]["code"] == "ingestion:received"
+
+
+def test_large_batch_groups_observations_and_attaches_csv(tmp_path: Path) -> None:
+    builder = ReportBuilder(output_dir=tmp_path, large_batch_threshold=50, max_table_rows=20)
+    result = _dummy_pipeline_result(tmp_path)
+    severities = ("low", "medium", "high")
+    result.observations = [
+        Observation(
+            source_file=f"photo-{index % 30}.jpg",
+            label=("incendie", "malveillance")[index % 2],
+            confidence=0.5 + (index % 5) / 10,
+            severity=severities[index % 3],
+        )
+        for index in range(300)
+    ]
+
+    artifact = builder.build_from_pipeline(result)
+
+    assert artifact.detail_csv is not None
+    assert len(artifact.detail_csv.read_text(encoding="utf-8").splitlines()) == 301
+    doc = fitz.open(artifact.path)
+    text_content = " ".join(page.get_text() for page in doc)
+    assert doc.embfile_names() == [artifact.detail_csv.name]
+    doc.close()
+    assert "Lot volumineux : 300 observations regroupées en 30 couples" in text_content
+    assert "10 groupes supplémentaires" in text_content
+    assert artifact.checksum_sha256 == hashlib.sha256(artifact.path.read_bytes()).hexdigest()
+
+
+def test_group_observations_keeps_worst_severity_first() -> None:
+    observations = [
+        Observation(source_file="a.jpg", label="incendie", confidence=0.4, severity="low"),
+        Observation(source_file="a.jpg", label="incendie", confidence=0.8, severity="high"),
+        Observation(source_file="b.jpg", label="hygiene", confidence=0.6, severity="medium"),
+    ]
+
+    groups = group_observations(observations)
+
+    assert [(group.source_file, group.count, group.severity) for group in groups] == [
+        ("a.jpg", 2, "high"),
+        ("b.jpg", 1, "medium"),
+    ]
+    assert groups[0].max_confidence == 0.8 and round(groups[0].mean_confidence, 2) == 0.6
+
+
+@pytest.mark.asyncio
+async def test_gemini_rerun_reuses_ocr_and_timeline_fragments_of_the_pipeline_report(tmp_path: Path) -> None:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlmodel import SQLModel
+
+    from app.api.v1.endpoints import ingestion
+    from app.repositories import batches as batch_repo
+    from app.schemas.ingestion import FileMetadata
+    from app.services.advanced_analyzer import GeminiAnalysisResult
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'rerun.db').as_posix()}", future=True)
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    photo = tmp_path / "fire.jpg"
+    photo.write_bytes(b"jpeg")
+    files = [
+        FileMetadata(
+            filename="fire.jpg",
+            content_type="image/jpeg",
+            size_bytes=4,
+            checksum_sha256="noop",
+            stored_path=str(photo),
+            metadata=None,
+        )
+    ]
+    result = _dummy_pipeline_result(tmp_path)
+    result.batch_id = "batch-rerun"
+    result.observations_local = list(result.observations)
+    result.ocr_texts = [OCRResult(source_file="notes.txt", text="Extincteur absent. " * 40)]
+
+    class _Pipeline:
+        simulate_latency_enabled = False
+
+        def run(self, batch_id: str, stored_files: object, progress: Callable[[str, dict], None]) -> PipelineResult:
+            progress("ocr:complete", {"label": "OCR terminé", "engine": "easyocr", "durationMs": 42, "progress": 70})
+            progress("scoring:complete", {"label": "Score calculé", "score": 24.0})
+            return result
+
+    class _Analyzer:
+        model = "gemini-test"
+
+        def analyze(self, batch_id: str, images: object, **kwargs: object) -> GeminiAnalysisResult:
+            observation = Observation(source_file="fire.jpg", label="security_fence_breach", confidence=0.8, severity="high")
+            return GeminiAnalysisResult(
+                observations=[observation],
+                summary="Relance",
+                status="ok",
+                warnings=[],
+                prompt_hash="h" * 64,
+                duration_ms=1234,
+                model="gemini-test",
+            )
+
+    try:
+        async with factory() as session:
+            await batch_repo.create_batch(session, "batch-rerun", "processing", files)
+        with patch.object(ingestion, "IngestionPipeline", lambda *args, **kwargs: _Pipeline()):
+            await ingestion._run_pipeline_task("batch-rerun", files, tmp_path, factory)
+
+        sections = tmp_path / "reports" / "sections" / "batch-rerun"
+        before = {path.name: path.stat().st_ino for path in sections.glob("*.pdf")}
+        job = AnalysisJob(job_id="job-1", batch_id="batch-rerun", requested_by="test", total_images=1)
+        await ingestion._run_analysis_job(job, _Analyzer(), [(photo, None, None)], factory, tmp_path)  # type: ignore[arg-type]
+        after = {path.name: path.stat().st_ino for path in sections.glob("*.pdf")}
+    finally:
+        await engine.dispose()
+
+    reused = {name.rsplit("-", 1)[0] for name, inode in after.items() if before.get(name) == inode}
+    assert {"timeline", "ocr", "technical_timeline"} <= reused
+    assert {"observations", "annexes"}.isdisjoint(reused)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import fitz
+from reportlab.graphics.shapes import Drawing
+
+from app.pipelines.models import Observation, RiskBreakdown
+from app.services.report import ReportBuilder
+from app.services.report_charts import risk_bar_chart, severity_chart, severity_counts
+from tests.test_report import _dummy_pipeline_result
+
+
+def test_risk_bar_chart_is_a_vector_drawing() -> None:
+    breakdown = [RiskBreakdown(label=f"cat_{index}", severity="high", count=1, score=index + 1.0) for index in range(6)]
+
+    chart = risk_bar_chart(breakdown)
+
+    assert isinstance(chart, Drawing)
+    assert risk_bar_chart([]) is None
+
+
+def test_severity_counts_follow_gravity_order() -> None:
+    observations = [
+        Observation(source_file="a.jpg", label="x", confidence=0.5, severity=severity)
+        for severity in ("low", "high", "weird", "high", "critical")
+    ]
+
+    assert severity_counts(observations) == [("critical", 1), ("high", 2), ("low", 1), ("weird", 1)]
+    assert isinstance(severity_chart(observations), Drawing)
+    assert severity_chart([]) is None
+
+
+def test_report_charts_are_drawn_without_raster_images(tmp_path: Path) -> None:
+    artifact = ReportBuilder(output_dir=tmp_path).build_from_pipeline(_dummy_pipeline_result(tmp_path))
+
+    doc = fitz.open(artifact.path)
+    text = " ".join(page.get_text() for page in doc)
+    images = sum(len(page.get_images()) for page in doc)
+    doc.close()
+
+    assert "Scores par catégorie" in text
+    assert "Observations par sévérité" in text
+    assert images == 0
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.db.session import get_session
+from app.main import app
+from app.models import AuditBatch
+from app.services.content_store import ContentStore
+from app.services.downloads import RangeNotSatisfiableError, etag_matches, parse_range
+from app.services.report import REPORT_STORE_DIRNAME
+
+PDF_BYTES = b"%PDF-1.4\n" + bytes(range(256)) * 40
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path: Path):
+    report = tmp_path / "report-batch-r.pdf"
+    store = ContentStore(tmp_path / REPORT_STORE_DIRNAME, suffix=".pdf")
+    with store.writer() as sink:
+        sink.write(PDF_BYTES)
+    store.publish(sink, report)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'download.db').as_posix()}", future=True)
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with factory() as session:
+        session.add(
+            AuditBatch(
+                id="batch-r",
+                status="completed",
+                report_path=str(report),
+                report_hash=hashlib.sha256(PDF_BYTES).hexdigest(),
+            )
+        )
+        await session.commit()
+
+    async def _session_override():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _session_override
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as http:
+            yield http
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+        await engine.dispose()
+
+
+ETAG = f'"{hashlib.sha256(PDF_BYTES).hexdigest()}"'
+URL = "/api/v1/ingestion/reports/batch-r"
+
+
+@pytest.mark.asyncio
+async def test_download_sets_strong_etag_and_cache_headers(client: AsyncClient) -> None:
+    response = await client.get(URL)
+
+    assert response.status_code == 200
+    assert response.content == PDF_BYTES
+    assert response.headers["etag"] == ETAG
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["cache-control"] == "public, no-cache"
+    assert response.headers["content-disposition"] == 'attachment; filename="report-batch-r.pdf"'
+
+
+@pytest.mark.asyncio
+async def test_matching_if_none_match_returns_304(client: AsyncClient) -> None:
+    response = await client.get(URL, headers={"If-None-Match": f'"other", {ETAG}'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == ETAG
+    assert (await client.get(URL, headers={"If-None-Match": '"other"'})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_range_requests_resume_partial_downloads(client: AsyncClient) -> None:
+    head = await client.get(URL, headers={"Range": "bytes=0-99"})
+    tail = await client.get(URL, headers={"Range": "bytes=100-", "If-Range": ETAG})
+    suffix = await client.get(URL, headers={"Range": "bytes=-10"})
+
+    assert head.status_code == 206 and head.content == PDF_BYTES[:100]
+    assert head.headers["content-range"] == f"bytes 0-99/{len(PDF_BYTES)}"
+    assert tail.status_code == 206 and head.content + tail.content == PDF_BYTES
+    assert suffix.content == PDF_BYTES[-10:]
+
+
+@pytest.mark.asyncio
+async def test_stale_if_range_and_bad_ranges(client: AsyncClient) -> None:
+    stale = await client.get(URL, headers={"Range": "bytes=100-", "If-Range": '"previous-report"'})
+    outside = await client.get(URL, headers={"Range": f"bytes={len(PDF_BYTES)}-"})
+
+    assert stale.status_code == 200 and stale.content == PDF_BYTES
+    assert outside.status_code == 416
+    assert outside.headers["content-range"] == f"bytes */{len(PDF_BYTES)}"
+    assert (await client.get("/api/v1/ingestion/reports/unknown")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_etag_follows_the_published_blob_not_the_stored_hash(client: AsyncClient, tmp_path: Path) -> None:
+    # A regeneration publishes the new PDF before the batch row records its hash.
+    store = ContentStore(tmp_path / REPORT_STORE_DIRNAME, suffix=".pdf")
+    new_bytes = PDF_BYTES[::-1]
+    with store.writer() as sink:
+        sink.write(new_bytes)
+    store.publish(sink, tmp_path / "report-batch-r.pdf")
+
+    response = await client.get(URL)
+    resumed = await client.get(URL, headers={"Range": "bytes=100-", "If-Range": ETAG})
+
+    assert response.content == new_bytes
+    assert response.headers["etag"] == f'"{hashlib.sha256(new_bytes).hexdigest()}"'
+    assert resumed.status_code == 200 and resumed.content == new_bytes
+
+
+def test_parse_range_and_etag_helpers() -> None:
+    assert parse_range("bytes=5-", 10) == (5, 9)
+    assert parse_range("bytes=2-50", 10) == (2, 9)
+    assert parse_range("bytes=-3", 10) == (7, 9)
+    assert parse_range("bytes=0-1,4-5", 10) is None
+    assert parse_range("items=0-1", 10) is None
+    assert parse_range("bytes=a-b", 10) is None
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_range("bytes=10-", 10)
+    assert etag_matches('W/"abc"', '"abc"')
+    assert not etag_matches('W/"abc"', '"abc"', weak=False)
+    assert etag_matches("*", '"abc"')
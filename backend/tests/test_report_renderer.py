@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import pickle
+from pathlib import Path
+
+import fitz
+import pytest
+
+from app.services.report import ReportBuilder
+from app.services.report_renderer import ReportRenderBusyError, ReportRenderPool
+from tests.test_report import _dummy_pipeline_result
+
+
+def _pdf_text(path: Path) -> str:
+    doc = fitz.open(path)
+    text = " ".join(page.get_text() for page in doc)
+    doc.close()
+    return text
+
+
+def test_report_context_survives_pickling(tmp_path: Path) -> None:
+    builder = ReportBuilder(output_dir=tmp_path)
+    timeline = [{"timestamp": "2025-01-01T10:00:00", "code": "ingestion:received", "progress": 10}]
+    context = builder.build_context(_dummy_pipeline_result(tmp_path), timeline=timeline, storage_root=tmp_path)
+    timeline.append({"code": "report:generated"})
+
+    restored = pickle.loads(pickle.dumps(context))
+
+    assert restored.batch_id == "batch-123"
+    assert restored.risk == context.risk
+    assert len(restored.timeline) == 1
+
+
+def test_inline_render_reports_progress(tmp_path: Path) -> None:
+    builder = ReportBuilder(output_dir=tmp_path)
+    context = builder.build_context(_dummy_pipeline_result(tmp_path))
+    states: list[tuple[str, int]] = []
+
+    artifact = asyncio.run(
+        ReportRenderPool(0).render_async(builder, context, on_progress=lambda *state: states.append(state))
+    )
+
+    assert states == [("rendering", 0)]
+    assert "Rapport d'audit" in _pdf_text(artifact.path)
+
+
+def test_process_pool_renders_report(tmp_path: Path) -> None:
+    builder = ReportBuilder(output_dir=tmp_path)
+    context = builder.build_context(_dummy_pipeline_result(tmp_path))
+    pool = ReportRenderPool(1, queue_size=1, timeout=120)
+    try:
+        artifact = asyncio.run(pool.render_async(builder, context))
+    finally:
+        pool.shutdown()
+
+    assert artifact.path == tmp_path / "report-batch-123.pdf"
+    assert artifact.checksum_sha256 == hashlib.sha256(artifact.path.read_bytes()).hexdigest()
+    assert "Tableau de bord synthétique" in _pdf_text(artifact.path)
+    assert pool.pending == 0
+
+
+def test_full_queue_rejects_after_timeout(tmp_path: Path) -> None:
+    builder = ReportBuilder(output_dir=tmp_path)
+    pool = ReportRenderPool(1, queue_size=0, timeout=0.1)
+    pool._slots.acquire()
+
+    with pytest.raises(ReportRenderBusyError):
+        pool.submit(builder, builder.build_context(_dummy_pipeline_result(tmp_path)))
+    assert pool.pending == 0
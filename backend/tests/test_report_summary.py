@@ -34,6 +34,7 @@ def _make_request() -> SummaryRequest:
 def test_report_summary_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(settings, "GEMINI_SUMMARY_ENABLED", False, raising=False)
     service = ReportSummaryService()
+    service.summary_cache = None
     result = service.generate(_make_request())
     assert result.status == "disabled"
     assert result.text is None
@@ -52,6 +53,8 @@ def test_report_summary_parses_response(monkeypatch: pytest.MonkeyPatch) -> None
 
     service = ReportSummaryService()
 
+    service.summary_cache = None
+
     payload = json.dumps(
         {
             "summary": "Site globalement conforme.",
@@ -79,9 +82,12 @@ def test_report_summary_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(settings, "GEMINI_SUMMARY_API_KEY", "fallback-key", raising=False)
     monkeypatch.setattr(settings, "SUMMARY_FALLBACK_ENABLED", True, raising=False)
     monkeypatch.setattr(settings, "SUMMARY_FALLBACK_MODEL", "fallback-model", raising=False)
+    monkeypatch.setattr(settings, "SUMMARY_FALLBACK_URL", "http://127.0.0.1:9", raising=False)
 
     service = ReportSummaryService()
 
+    service.summary_cache = None
+
     def _raise(*args, **kwargs):  # noqa: ANN001, D401
         raise RuntimeError("network-error")
 
@@ -89,6 +95,147 @@ def test_report_summary_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
 
     result = service.generate(_make_request())
     assert result.status == "fallback"
-    assert result.source == "fallback-model"
+    assert result.source == "local-extractive"
     assert result.text is not None
     assert "Analyse avancée indisponible" in result.text
+    assert "incendie" in result.text
+    assert len(result.recommendations) == 2
+
+
+def test_report_summary_skips_while_circuit_open(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.services.circuit_breaker import CircuitBreaker
+
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_REQUIRED", False, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_API_KEY", "test-key", raising=False)
+    monkeypatch.setattr(settings, "SUMMARY_FALLBACK_ENABLED", False, raising=False)
+    breaker = CircuitBreaker("gemini-test", failure_threshold=1, reset_seconds=300)
+    breaker.record_failure(TimeoutError("Deadline Exceeded"))
+    service = ReportSummaryService(circuit_breaker=breaker)
+    service.summary_cache = None
+
+    result = service.generate(_make_request())
+    assert result.status == "skipped"
+    assert result.warnings == ["summary-circuit-open"]
+
+
+def test_partial_summary_text_reads_incomplete_json() -> None:
+    from app.services.report_summary import partial_summary_text
+
+    assert partial_summary_text('{"summ') is None
+    assert partial_summary_text('{"summary": {"context": "Site \\"A\\" exp') == 'Site "A" exp'
+    buffer = '{"summary": {"context": "Risque élevé.", "critical_areas": "Zone nord", "priorities": "Ext'
+    assert partial_summary_text(buffer) == "Risque élevé. Zone nord Ext"
+    assert partial_summary_text('{"summary": {"context": "A"}, "key_findings": [{"context": "B"') == "A"
+    assert partial_summary_text('{"summary": "Texte \\u00e9') == "Texte é"
+
+
+def test_report_summary_streams_partial_text(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.services import report_summary
+
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_API_KEY", "test-key", raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_STREAMING", True, raising=False)
+    monkeypatch.setattr(settings, "SUMMARY_PLACEHOLDER_ENABLED", False, raising=False)
+    payload = json.dumps(
+        {
+            "summary": {"context": "Extincteur manquant en zone de stockage.", "major_risks": "Risque incendie."},
+            "key_findings": ["Extincteur absent"],
+            "recommendations": ["Installer un extincteur", "Former les équipes"],
+            "warnings": [],
+        },
+        ensure_ascii=False,
+    )
+
+    class _StreamingClient:
+        def stream(self, *args: object, **kwargs: object):
+            for index in range(0, len(payload), 16):
+                yield payload[index : index + 16]
+
+    monkeypatch.setattr(report_summary, "get_gemini_client", lambda *args: _StreamingClient())
+    deltas: list[tuple[str, str]] = []
+    service = ReportSummaryService()
+    service.summary_cache = None
+
+    result = service.generate(_make_request(), on_delta=lambda delta, text: deltas.append((delta, text)))
+
+    assert result.status == "ok"
+    assert len(deltas) > 2
+    assert "".join(delta for delta, _ in deltas) == deltas[-1][1]
+    assert deltas[-1][1] == result.text
+    assert result.first_text_ms is not None
+    assert result.recommendations == ["Installer un extincteur", "Former les équipes"]
+
+
+def test_report_summary_reuses_cached_result(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    from app.services.response_cache import ResponseCache
+
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_API_KEY", "test-key", raising=False)
+    cache = ResponseCache(tmp_path / "summaries.sqlite3")
+    payload = json.dumps(
+        {"summary": "Extincteur manquant.", "key_findings": ["Extincteur absent"], "recommendations": ["Installer"]},
+        ensure_ascii=False,
+    )
+    calls: list[str] = []
+
+    def _call(prompt: str) -> tuple[str, int]:
+        calls.append(prompt)
+        return payload, 1200
+
+    first_service = ReportSummaryService(summary_cache=cache)
+    monkeypatch.setattr(first_service, "_call_gemini", _call)
+    first = first_service.generate(_make_request())
+
+    second_service = ReportSummaryService(summary_cache=cache)
+    monkeypatch.setattr(second_service, "_call_gemini", _call)
+    deltas: list[str] = []
+    second = second_service.generate(_make_request(), on_delta=lambda delta, text: deltas.append(text))
+
+    assert len(calls) == 1
+    assert first.status == "ok" and not first.cached
+    assert second.cached
+    assert (second.text, second.findings, second.recommendations) == (first.text, first.findings, first.recommendations)
+    assert second.prompt_hash == first.prompt_hash
+    assert deltas == [first.text]
+
+    monkeypatch.setattr(second_service, "model", "other-model")
+    second_service.generate(_make_request())
+    assert len(calls) == 2
+
+
+def test_extractive_engine_needs_no_network(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "SUMMARY_ENGINE", "extractive", raising=False)
+    service = ReportSummaryService()
+    service.summary_cache = None
+    monkeypatch.setattr(service, "_call_gemini", lambda *args: pytest.fail("Gemini must not be called"))
+    deltas: list[str] = []
+
+    result = service.generate(_make_request(), on_delta=lambda delta, text: deltas.append(text))
+
+    assert result.status == "ok"
+    assert result.source == "local-extractive"
+    assert result.text is not None and result.text.startswith("Site audité : risque faible (12%).")
+    assert "sécurité incendie (gravité élevée, 2 cas)" in result.text
+    assert "Extincteur manquant" in result.text  # OCR snippet
+    assert result.findings and "photo.jpg" in result.findings[0]
+    assert len(result.recommendations) == 2
+    assert "incendie" in result.recommendations[0]
+    assert result.duration_ms is not None and result.duration_ms < 100
+    assert deltas == [result.text]
+
+
+def test_extractive_placeholder_precedes_llm_text(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "GEMINI_SUMMARY_API_KEY", "test-key", raising=False)
+    monkeypatch.setattr(settings, "SUMMARY_PLACEHOLDER_ENABLED", True, raising=False)
+    service = ReportSummaryService()
+    service.summary_cache = None
+    payload = json.dumps({"summary": "Synthèse distante.", "recommendations": ["Agir"]}, ensure_ascii=False)
+    monkeypatch.setattr(service, "_call_gemini", lambda prompt, stream=None: (payload, 10))
+    texts: list[str] = []
+
+    result = service.generate(_make_request(), on_delta=lambda delta, text: texts.append(text))
+
+    assert result.source == "google-gemini"
+    assert texts and "observation(s) relevée(s)" in texts[0]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.services.response_cache import ResponseCache, make_cache_key
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_persists_across_instances(tmp_path: Path) -> None:
+    key = make_cache_key("image-sha", "prompt-sha", "gemini-2.0", "schema-1.4")
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    cache.put(key, '{"ok": true}')
+    cache.close()
+
+    reopened = ResponseCache(tmp_path / "cache.sqlite3")
+    assert reopened.get(key) == '{"ok": true}'
+    assert reopened.get(make_cache_key("image-sha", "prompt-sha", "gemini-2.5", "schema-1.4")) is None
+    assert (reopened.hits, reopened.misses) == (1, 1)
+
+
+def test_cache_entries_expire_after_ttl(tmp_path: Path) -> None:
+    clock = _Clock()
+    cache = ResponseCache(tmp_path / "cache.sqlite3", ttl_seconds=60, clock=clock)
+    cache.put("k", "value")
+    clock.now += 59
+    assert cache.get("k") == "value"
+    clock.now += 2
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_read_entries(tmp_path: Path) -> None:
+    clock = _Clock()
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_bytes=25, clock=clock)
+    cache.put("a", "x" * 10)
+    clock.now += 1
+    cache.put("b", "y" * 10)
+    clock.now += 1
+    assert cache.get("a") is not None  # "a" becomes the most recently used
+    clock.now += 1
+    cache.put("c", "z" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 10
+    assert cache.total_bytes() <= 25
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.models import OCRText
+from app.repositories.batches import _split_text, merge_ocr_chunks
+from app.services import text_extraction
+from app.services.ocr_engine import EasyOCREngine
+
+
+def test_plain_text_small_file_is_kept_in_memory(tmp_path: Path) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_text("  Extincteur absent  \n", encoding="utf-8")
+
+    result = text_extraction.extract_plain_text(path, max_chars=1000)
+
+    assert result.text == "Extincteur absent"
+    assert result.encoding == "utf-8"
+    assert result.truncated is False
+    assert not text_extraction.sidecar_path_for(path).exists()
+
+
+def test_plain_text_detects_non_utf8_charset(tmp_path: Path) -> None:
+    path = tmp_path / "legacy.txt"
+    path.write_bytes("Câble dénudé près du tableau électrique".encode("latin-1"))
+
+    result = text_extraction.extract_plain_text(path, max_chars=1000)
+
+    assert "dénudé" in result.text
+    assert any(warning.startswith("text-decoding-") for warning in result.warnings)
+
+
+def test_large_text_is_capped_with_full_text_sidecar(tmp_path: Path) -> None:
+    path = tmp_path / "dump.log"
+    line = "2026-10-18 ERROR porte coupe-feu bloquée\n"
+    path.write_text(line * 20_000, encoding="utf-8")
+
+    result = text_extraction.extract_plain_text(path, max_chars=5_000)
+
+    assert len(result.text) <= 5_000
+    assert result.truncated is True
+    assert result.total_chars == len(line) * 20_000
+    sidecar = Path(result.sidecar_path or "")
+    assert sidecar.read_text(encoding="utf-8") == line * 20_000
+
+
+def test_input_cap_stops_reading(tmp_path: Path) -> None:
+    path = tmp_path / "huge.txt"
+    path.write_bytes(b"a" * 10_000)
+
+    result = text_extraction.extract_plain_text(path, max_chars=100_000, max_input_bytes=4_000)
+
+    assert result.total_chars == 4_000
+    assert result.input_capped is True
+    assert "text-input-capped" in result.warnings
+
+
+def test_docx_is_streamed_in_document_order(tmp_path: Path) -> None:
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    document.add_paragraph("Rapport de visite")
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Zone"
+    table.cell(0, 1).text = "Constat"
+    table.cell(1, 0).text = "Parking"
+    table.cell(1, 1).text = "Éclairage défaillant"
+    document.add_paragraph("Fin du rapport")
+    path = tmp_path / "visite.docx"
+    document.save(str(path))
+
+    result = text_extraction.extract_docx_text(path, max_chars=10_000)
+
+    assert result.text.splitlines() == [
+        "Rapport de visite",
+        "Zone | Constat",
+        "Parking | Éclairage défaillant",
+        "Fin du rapport",
+    ]
+
+
+def test_engine_records_truncation_metadata(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "OCR_TEXT_MAX_STORED_CHARS", 100)
+    path = tmp_path / "long.txt"
+    path.write_text("x" * 1_000, encoding="utf-8")
+
+    result = EasyOCREngine(["fr"])._extract_text_file(path, "long.txt")
+
+    assert len(result.text) == 100
+    assert "text-truncated" in result.warnings
+    assert result.extra["full_text"]["total_chars"] == 1_000
+
+
+def test_long_texts_are_split_and_merged_back() -> None:
+    chunks = _split_text("abcdefghij", 4)
+    assert chunks == ["abcd", "efgh", "ij"]
+
+    rows = [OCRText(batch_id="b", filename="a.txt", content=chunks[0])]
+    rows += [OCRText(batch_id="b", filename="a.txt", content=chunk, chunk_index=i) for i, chunk in enumerate(chunks[1:], 1)]
+    rows.append(OCRText(batch_id="b", filename="b.txt", content="short"))
+
+    merged = merge_ocr_chunks(rows)
+    assert [(row.filename, content) for row, content in merged] == [("a.txt", "abcdefghij"), ("b.txt", "short")]
+    assert rows[0].content == "abcd"
+
+    later = OCRText(batch_id="b", filename="c.txt", content="later")
+    source = iter([*rows, later])
+    assert next(merge_ocr_chunks(source))[1] == "abcdefghij"
+    assert next(source) is later  # texts are yielded as soon as the next head arrives
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import fitz
+import pytest
+from httpx import ASGITransport, AsyncClient
+from PIL import Image
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.api.v1.endpoints.ingestion import get_storage_root
+from app.db.session import get_session
+from app.main import app
+from app.models import AuditBatch, BatchFile, VisionObservation
+from app.pipelines.models import Observation
+from app.services.report import ReportBuilder
+from app.services.thumbnails import THUMBNAIL_DIRNAME, AnnotatedBox, ThumbnailCache, boxes_by_file
+from tests.test_report import _dummy_pipeline_result
+
+
+def _photo(path: Path, size: tuple[int, int] = (2400, 1600)) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", size, color=(200, 200, 200)).save(path, format="JPEG", quality=90)
+    return path
+
+
+def test_thumbnail_is_downscaled_with_boxes_drawn_to_scale(tmp_path: Path) -> None:
+    source = _photo(tmp_path / "fire.jpg")
+    cache = ThumbnailCache(tmp_path / "thumbs", max_edge=300)
+
+    thumbnail = cache.get_or_create(source, [AnnotatedBox(bbox=(800, 800, 1600, 1200), label="incendie", severity="high")])
+
+    assert thumbnail is not None and not thumbnail.cached
+    assert (thumbnail.width, thumbnail.height) == (300, 200)
+    with Image.open(thumbnail.path) as image:
+        rgb = image.convert("RGB")
+        edge = rgb.getpixel((150, 100))  # top edge of the box: 800 px / 8
+        inside = rgb.getpixel((150, 125))
+    assert edge[0] - edge[1] > 60  # severity colour (red), JPEG-blurred
+    assert abs(inside[0] - 200) < 20 and abs(inside[1] - 200) < 20
+    assert thumbnail.path.stat().st_size < source.stat().st_size
+
+
+def test_thumbnail_cache_is_content_addressed(tmp_path: Path) -> None:
+    source = _photo(tmp_path / "a.jpg")
+    copy = tmp_path / "b.jpg"
+    copy.write_bytes(source.read_bytes())
+    cache = ThumbnailCache(tmp_path / "thumbs")
+    boxes = [AnnotatedBox(bbox=(10, 10, 50, 50), label="porte", severity="medium")]
+
+    first = cache.get_or_create(source, boxes)
+    again = cache.get_or_create(copy, boxes, source_digest=hashlib.sha256(copy.read_bytes()).hexdigest())
+    other = cache.get_or_create(source, [])
+
+    assert first is not None and again is not None and other is not None
+    assert again.cached and again.path == first.path
+    assert other.key != first.key
+    assert cache.get_or_create(tmp_path / "missing.jpg", boxes) is None
+
+
+def test_report_embeds_thumbnails_of_worst_detections(tmp_path: Path) -> None:
+    result = _dummy_pipeline_result(tmp_path)
+    result.observations = [
+        Observation(source_file="fire.jpg", label="incendie", confidence=0.9, severity="high", bbox=(100, 100, 900, 700)),
+        Observation(source_file="door.jpg", label="porte", confidence=0.6, severity="low", bbox=(0, 0, 50, 50)),
+        Observation(source_file="gone.jpg", label="porte", confidence=0.6, severity="critical", bbox=(0, 0, 50, 50)),
+    ]
+    _photo(tmp_path / result.batch_id / "fire.jpg")
+    _photo(tmp_path / result.batch_id / "door.jpg")
+
+    artifact = ReportBuilder(output_dir=tmp_path / "reports", max_thumbnails=1).build_from_pipeline(
+        result, storage_root=tmp_path
+    )
+
+    doc = fitz.open(artifact.path)
+    text = " ".join(page.get_text() for page in doc)
+    images = sum(len(page.get_images()) for page in doc)
+    doc.close()
+    assert images == 1
+    assert "fire.jpg" in text and "sévérité max high" in text
+    assert len(list((tmp_path / THUMBNAIL_DIRNAME).rglob("*.jpg"))) == 1
+    assert list(boxes_by_file(result.observations)) == ["fire.jpg", "door.jpg", "gone.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_endpoint_serves_cached_annotated_image(tmp_path: Path) -> None:
+    source = _photo(tmp_path / "batch-t" / "fire.jpg", size=(800, 600))
+    engine = create_async_engine(f"sqlite+aiosqlite:///{(tmp_path / 'thumbs.db').as_posix()}", future=True)
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with factory() as session:
+        session.add(AuditBatch(id="batch-t", status="completed"))
+        session.add(
+            BatchFile(
+                batch_id="batch-t",
+                filename="fire.jpg",
+                content_type="image/jpeg",
+                size_bytes=source.stat().st_size,
+                checksum_sha256=hashlib.sha256(source.read_bytes()).hexdigest(),
+                stored_path=str(source),
+            )
+        )
+        session.add(VisionObservation(batch_id="batch-t", filename="fire.jpg", label="incendie", severity="high", bbox=[1, 2, 300, 200]))
+        await session.commit()
+
+    async def _session_override():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _session_override
+    app.dependency_overrides[get_storage_root] = lambda: tmp_path
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/api/v1/ingestion/batches/batch-t/thumbnails/fire.jpg")
+            missing = await client.get("/api/v1/ingestion/batches/batch-t/thumbnails/other.jpg")
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+        app.dependency_overrides.pop(get_storage_root, None)
+        await engine.dispose()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/jpeg"
+    stored = list((tmp_path / THUMBNAIL_DIRNAME).rglob("*.jpg"))
+    assert len(stored) == 1 and response.headers["etag"] == f'"{stored[0].stem}"'
+    assert missing.status_code == 404